@@ -0,0 +1,44 @@
+"""provenance manifest index"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0002_provenance_manifests"
+down_revision = "0001_initial"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "provenance_manifests",
+        sa.Column("id", sa.String(length=64), primary_key=True),
+        sa.Column("tenant_slug", sa.String(length=64), nullable=False),
+        sa.Column("tool_name", sa.String(length=128), nullable=False),
+        sa.Column("action", sa.String(length=128), nullable=False),
+        sa.Column("timestamp", sa.BigInteger(), nullable=False),
+        sa.Column("storage_location", sa.Text(), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index(
+        "ix_provenance_manifests_tenant_ts",
+        "provenance_manifests",
+        ["tenant_slug", "timestamp", "id"],
+    )
+    op.create_index(
+        "ix_provenance_manifests_tool_ts",
+        "provenance_manifests",
+        ["tenant_slug", "tool_name", "timestamp", "id"],
+    )
+    op.create_index("ix_provenance_manifests_ts", "provenance_manifests", ["timestamp", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_provenance_manifests_ts", table_name="provenance_manifests")
+    op.drop_index("ix_provenance_manifests_tool_ts", table_name="provenance_manifests")
+    op.drop_index("ix_provenance_manifests_tenant_ts", table_name="provenance_manifests")
+    op.drop_table("provenance_manifests")
@@ -0,0 +1,37 @@
+"""registry versions for conditional GETs and delta sync"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0003_registry_versions"
+down_revision = "0002_provenance_manifests"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "registry_state",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+    )
+    op.execute("INSERT INTO registry_state (id, version) VALUES (1, 0)")
+    op.add_column(
+        "tenants", sa.Column("version", sa.BigInteger(), server_default="0", nullable=False)
+    )
+    op.add_column(
+        "tools", sa.Column("version", sa.BigInteger(), server_default="0", nullable=False)
+    )
+    op.create_index("ix_tenants_version", "tenants", ["version"])
+    op.create_index("ix_tools_version", "tools", ["version"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tools_version", table_name="tools")
+    op.drop_index("ix_tenants_version", table_name="tenants")
+    op.drop_column("tools", "version")
+    op.drop_column("tenants", "version")
+    op.drop_table("registry_state")
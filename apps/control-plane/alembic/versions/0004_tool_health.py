@@ -0,0 +1,32 @@
+"""tool health checks"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "0004_tool_health"
+down_revision = "0003_registry_versions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("tools", sa.Column("healthcheck", postgresql.JSONB(), nullable=True))
+    op.create_table(
+        "tool_health",
+        sa.Column("tool_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("healthy", sa.Boolean(), nullable=False),
+        sa.Column("status_code", sa.Integer()),
+        sa.Column("latency_ms", sa.Float(), nullable=False),
+        sa.Column("error", sa.Text()),
+        sa.Column("consecutive_failures", sa.Integer(), nullable=False),
+        sa.Column("checked_at", sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("tool_health")
+    op.drop_column("tools", "healthcheck")
@@ -0,0 +1,39 @@
+"""GIN indexes for registry scope and metadata search"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0005_tool_search_indexes"
+down_revision = "0004_tool_health"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Built concurrently so a large registry keeps serving writes while the indexes build.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tools_scopes_gin",
+            "tools",
+            ["scopes"],
+            postgresql_using="gin",
+            postgresql_ops={"scopes": "jsonb_path_ops"},
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tools_metadata_gin",
+            "tools",
+            ["metadata_json"],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+        op.create_index("ix_tools_owner", "tools", ["owner"], postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_tools_owner", table_name="tools", postgresql_concurrently=True)
+        op.drop_index("ix_tools_metadata_gin", table_name="tools", postgresql_concurrently=True)
+        op.drop_index("ix_tools_scopes_gin", table_name="tools", postgresql_concurrently=True)
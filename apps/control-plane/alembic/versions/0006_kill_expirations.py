@@ -0,0 +1,34 @@
+"""time-boxed kill switch expirations"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "0006_kill_expirations"
+down_revision = "0005_tool_search_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "kill_expirations",
+        sa.Column(
+            "tool_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("tools.id"),
+            primary_key=True,
+        ),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.Column("reason", sa.Text(), nullable=False, server_default=""),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now()),
+    )
+    op.create_index("ix_kill_expirations_expires_at", "kill_expirations", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_kill_expirations_expires_at", table_name="kill_expirations")
+    op.drop_table("kill_expirations")
@@ -12,11 +12,65 @@ class Settings(BaseSettings):
     """Environment-backed configuration."""
 
     postgres_url: str = "postgresql+psycopg://localhost:5432/sentinel"
+    database_async: bool = False
+    database_pool_size: int = 20
+    database_max_overflow: int = 10
+    database_pool_timeout: float = 30.0
+    database_pool_recycle: int = 1800
+    database_pre_ping: str = "idle"
+    database_pre_ping_idle_seconds: float = 30.0
+    database_replica_urls: list[str] = []
+    database_replica_max_lag_seconds: float = 5.0
+    database_replica_check_seconds: float = 2.0
     redis_url: str = "redis://localhost:6379/0"
     opa_url: str = "http://localhost:8181"
     signing_key: str = "dev-signing-key"
     otel_exporter_otlp_endpoint: str | None = None
     enable_trace_export: bool = False
+    provenance_path: str = ".data/provenance"
+    provenance_journal_path: str | None = None
+    provenance_compression: str | None = None
+    provenance_dictionary_scope: str | None = None
+    provenance_index_enabled: bool = True
+    provenance_ack_mode: str = "durable"
+    provenance_write_batch_size: int = 256
+    provenance_write_queue_size: int = 10_000
+    provenance_backend: str = "local"
+    # Each chain and journal must have a single writer process. With several workers or
+    # replicas on one store, give each its own chain id; the journal defaults to
+    # <provenance_path>.<chain_id>.journal and a second process on the same journal refuses
+    # to start. Unset, the chain id is the host name on the shared s3 backend.
+    provenance_chain_id: str | None = None
+    provenance_s3_bucket: str | None = None
+    provenance_s3_endpoint: str | None = None
+    provenance_s3_region: str = "us-east-1"
+    provenance_s3_prefix: str = ""
+    provenance_s3_access_key: str | None = None
+    provenance_s3_secret_key: str | None = None
+    provenance_s3_max_connections: int = 32
+    provenance_cache_dir: str | None = ".data/provenance-cache"
+    provenance_verify_cache_bytes: int = 32 * 1024 * 1024
+    provenance_verify_cache_ttl_seconds: float = 300.0
+    provenance_dedup_payloads: bool = False
+    provenance_dedup_min_bytes: int = 1024
+    provenance_stream_max_bytes: int = 100 * 1024 * 1024
+    provenance_spool_dir: str = ".data/provenance-spool"
+    health_checks_enabled: bool = False
+    health_max_concurrency: int = 200
+    health_per_host_concurrency: int = 4
+    health_timeout_seconds: float = 5.0
+    health_jitter: float = 0.1
+    health_flush_seconds: float = 5.0
+    health_refresh_seconds: float = 30.0
+    health_failure_threshold: int = 1
+    health_gate_policy: bool = False
+    invalidation_transport: str | None = None
+    kill_expiry_enabled: bool = True
+    kill_expiry_reload_seconds: float = 60.0
+    invalidation_channel: str = "sentinel_invalidation"
+    metrics_dir: str | None = None
+    metrics_flush_seconds: float = 5.0
+    server_timing_enabled: bool = False
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
@@ -26,11 +80,61 @@ class Settings(BaseSettings):
     def as_dict(self) -> Dict[str, Any]:
         return {
             "postgres_url": self.postgres_url,
+            "database_async": self.database_async,
+            "database_pool_size": self.database_pool_size,
+            "database_max_overflow": self.database_max_overflow,
+            "database_pool_timeout": self.database_pool_timeout,
+            "database_pool_recycle": self.database_pool_recycle,
+            "database_pre_ping": self.database_pre_ping,
+            "database_pre_ping_idle_seconds": self.database_pre_ping_idle_seconds,
+            "database_replica_count": len(self.database_replica_urls),
+            "database_replica_max_lag_seconds": self.database_replica_max_lag_seconds,
+            "database_replica_check_seconds": self.database_replica_check_seconds,
             "redis_url": self.redis_url,
             "opa_url": self.opa_url,
             "signing_key": "***redacted***",
             "otel_exporter_otlp_endpoint": self.otel_exporter_otlp_endpoint,
             "enable_trace_export": self.enable_trace_export,
+            "provenance_path": self.provenance_path,
+            "provenance_journal_path": self.provenance_journal_path,
+            "provenance_compression": self.provenance_compression,
+            "provenance_dictionary_scope": self.provenance_dictionary_scope,
+            "provenance_index_enabled": self.provenance_index_enabled,
+            "provenance_ack_mode": self.provenance_ack_mode,
+            "provenance_write_batch_size": self.provenance_write_batch_size,
+            "provenance_write_queue_size": self.provenance_write_queue_size,
+            "provenance_backend": self.provenance_backend,
+            "provenance_chain_id": self.provenance_chain_id,
+            "provenance_s3_bucket": self.provenance_s3_bucket,
+            "provenance_s3_endpoint": self.provenance_s3_endpoint,
+            "provenance_s3_region": self.provenance_s3_region,
+            "provenance_s3_prefix": self.provenance_s3_prefix,
+            "provenance_s3_access_key": "***redacted***" if self.provenance_s3_access_key else None,
+            "provenance_s3_secret_key": "***redacted***" if self.provenance_s3_secret_key else None,
+            "provenance_s3_max_connections": self.provenance_s3_max_connections,
+            "provenance_cache_dir": self.provenance_cache_dir,
+            "provenance_verify_cache_bytes": self.provenance_verify_cache_bytes,
+            "provenance_verify_cache_ttl_seconds": self.provenance_verify_cache_ttl_seconds,
+            "provenance_dedup_payloads": self.provenance_dedup_payloads,
+            "provenance_dedup_min_bytes": self.provenance_dedup_min_bytes,
+            "provenance_stream_max_bytes": self.provenance_stream_max_bytes,
+            "provenance_spool_dir": self.provenance_spool_dir,
+            "health_checks_enabled": self.health_checks_enabled,
+            "health_max_concurrency": self.health_max_concurrency,
+            "health_per_host_concurrency": self.health_per_host_concurrency,
+            "health_timeout_seconds": self.health_timeout_seconds,
+            "health_jitter": self.health_jitter,
+            "health_flush_seconds": self.health_flush_seconds,
+            "health_refresh_seconds": self.health_refresh_seconds,
+            "health_failure_threshold": self.health_failure_threshold,
+            "health_gate_policy": self.health_gate_policy,
+            "invalidation_transport": self.invalidation_transport,
+            "invalidation_channel": self.invalidation_channel,
+            "kill_expiry_enabled": self.kill_expiry_enabled,
+            "kill_expiry_reload_seconds": self.kill_expiry_reload_seconds,
+            "metrics_dir": self.metrics_dir,
+            "metrics_flush_seconds": self.metrics_flush_seconds,
+            "server_timing_enabled": self.server_timing_enabled,
         }
 
 
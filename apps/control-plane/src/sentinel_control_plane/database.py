@@ -2,16 +2,40 @@
 
 from __future__ import annotations
 
-from contextlib import contextmanager
-from typing import Iterator
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Iterator, List
 
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from .config import get_settings
+from .db_pool import PoolMetrics, instrument, pool_options
+from .metrics import time_queries
 
 
-engine = create_engine(get_settings().postgres_url, echo=False, future=True, pool_pre_ping=True)
+ENGINES: Dict[str, Engine] = {}
+POOL_METRICS: Dict[str, PoolMetrics] = {}
+
+
+def _register(bound: Engine, name: str, metrics: PoolMetrics | None) -> None:
+    ENGINES[name] = bound
+    if metrics is not None:
+        POOL_METRICS[name] = metrics
+
+
+def build_engine(url: str, name: str) -> Engine:
+    """Engine with the configured pool, registered under ``name`` for ``pool_stats``."""
+    settings = get_settings()
+    built = create_engine(url, echo=False, **pool_options(settings))
+    metrics = instrument(built, name, settings)
+    time_queries(built, name)
+    _register(built, name, metrics)
+    return built
+
+
+engine = build_engine(get_settings().postgres_url, "primary")
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
 
 
@@ -26,3 +50,59 @@ def get_session() -> Iterator[Session]:
         raise
     finally:
         session.close()
+
+
+def pool_stats() -> List[Dict[str, Any]]:
+    """Occupancy and checkout waits of every engine this process has created."""
+    # The engine's current pool: dispose() swaps in a new one that shares the metrics.
+    return [
+        {"name": name, **metrics.stats(ENGINES[name].pool)}
+        for name, metrics in POOL_METRICS.items()
+    ]
+
+
+ASYNC_DRIVERS = {"postgresql": "postgresql+psycopg", "sqlite": "sqlite+aiosqlite"}
+
+
+def async_database_url(url: str) -> str:
+    """``url`` with an asyncio driver: psycopg 3 (async mode) for Postgres, aiosqlite for SQLite."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{parsed.drivername}'")
+    if parsed.drivername in (*ASYNC_DRIVERS.values(), "postgresql+asyncpg"):
+        return parsed.render_as_string(hide_password=False)
+    driver = ASYNC_DRIVERS[parsed.get_backend_name()]
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+@lru_cache
+def get_async_engine() -> AsyncEngine:
+    """Async engine for the same database, created on first use (``DATABASE_ASYNC``)."""
+    settings = get_settings()
+    url = async_database_url(settings.postgres_url)
+    async_engine = create_async_engine(
+        url, echo=False, **pool_options(settings, asynchronous=True)
+    )
+    metrics = instrument(async_engine.sync_engine, "primary_async", settings)
+    time_queries(async_engine.sync_engine, "primary_async")
+    _register(async_engine.sync_engine, "primary_async", metrics)
+    return async_engine
+
+
+@lru_cache
+def _async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(bind=get_async_engine(), autoflush=False, expire_on_commit=False)
+
+
+@asynccontextmanager
+async def get_async_session() -> AsyncIterator[AsyncSession]:
+    """``get_session`` for asyncio: commit on success, roll back on any error."""
+    session = _async_sessionmaker()()
+    try:
+        yield session
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
@@ -0,0 +1,165 @@
+"""Connection pool sizing, pre-ping strategies and saturation metrics."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict
+
+import structlog
+from sqlalchemy import Engine, event
+from sqlalchemy.exc import DisconnectionError, TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from .config import Settings
+
+logger = structlog.get_logger(__name__)
+
+PRE_PING_STRATEGIES = ("always", "idle", "never")
+
+
+class PoolMetrics:
+    """Checkout wait times and timeouts for one pool, plus its live occupancy.
+
+    Wait percentiles cover the last ``window`` checkouts; counters are cumulative.
+    """
+
+    def __init__(self, name: str, window: int = 1024) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._recent: Deque[float] = deque(maxlen=window)
+        self._waits = 0
+        self._wait_seconds = 0.0
+        self._max_wait = 0.0
+        self._timeouts = 0
+        self._peak_checked_out = 0
+
+    def observe(self, pool: Pool, waited: float, timed_out: bool) -> None:
+        with self._lock:
+            self._recent.append(waited)
+            self._waits += 1
+            self._wait_seconds += waited
+            self._max_wait = max(self._max_wait, waited)
+            self._timeouts += timed_out
+            self._peak_checked_out = max(self._peak_checked_out, _checked_out(pool))
+        if timed_out:
+            logger.warning("database.pool_timeout", pool=self.name, waited_ms=round(waited * 1000))
+
+    def stats(self, pool: Pool) -> Dict[str, Any]:
+        with self._lock:
+            recent = sorted(self._recent)
+            waits, wait_seconds = self._waits, self._wait_seconds
+            max_wait, timeouts, peak = self._max_wait, self._timeouts, self._peak_checked_out
+        size = pool.size() if isinstance(pool, QueuePool) else 0
+        overflow = pool.overflow() if isinstance(pool, QueuePool) else 0
+        return {
+            "size": size,
+            "max_overflow": getattr(pool, "_max_overflow", 0),
+            "checked_out": _checked_out(pool),
+            "checked_out_peak": peak,
+            "overflow_in_use": max(overflow, 0),
+            "checkouts": waits,
+            "timeouts": timeouts,
+            "wait_ms_total": round(wait_seconds * 1000, 3),
+            "wait_ms_max": round(max_wait * 1000, 3),
+            "wait_ms_p50": round(_percentile(recent, 0.5) * 1000, 3),
+            "wait_ms_p99": round(_percentile(recent, 0.99) * 1000, 3),
+        }
+
+
+class _InstrumentedPool:
+    """Times every checkout against the pool's ``metrics`` (if any)."""
+
+    metrics: PoolMetrics | None = None
+
+    def _do_get(self) -> Any:
+        if self.metrics is None:
+            return super()._do_get()  # type: ignore[misc]
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()  # type: ignore[misc]
+        except PoolTimeoutError:
+            self.metrics.observe(self, time.perf_counter() - started, True)  # type: ignore[arg-type]
+            raise
+        self.metrics.observe(self, time.perf_counter() - started, False)  # type: ignore[arg-type]
+        return connection
+
+    def recreate(self) -> Any:  # dispose() and invalidation rebuild the pool
+        pool = super().recreate()  # type: ignore[misc]
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPool, QueuePool):
+    pass
+
+
+class InstrumentedAsyncPool(_InstrumentedPool, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_options(settings: Settings, *, asynchronous: bool = False) -> Dict[str, Any]:
+    """``create_engine`` keyword arguments for the ``DATABASE_POOL_*`` settings."""
+    if settings.database_pre_ping not in PRE_PING_STRATEGIES:
+        raise ValueError(
+            f"DATABASE_PRE_PING must be one of {', '.join(PRE_PING_STRATEGIES)}, "
+            f"not '{settings.database_pre_ping}'"
+        )
+    return {
+        "poolclass": InstrumentedAsyncPool if asynchronous else InstrumentedQueuePool,
+        "pool_size": settings.database_pool_size,
+        "max_overflow": settings.database_max_overflow,
+        "pool_timeout": settings.database_pool_timeout,
+        "pool_recycle": settings.database_pool_recycle,
+        "pool_pre_ping": settings.database_pre_ping == "always",
+    }
+
+
+def instrument(engine: Engine, name: str, settings: Settings) -> PoolMetrics | None:
+    """Attach metrics to ``engine``'s pool and install the idle pre-ping if configured.
+
+    Returns the metrics, or ``None`` when the pool is not one of the instrumented classes.
+    """
+    metrics = None
+    if isinstance(engine.pool, _InstrumentedPool):
+        metrics = engine.pool.metrics = PoolMetrics(name)
+    if settings.database_pre_ping == "idle":
+        ping_idle_connections(engine, settings.database_pre_ping_idle_seconds)
+    return metrics
+
+
+def ping_idle_connections(engine: Engine, idle_seconds: float) -> None:
+    """Ping a connection on checkout only if it sat in the pool for ``idle_seconds``.
+
+    ``pool_pre_ping`` pays a round trip on every checkout; connections that were in use a
+    moment ago are almost never dead, so this only checks the ones that went quiet long
+    enough for a server, proxy or firewall to have dropped them. A failed ping raises
+    ``DisconnectionError``, which makes the pool discard the connection and retry.
+    """
+
+    @event.listens_for(engine, "checkin")
+    def _checked_in(_dbapi_connection: Any, record: Any) -> None:
+        record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _checked_out(dbapi_connection: Any, record: Any, _proxy: Any) -> None:
+        checked_in_at = record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        try:
+            cursor = dbapi_connection.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+        except Exception as exc:
+            raise DisconnectionError("idle connection failed its ping") from exc
+
+
+def _checked_out(pool: Pool) -> int:
+    return pool.checkedout() if isinstance(pool, QueuePool) else 0
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
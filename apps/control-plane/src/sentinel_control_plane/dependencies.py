@@ -2,19 +2,33 @@
 
 from __future__ import annotations
 
-from collections.abc import Generator
+import socket
+from collections.abc import AsyncGenerator, Generator
+from functools import lru_cache, partial
 from pathlib import Path
 
-from fastapi import Depends
+from fastapi import Depends, Header
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from sentinel_policy.client import PolicyClient
+from sentinel_provenance.backends import LocalBackend, S3Backend, StorageBackend
+from sentinel_provenance.cache import ManifestCache
 from sentinel_provenance.signer import ProvenanceSigner
 from sentinel_provenance.storage import ManifestStorage
 from sentinel_provenance.verifier import ProvenanceVerifier
+from sentinel_provenance.writer import GroupCommitWriter
 
 from .config import Settings, get_settings
-from .database import get_session
+from .database import build_engine, get_async_session, get_session
+from .health import HealthScheduler, load_probe_targets, persist_health_results
+from .invalidation import InvalidationBus, build_transport
+from .kill_expiry import KillExpiryScheduler
+from .manifest_index import ManifestIndexer, SessionFactory
+from .metrics import REGISTRY, MetricsFlusher, TimedStorageBackend
+from .registry_version import current_registry_version
+from .replicas import ReplicaRouter
+from .server_timing import record_stage
 
 
 def settings_provider() -> Settings:
@@ -26,6 +40,55 @@ def db_session() -> Generator[Session, None, None]:
         yield session
 
 
+def replica_router() -> ReplicaRouter | None:
+    """Read-replica routing, or ``None`` when no replica URLs are configured."""
+    return get_replica_router() if get_settings().database_replica_urls else None
+
+
+@lru_cache
+def get_replica_router() -> ReplicaRouter:
+    settings = get_settings()
+    replicas = [
+        (f"replica-{index}", build_engine(url, f"replica-{index}"))
+        for index, url in enumerate(settings.database_replica_urls)
+    ]
+    return ReplicaRouter(
+        get_session,
+        replicas,
+        max_lag_seconds=settings.database_replica_max_lag_seconds,
+        check_seconds=settings.database_replica_check_seconds,
+    )
+
+
+def read_db_session(
+    primary: Session = Depends(db_session),
+    router: ReplicaRouter | None = Depends(replica_router),
+    x_min_registry_version: int | None = Header(
+        default=None, description="Registry version this read must reflect (read-your-writes)"
+    ),
+) -> Generator[Session, None, None]:
+    """Session for read-only handlers: a replica when one qualifies, otherwise the primary.
+
+    The primary session is opened lazily, so it costs nothing when a replica serves the read.
+    """
+    if router is None:
+        yield primary
+        return
+    with router.session(primary, x_min_registry_version) as session:
+        yield session
+
+
+async def async_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """Request-scoped async session for the handlers mounted when ``DATABASE_ASYNC`` is set."""
+    async with get_async_session() as session:
+        yield session
+
+
+def session_factory() -> SessionFactory:
+    """Session factory for streaming endpoints that outlive the request dependency scope."""
+    return get_session
+
+
 def policy_client(settings: Settings = Depends(settings_provider)) -> Generator[PolicyClient, None, None]:
     client = PolicyClient(settings.opa_url)
     try:
@@ -35,19 +98,195 @@ def policy_client(settings: Settings = Depends(settings_provider)) -> Generator[
 
 
 def provenance_signer(settings: Settings = Depends(settings_provider)) -> ProvenanceSigner:
-    storage = ManifestStorage(base_path=_provenance_path())
-    return ProvenanceSigner(storage=storage, signing_key=settings.signing_key)
+    return _shared_signer(settings.signing_key)
+
+
+def provenance_storage() -> ManifestStorage:
+    return _shared_storage()
 
 
 def provenance_verifier(
     settings: Settings = Depends(settings_provider),
 ) -> ProvenanceVerifier:
-    storage = ManifestStorage(base_path=_provenance_path())
-    signer = ProvenanceSigner(storage=storage, signing_key=settings.signing_key)
-    return ProvenanceVerifier(storage=storage, signer=signer)
+    return ProvenanceVerifier(
+        storage=_shared_storage(),
+        signer=_shared_signer(settings.signing_key),
+        cache=get_manifest_cache(),
+    )
+
+
+@lru_cache
+def get_manifest_cache() -> ManifestCache | None:
+    settings = get_settings()
+    if settings.provenance_verify_cache_bytes <= 0:
+        return None
+    cache = ManifestCache(
+        max_bytes=settings.provenance_verify_cache_bytes,
+        max_age_seconds=settings.provenance_verify_cache_ttl_seconds or None,
+    )
+    _shared_storage().add_delete_listener(cache.invalidate_many)
+    return cache
+
+
+@lru_cache
+def _shared_storage() -> ManifestStorage:
+    settings = get_settings()
+    return ManifestStorage(
+        compression=settings.provenance_compression,
+        dictionary_scope=settings.provenance_dictionary_scope,
+        backend=TimedStorageBackend(
+            _storage_backend(settings) or LocalBackend(_provenance_path())
+        ),
+        dedup_payloads=settings.provenance_dedup_payloads,
+        dedup_min_bytes=settings.provenance_dedup_min_bytes,
+    )
+
+
+def _storage_backend(settings: Settings) -> StorageBackend | None:
+    if settings.provenance_backend == "local":
+        return None
+    if settings.provenance_backend != "s3":
+        raise ValueError(f"Unsupported provenance backend '{settings.provenance_backend}'")
+    if not (settings.provenance_s3_bucket and settings.provenance_s3_endpoint):
+        raise ValueError("The s3 provenance backend requires a bucket and an endpoint")
+    return S3Backend(
+        bucket=settings.provenance_s3_bucket,
+        endpoint_url=settings.provenance_s3_endpoint,
+        access_key=settings.provenance_s3_access_key or "",
+        secret_key=settings.provenance_s3_secret_key or "",
+        region=settings.provenance_s3_region,
+        prefix=settings.provenance_s3_prefix,
+        max_connections=settings.provenance_s3_max_connections,
+        cache_dir=Path(settings.provenance_cache_dir) if settings.provenance_cache_dir else None,
+    )
+
+
+@lru_cache
+def _shared_signer(signing_key: str) -> ProvenanceSigner:
+    # One signer per process: it owns the in-memory chain heads for the store.
+    settings = get_settings()
+    indexer = get_manifest_indexer() if settings.provenance_index_enabled else None
+    return ProvenanceSigner(
+        storage=_shared_storage(),
+        signing_key=signing_key,
+        on_write=indexer.record if indexer else None,
+        writer=get_manifest_writer(),
+        chain_id=_chain_id(settings),
+    )
+
+
+@lru_cache
+def get_manifest_writer() -> GroupCommitWriter:
+    settings = get_settings()
+    writer = GroupCommitWriter(
+        storage=_shared_storage(),
+        journal_path=_journal_path(settings),
+        mode=settings.provenance_ack_mode,
+        max_queue=settings.provenance_write_queue_size,
+        max_batch=settings.provenance_write_batch_size,
+        on_applied=partial(record_stage, "storage"),
+    )
+    writer.start()
+    return writer
+
+
+def health_scheduler() -> HealthScheduler | None:
+    """The running health scheduler, or ``None`` when background probes are disabled."""
+    return get_health_scheduler() if get_settings().health_checks_enabled else None
+
+
+@lru_cache
+def get_health_scheduler() -> HealthScheduler:
+    settings = get_settings()
+    return HealthScheduler(
+        load_probe_targets(get_session),
+        persist_health_results(get_session),
+        max_concurrency=settings.health_max_concurrency,
+        per_host_concurrency=settings.health_per_host_concurrency,
+        timeout_seconds=settings.health_timeout_seconds,
+        jitter=settings.health_jitter,
+        flush_seconds=settings.health_flush_seconds,
+        refresh_seconds=settings.health_refresh_seconds,
+        failure_threshold=settings.health_failure_threshold,
+    )
+
+
+def invalidation_bus() -> InvalidationBus | None:
+    """The cross-replica invalidation bus, or ``None`` when no transport is configured."""
+    return get_invalidation_bus() if get_settings().invalidation_transport else None
+
+
+@lru_cache
+def get_invalidation_bus() -> InvalidationBus:
+    settings = get_settings()
+    transport = build_transport(
+        settings.invalidation_transport or "",
+        postgres_url=settings.postgres_url,
+        redis_url=settings.redis_url,
+        channel=settings.invalidation_channel,
+    )
+    return InvalidationBus(transport, current_version=_registry_version)
+
+
+def kill_expiry_scheduler() -> KillExpiryScheduler | None:
+    return get_kill_expiry_scheduler() if get_settings().kill_expiry_enabled else None
+
+
+@lru_cache
+def get_kill_expiry_scheduler() -> KillExpiryScheduler:
+    settings = get_settings()
+    return KillExpiryScheduler(
+        get_session,
+        bus=get_invalidation_bus() if settings.invalidation_transport else None,
+        reload_seconds=settings.kill_expiry_reload_seconds,
+    )
+
+
+@lru_cache
+def get_metrics_flusher() -> MetricsFlusher:
+    """Shares this worker's metrics with the others through ``METRICS_DIR``."""
+    settings = get_settings()
+    return MetricsFlusher(
+        REGISTRY, Path(settings.metrics_dir or ""), flush_seconds=settings.metrics_flush_seconds
+    )
+
+
+def _registry_version() -> int:
+    with get_session() as session:
+        return current_registry_version(session)
+
+
+@lru_cache
+def get_manifest_indexer() -> ManifestIndexer:
+    return ManifestIndexer()
 
 
 def _provenance_path() -> Path:
-    path = Path(".data/provenance")
+    path = Path(get_settings().provenance_path)
     path.mkdir(parents=True, exist_ok=True)
     return path
+
+
+def _chain_id(settings: Settings) -> str | None:
+    """``PROVENANCE_CHAIN_ID``, else the host name when the store is shared (S3).
+
+    Chain heads are cached per process, so each chain needs a single writer; replicas on a
+    shared bucket get one chain per host by default.
+    """
+    if settings.provenance_chain_id:
+        return settings.provenance_chain_id
+    return socket.gethostname() if settings.provenance_backend == "s3" else None
+
+
+def _journal_path(settings: Settings) -> Path:
+    """``PROVENANCE_JOURNAL_PATH``, else a journal beside the store named after the chain id.
+
+    Workers sharing a journal would replay and truncate each other's batches, so the
+    writer locks it and a second worker started with the same chain id refuses to start.
+    """
+    if settings.provenance_journal_path:
+        return Path(settings.provenance_journal_path)
+    store = Path(settings.provenance_path)
+    if settings.provenance_chain_id:
+        return store.with_name(f"{store.name}.{settings.provenance_chain_id}.journal")
+    return store.with_name(f"{store.name}.journal")
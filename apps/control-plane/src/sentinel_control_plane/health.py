@@ -0,0 +1,295 @@
+"""Background health probes for registered tools."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, Generic, Iterable, List, NamedTuple, Optional, Set, TypeVar
+from urllib.parse import urljoin, urlsplit
+
+import httpx
+import structlog
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from .manifest_index import SessionFactory
+from .models import Tool, ToolHealth
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class ProbeTarget(NamedTuple):
+    tool_id: uuid.UUID
+    url: str
+    method: str
+    body: Optional[Dict[str, Any]]
+    interval_seconds: float
+
+
+class HealthResult(NamedTuple):
+    tool_id: uuid.UUID
+    healthy: bool
+    status_code: Optional[int]
+    latency_ms: float
+    error: Optional[str]
+    consecutive_failures: int
+    checked_at: datetime
+
+
+class TimingWheel(Generic[T]):
+    """Hashed timing wheel: O(1) scheduling, per-tick work proportional to one slot.
+
+    Delays longer than one revolution (``slots * tick_seconds``) wait out extra rounds in
+    their slot.
+    """
+
+    def __init__(self, slots: int, tick_seconds: float) -> None:
+        self._slots: List[List[List[Any]]] = [[] for _ in range(slots)]
+        self._tick_seconds = tick_seconds
+        self._cursor = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def schedule(self, item: T, delay_seconds: float) -> None:
+        ticks = max(1, math.ceil(delay_seconds / self._tick_seconds))
+        slot = (self._cursor + ticks) % len(self._slots)
+        self._slots[slot].append([(ticks - 1) // len(self._slots), item])
+        self._size += 1
+
+    def advance(self) -> List[T]:
+        """Move one tick forward and return the items that fall due."""
+        self._cursor = (self._cursor + 1) % len(self._slots)
+        bucket = self._slots[self._cursor]
+        due = [entry[1] for entry in bucket if entry[0] == 0]
+        waiting = [entry for entry in bucket if entry[0] > 0]
+        for entry in waiting:
+            entry[0] -= 1
+        self._slots[self._cursor] = waiting
+        self._size -= len(due)
+        return due
+
+
+class HealthScheduler:
+    """Runs tool health probes on a timing wheel.
+
+    Each target is probed every ``interval_seconds`` with ``jitter`` (a fraction of the
+    interval) applied to every reschedule, and its first probe lands at a random point in
+    its first interval so probes for tools registered together spread out. Probes share one
+    pooled HTTP client and are bounded by ``max_concurrency`` overall and
+    ``per_host_concurrency`` per tool host. The latest result per tool is kept in memory and
+    changed results are handed to ``persist`` in batches every ``flush_seconds``. Targets
+    are reloaded from ``load_targets`` every ``refresh_seconds``.
+    """
+
+    def __init__(
+        self,
+        load_targets: Callable[[], Iterable[ProbeTarget]],
+        persist: Callable[[List[HealthResult]], None],
+        *,
+        client: Optional[httpx.AsyncClient] = None,
+        max_concurrency: int = 200,
+        per_host_concurrency: int = 4,
+        timeout_seconds: float = 5.0,
+        tick_seconds: float = 1.0,
+        wheel_slots: int = 512,
+        jitter: float = 0.1,
+        flush_seconds: float = 5.0,
+        refresh_seconds: float = 30.0,
+        failure_threshold: int = 1,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self._load_targets = load_targets
+        self._persist = persist
+        self._client = client or httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_concurrency)
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._per_host_concurrency = per_host_concurrency
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._timeout = timeout_seconds
+        self._tick_seconds = tick_seconds
+        self._wheel: TimingWheel[ProbeTarget] = TimingWheel(wheel_slots, tick_seconds)
+        self._jitter = jitter
+        self._flush_seconds = flush_seconds
+        self._refresh_seconds = refresh_seconds
+        self._failure_threshold = failure_threshold
+        self._rng = rng or random.Random()
+        self._targets: Dict[uuid.UUID, ProbeTarget] = {}
+        self._results: Dict[uuid.UUID, HealthResult] = {}
+        self._pending: Dict[uuid.UUID, HealthResult] = {}
+        self._in_flight: Set[asyncio.Task[None]] = set()
+        self._refresh_requested = False
+
+    def result(self, tool_id: uuid.UUID) -> Optional[HealthResult]:
+        return self._results.get(tool_id)
+
+    def results(self) -> List[HealthResult]:
+        return list(self._results.values())
+
+    def request_refresh(self) -> None:
+        """Reload targets on the next tick (safe to call from any thread)."""
+        self._refresh_requested = True
+
+    async def refresh(self) -> None:
+        """Reload targets, scheduling new or changed ones and dropping removed ones."""
+        targets = {target.tool_id: target for target in await asyncio.to_thread(self._load_targets)}
+        for tool_id in set(self._targets) - set(targets):
+            del self._targets[tool_id]
+            self._results.pop(tool_id, None)
+        for tool_id, target in targets.items():
+            if self._targets.get(tool_id) != target:
+                self._targets[tool_id] = target
+                self._wheel.schedule(target, self._rng.uniform(0, target.interval_seconds))
+
+    async def tick(self) -> int:
+        """Advance the wheel one tick and start the probes that fall due."""
+        started = 0
+        for target in self._wheel.advance():
+            if self._targets.get(target.tool_id) is not target:
+                continue  # removed or rescheduled with a new configuration
+            task = asyncio.create_task(self._probe_and_reschedule(target))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+            started += 1
+        return started
+
+    async def drain(self) -> None:
+        while self._in_flight:
+            await asyncio.gather(*list(self._in_flight))
+
+    async def flush(self) -> int:
+        batch, self._pending = list(self._pending.values()), {}
+        if batch:
+            await asyncio.to_thread(self._persist, batch)
+        return len(batch)
+
+    async def run(self) -> None:
+        """Tick, flush and refresh until cancelled; flushes pending results on the way out."""
+        loop = asyncio.get_running_loop()
+        await self.refresh()
+        next_tick = loop.time() + self._tick_seconds
+        next_flush = loop.time() + self._flush_seconds
+        next_refresh = loop.time() + self._refresh_seconds
+        try:
+            while True:
+                await asyncio.sleep(max(0.0, next_tick - loop.time()))
+                while next_tick <= loop.time():  # catch up if the loop was busy
+                    await self.tick()
+                    next_tick += self._tick_seconds
+                if loop.time() >= next_flush:
+                    await self._guarded(self.flush())
+                    next_flush = loop.time() + self._flush_seconds
+                if self._refresh_requested or loop.time() >= next_refresh:
+                    self._refresh_requested = False
+                    await self._guarded(self.refresh())
+                    next_refresh = loop.time() + self._refresh_seconds
+        finally:
+            await self.drain()
+            await self._guarded(self.flush())
+            await self._client.aclose()
+
+    async def _probe_and_reschedule(self, target: ProbeTarget) -> None:
+        result = await self._probe(target)
+        if self._targets.get(target.tool_id) is not target:
+            return
+        self._results[target.tool_id] = result
+        self._pending[target.tool_id] = result
+        spread = self._rng.uniform(-self._jitter, self._jitter)
+        self._wheel.schedule(target, target.interval_seconds * (1 + spread))
+
+    async def _probe(self, target: ProbeTarget) -> HealthResult:
+        host = urlsplit(target.url).netloc
+        host_semaphore = self._host_semaphores.setdefault(
+            host, asyncio.Semaphore(self._per_host_concurrency)
+        )
+        status_code: Optional[int] = None
+        error: Optional[str] = None
+        async with self._semaphore, host_semaphore:
+            started = time.perf_counter()
+            try:
+                response = await self._client.request(
+                    target.method, target.url, json=target.body, timeout=self._timeout
+                )
+                status_code = response.status_code
+                if status_code >= 400:
+                    error = f"HTTP {status_code}"
+            except Exception as exc:  # any failure is a failed probe, never a lost target
+                error = f"{type(exc).__name__}: {exc}"[:200]
+            latency_ms = (time.perf_counter() - started) * 1000
+        previous = self._results.get(target.tool_id)
+        failures = 0 if error is None else (previous.consecutive_failures if previous else 0) + 1
+        return HealthResult(
+            tool_id=target.tool_id,
+            healthy=failures < self._failure_threshold,
+            status_code=status_code,
+            latency_ms=round(latency_ms, 1),
+            error=error,
+            consecutive_failures=failures,
+            checked_at=datetime.utcnow(),
+        )
+
+    async def _guarded(self, operation: Any) -> None:
+        try:
+            await operation
+        except Exception:  # keep probing through database hiccups
+            logger.exception("health.scheduler_error")
+
+
+def load_probe_targets(sessions: SessionFactory) -> Callable[[], List[ProbeTarget]]:
+    """Target loader for active tools that registered a health check."""
+
+    def load() -> List[ProbeTarget]:
+        with sessions() as session:
+            rows = session.execute(
+                select(Tool.id, Tool.url, Tool.healthcheck).where(
+                    Tool.healthcheck.is_not(None), Tool.is_active.is_(True)
+                )
+            ).all()
+        return [
+            ProbeTarget(
+                tool_id=tool_id,
+                url=urljoin(url, check["path"]),
+                method=check.get("method", "GET"),
+                body=check.get("body"),
+                interval_seconds=float(check.get("interval_seconds", 60)),
+            )
+            for tool_id, url, check in rows
+        ]
+
+    return load
+
+
+def persist_health_results(sessions: SessionFactory) -> Callable[[List[HealthResult]], None]:
+    """Persistence callback upserting a batch of results into ``tool_health``."""
+
+    def persist(results: List[HealthResult]) -> None:
+        with sessions() as session:
+            statement = _upsert(session).values([result._asdict() for result in results])
+            session.execute(
+                statement.on_conflict_do_update(
+                    index_elements=["tool_id"],
+                    set_={
+                        column: statement.excluded[column]
+                        for column in HealthResult._fields
+                        if column != "tool_id"
+                    },
+                )
+            )
+
+    return persist
+
+
+def _upsert(session: Session) -> Any:
+    if session.get_bind().dialect.name == "sqlite":
+        return sqlite_insert(ToolHealth)
+    return pg_insert(ToolHealth)
@@ -0,0 +1,349 @@
+"""Cross-replica invalidation bus for in-process registry state."""
+
+from __future__ import annotations
+
+import json
+import queue
+import threading
+import time
+import uuid
+from typing import Callable, Iterator, List, NamedTuple, Optional, Protocol, Tuple
+
+import structlog
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_CHANNEL = "sentinel_invalidation"
+# NOTIFY payloads are capped at 8000 bytes; larger events fall back to tenant-wide ones.
+MAX_PAYLOAD_BYTES = 7900
+_PENDING_KEY = "sentinel.invalidation.pending"
+
+
+class InvalidationEvent(NamedTuple):
+    """A committed change other replicas must drop cached state for.
+
+    ``kind`` is ``tenant``, ``tool``, ``kill``, ``policy`` or, for events synthesised by the
+    bus after a reconnect or a detected gap, ``resync`` (drop everything). An empty
+    ``tool_names`` covers every tool of ``tenant_slug``. ``version`` is the registry version
+    of the write, or ``None`` for changes that do not bump it (policy data revisions).
+    """
+
+    kind: str
+    version: Optional[int]
+    tenant_slug: Optional[str] = None
+    tool_names: Tuple[str, ...] = ()
+    origin: str = ""
+    published_at: float = 0.0
+
+    def encode(self) -> str:
+        payload = json.dumps(self._asdict(), separators=(",", ":"))
+        if len(payload.encode("utf-8")) > MAX_PAYLOAD_BYTES and self.tool_names:
+            return self._replace(tool_names=()).encode()
+        return payload
+
+    @classmethod
+    def decode(cls, payload: str) -> "InvalidationEvent":
+        data = json.loads(payload)
+        data["tool_names"] = tuple(data.get("tool_names") or ())
+        return cls(**data)
+
+
+InvalidationHandler = Callable[[InvalidationEvent], None]
+
+
+class InvalidationTransport(Protocol):
+    """Delivers encoded events between replicas.
+
+    ``listen`` yields ``None`` once the subscription is live (events published before that
+    may have been missed) and then every payload received, until ``stop`` is set. It raises
+    when the connection drops; the bus reconnects.
+    """
+
+    transactional: bool
+
+    def publish(self, payload: str, session: Optional[Session] = None) -> None: ...
+
+    def listen(self, stop: threading.Event) -> Iterator[Optional[str]]: ...
+
+    def close(self) -> None: ...
+
+
+class PostgresTransport:
+    """LISTEN/NOTIFY on the registry database.
+
+    ``pg_notify`` runs inside the writing transaction, so replicas are notified exactly when
+    the change commits and never for a rolled-back write.
+    """
+
+    transactional = True
+
+    def __init__(self, url: str, channel: str = DEFAULT_CHANNEL, poll_seconds: float = 1.0) -> None:
+        dsn = make_url(url).set(drivername="postgresql")  # psycopg takes a plain libpq URL
+        self._dsn = dsn.render_as_string(hide_password=False)
+        self._channel = channel
+        self._poll_seconds = poll_seconds
+
+    def publish(self, payload: str, session: Optional[Session] = None) -> None:
+        if session is None:
+            raise ValueError("Postgres invalidation events are published inside a transaction")
+        session.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": self._channel, "payload": payload},
+        )
+
+    def listen(self, stop: threading.Event) -> Iterator[Optional[str]]:
+        import psycopg
+        from psycopg import sql
+
+        with psycopg.connect(self._dsn, autocommit=True) as connection:
+            connection.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self._channel)))
+            yield None
+            while not stop.is_set():
+                for notify in connection.notifies(timeout=self._poll_seconds):
+                    yield notify.payload
+
+    def close(self) -> None:
+        return None
+
+
+class RedisTransport:
+    """Redis pub/sub, for deployments that already share a Redis.
+
+    Pub/sub is fire-and-forget, so events are published after the write commits.
+    """
+
+    transactional = False
+
+    def __init__(self, url: str, channel: str = DEFAULT_CHANNEL, poll_seconds: float = 1.0) -> None:
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+        self._channel = channel
+        self._poll_seconds = poll_seconds
+
+    def publish(self, payload: str, session: Optional[Session] = None) -> None:
+        self._client.publish(self._channel, payload)
+
+    def listen(self, stop: threading.Event) -> Iterator[Optional[str]]:
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        try:
+            pubsub.subscribe(self._channel)
+            yield None
+            while not stop.is_set():
+                message = pubsub.get_message(timeout=self._poll_seconds)
+                if message is not None:
+                    data = message["data"]
+                    yield data.decode("utf-8") if isinstance(data, bytes) else data
+        finally:
+            pubsub.close()
+
+    def close(self) -> None:
+        self._client.close()
+
+
+class MemoryHub:
+    """In-process broker connecting ``MemoryTransport`` instances (tests and benchmarks)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._subscribers: List["queue.Queue[str]"] = []
+
+    def broadcast(self, payload: str) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            subscriber.put(payload)
+
+    def subscribe(self) -> "queue.Queue[str]":
+        subscriber: "queue.Queue[str]" = queue.Queue()
+        with self._lock:
+            self._subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: "queue.Queue[str]") -> None:
+        with self._lock:
+            self._subscribers.remove(subscriber)
+
+
+class MemoryTransport:
+    transactional = False
+
+    def __init__(self, hub: MemoryHub, poll_seconds: float = 0.05) -> None:
+        self._hub = hub
+        self._poll_seconds = poll_seconds
+
+    def publish(self, payload: str, session: Optional[Session] = None) -> None:
+        self._hub.broadcast(payload)
+
+    def listen(self, stop: threading.Event) -> Iterator[Optional[str]]:
+        subscriber = self._hub.subscribe()
+        try:
+            yield None
+            while not stop.is_set():
+                try:
+                    yield subscriber.get(timeout=self._poll_seconds)
+                except queue.Empty:
+                    continue
+        finally:
+            self._hub.unsubscribe(subscriber)
+
+    def close(self) -> None:
+        return None
+
+
+class InvalidationBus:
+    """Publishes registry changes on write and fans them out to local handlers on every replica.
+
+    A background thread consumes the transport and reconnects with exponential backoff.
+    Registry events carry the registry version, which increases by one per committed write;
+    when a replica sees a version jump (or (re)connects and may have missed events) it
+    reads ``current_version`` and hands its handlers a ``resync`` event instead, so a lost
+    message costs a cache flush rather than stale state.
+    """
+
+    def __init__(
+        self,
+        transport: InvalidationTransport,
+        *,
+        current_version: Optional[Callable[[], int]] = None,
+        replica_id: Optional[str] = None,
+        reconnect_initial_seconds: float = 0.5,
+        reconnect_max_seconds: float = 30.0,
+    ) -> None:
+        self._transport = transport
+        self._current_version = current_version
+        self.replica_id = replica_id or uuid.uuid4().hex[:12]
+        self._reconnect_initial = reconnect_initial_seconds
+        self._reconnect_max = reconnect_max_seconds
+        self._handlers: List[InvalidationHandler] = []
+        self._version: Optional[int] = None
+        self._connected = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.resyncs = 0
+
+    def subscribe(self, handler: InvalidationHandler) -> None:
+        self._handlers.append(handler)
+
+    def publish(
+        self,
+        session: Session,
+        kind: str,
+        version: Optional[int],
+        tenant_slug: Optional[str] = None,
+        tool_names: Tuple[str, ...] = (),
+    ) -> None:
+        """Publish a change made in ``session``; other replicas hear about it once it commits."""
+        payload = InvalidationEvent(
+            kind=kind,
+            version=version,
+            tenant_slug=tenant_slug,
+            tool_names=tuple(tool_names),
+            origin=self.replica_id,
+            published_at=time.time(),
+        ).encode()
+        if self._transport.transactional:
+            self._transport.publish(payload, session)
+            return
+        pending: Optional[List[str]] = session.info.get(_PENDING_KEY)
+        if pending is None:
+            pending = session.info[_PENDING_KEY] = []
+            event.listen(session, "after_commit", self._publish_pending, once=True)
+            event.listen(session, "after_rollback", self._discard_pending, once=True)
+        pending.append(payload)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="invalidation-bus", daemon=True)
+        self._thread.start()
+
+    def wait_connected(self, timeout: float) -> bool:
+        return self._connected.wait(timeout)
+
+    def close(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._transport.close()
+
+    def _publish_pending(self, session: Session) -> None:
+        for payload in session.info.pop(_PENDING_KEY, []):
+            try:
+                self._transport.publish(payload)
+            except Exception:  # the write is committed; peers resync on the version gap
+                logger.warning("invalidation.publish_failed", exc_info=True)
+
+    def _discard_pending(self, session: Session) -> None:
+        session.info.pop(_PENDING_KEY, None)
+
+    def _run(self) -> None:
+        delay = self._reconnect_initial
+        while not self._stopped.is_set():
+            try:
+                for payload in self._transport.listen(self._stopped):
+                    if payload is None:
+                        self._resync("connected")
+                        self._connected.set()
+                        delay = self._reconnect_initial
+                    else:
+                        self._receive(payload)
+            except Exception:
+                logger.warning("invalidation.listener_disconnected", retry_in=delay, exc_info=True)
+            self._connected.clear()
+            if self._stopped.wait(delay):
+                return
+            delay = min(delay * 2, self._reconnect_max)
+
+    def _receive(self, payload: str) -> None:
+        try:
+            received = InvalidationEvent.decode(payload)
+        except (ValueError, TypeError):
+            logger.warning("invalidation.bad_payload", payload=payload[:200])
+            return
+        if received.version is not None:
+            if self._version is None:  # no baseline yet: nothing to compare against
+                self._version = received.version
+            elif received.version < self._version:
+                return  # already covered by a resync
+            elif received.version > self._version + 1:
+                self._resync("gap", seen=received.version)
+                return
+            else:
+                self._version = received.version
+        self._dispatch(received)
+
+    def _resync(self, reason: str, seen: Optional[int] = None) -> None:
+        version = seen
+        if self._current_version is not None:
+            try:
+                current = self._current_version()
+                version = current if version is None else max(version, current)
+            except Exception:
+                logger.warning("invalidation.version_unavailable", exc_info=True)
+        self._version = version
+        self.resyncs += 1
+        logger.info("invalidation.resync", reason=reason, version=version)
+        self._dispatch(InvalidationEvent(kind="resync", version=version, origin=self.replica_id))
+
+    def _dispatch(self, received: InvalidationEvent) -> None:
+        for handler in list(self._handlers):
+            try:
+                handler(received)
+            except Exception:
+                logger.exception("invalidation.handler_failed", kind=received.kind)
+
+
+def build_transport(
+    kind: str, *, postgres_url: str, redis_url: str, channel: str
+) -> InvalidationTransport:
+    if kind == "postgres":
+        return PostgresTransport(postgres_url, channel)
+    if kind == "redis":
+        return RedisTransport(redis_url, channel)
+    raise ValueError(f"Unsupported invalidation transport '{kind}'")
@@ -0,0 +1,207 @@
+"""Automatic restore of time-boxed kills."""
+
+from __future__ import annotations
+
+import heapq
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+import structlog
+from sqlalchemy import Select, delete, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from .invalidation import InvalidationBus
+from .manifest_index import SessionFactory
+from .models import KillExpiration, Tenant, Tool
+from .registry_version import bump_registry_version
+
+logger = structlog.get_logger(__name__)
+EXPIRATION_BATCH_SIZE = 1000  # rows per INSERT, well under SQLite's bound-parameter limit
+
+ToolIds = Union[Sequence[uuid.UUID], Select[tuple[uuid.UUID]]]
+
+
+def set_expirations(
+    session: Session, tool_ids: Sequence[uuid.UUID], expires_at: datetime, reason: str
+) -> None:
+    """Record (or move) the automatic restore of ``tool_ids`` in the caller's transaction."""
+    insert = sqlite_insert if session.get_bind().dialect.name == "sqlite" else pg_insert
+    ordered = sorted(tool_ids)
+    for start in range(0, len(ordered), EXPIRATION_BATCH_SIZE):
+        statement = insert(KillExpiration).values(
+            [
+                {"tool_id": tool_id, "expires_at": expires_at, "reason": reason}
+                for tool_id in ordered[start : start + EXPIRATION_BATCH_SIZE]
+            ]
+        )
+        session.execute(
+            statement.on_conflict_do_update(
+                index_elements=["tool_id"],
+                set_={
+                    "expires_at": statement.excluded.expires_at,
+                    "reason": statement.excluded.reason,
+                },
+            )
+        )
+
+
+def cancel_expirations(session: Session, tool_ids: ToolIds) -> None:
+    """Drop pending restores, for manual restores and kills that are now indefinite."""
+    if not isinstance(tool_ids, Select):
+        tool_ids = list(tool_ids)
+    session.execute(delete(KillExpiration).where(KillExpiration.tool_id.in_(tool_ids)))
+
+
+class KillExpiryScheduler:
+    """Restores time-boxed kills when they expire.
+
+    Pending expirations live in ``kill_expirations``; this thread only keeps a min-heap of
+    their times so it can sleep until the next one is due. When it wakes it claims due
+    rows with ``DELETE ... RETURNING`` (``FOR UPDATE SKIP LOCKED`` on Postgres) and
+    restores the claimed tools in the same transaction, so with several replicas each
+    restore happens exactly once no matter which replica gets there first. The heap is
+    rebuilt from the table at start (restores that fell due while nothing ran happen
+    immediately), every ``reload_seconds`` and on ``request_reload``, which picks up
+    expirations created on other replicas.
+    """
+
+    def __init__(
+        self,
+        session_factory: SessionFactory,
+        *,
+        bus: Optional[InvalidationBus] = None,
+        reload_seconds: float = 60.0,
+        batch_size: int = 1000,
+        clock: Callable[[], datetime] = datetime.utcnow,
+    ) -> None:
+        self._session_factory = session_factory
+        self._bus = bus
+        self._reload_seconds = reload_seconds
+        self._batch_size = batch_size
+        self._clock = clock
+        self._heap: List[datetime] = []
+        self._condition = threading.Condition()
+        self._reload_requested = False
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="kill-expiry", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stopped.set()
+        with self._condition:
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def schedule(self, expires_at: datetime) -> None:
+        with self._condition:
+            heapq.heappush(self._heap, expires_at)
+            if self._heap[0] == expires_at:
+                self._condition.notify()
+
+    def request_reload(self) -> None:
+        with self._condition:
+            self._reload_requested = True
+            self._condition.notify()
+
+    def reload(self) -> int:
+        with self._session_factory() as session:
+            pending = list(
+                session.execute(select(KillExpiration.expires_at).distinct()).scalars()
+            )
+        heapq.heapify(pending)
+        with self._condition:
+            self._heap = pending
+        return len(pending)
+
+    def restore_due(self) -> int:
+        """Claim and restore every expiration that is due; returns the tools restored."""
+        with self._condition:
+            now = self._clock()
+            while self._heap and self._heap[0] <= now:
+                heapq.heappop(self._heap)
+        restored = 0
+        while True:
+            with self._session_factory() as session:
+                claimed = self._claim(session, now)
+                if claimed:
+                    restored += self._restore(session, claimed, now)
+            if len(claimed) < self._batch_size:
+                return restored
+
+    def _claim(self, session: Session, now: datetime) -> List[uuid.UUID]:
+        due = (
+            select(KillExpiration.tool_id)
+            .where(KillExpiration.expires_at <= now)
+            .order_by(KillExpiration.expires_at)
+            .limit(self._batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        return list(
+            session.execute(
+                delete(KillExpiration)
+                .where(KillExpiration.tool_id.in_(due.scalar_subquery()))
+                .returning(KillExpiration.tool_id)
+            ).scalars()
+        )
+
+    def _restore(self, session: Session, tool_ids: List[uuid.UUID], now: datetime) -> int:
+        version = bump_registry_version(session)
+        rows = session.execute(
+            update(Tool)
+            .where(Tool.id.in_(tool_ids), Tool.is_active.is_(False))
+            .values(is_active=True, version=version, updated_at=now)
+            .returning(Tool.tenant_id, Tool.name)
+            .execution_options(synchronize_session=False)
+        ).all()
+        by_tenant: Dict[uuid.UUID, List[str]] = {}
+        for tenant_id, name in rows:
+            by_tenant.setdefault(tenant_id, []).append(name)
+        slugs = {
+            tenant_id: slug
+            for tenant_id, slug in session.execute(
+                select(Tenant.id, Tenant.slug).where(Tenant.id.in_(by_tenant))
+            )
+        }
+        for tenant_id, names in sorted(by_tenant.items(), key=lambda item: slugs[item[0]]):
+            logger.info("kill_switch.expired", tenant=slugs[tenant_id], affected_tools=names)
+            if self._bus is not None:
+                self._bus.publish(session, "kill", version, slugs[tenant_id], tuple(sorted(names)))
+        return len(rows)
+
+    def _run(self) -> None:
+        next_reload = 0.0
+        while not self._stopped.is_set():
+            try:
+                if self._reload_requested or time.monotonic() >= next_reload:
+                    self._reload_requested = False
+                    self.reload()
+                    next_reload = time.monotonic() + self._reload_seconds
+                if self._heap and self._heap[0] <= self._clock():
+                    self.restore_due()
+            except Exception:  # keep the timer alive through database outages
+                logger.exception("kill_switch.expiry_error")
+                self._reload_requested = True  # due times were popped; the table still has them
+                self._stopped.wait(1.0)
+            with self._condition:
+                timeout = next_reload - time.monotonic()
+                if self._heap:
+                    until_due = (self._heap[0] - self._clock()).total_seconds()
+                    timeout = min(timeout, until_due)
+                if timeout > 0 and not self._reload_requested and not self._stopped.is_set():
+                    self._condition.wait(timeout)
@@ -0,0 +1,84 @@
+"""Hot tenant and tool lookups shared by the routes.
+
+Every policy check, provenance signature and kill resolves a tenant slug and usually a tool
+name. The statements here are built once, at import, with bound parameters: SQLAlchemy
+memoizes a statement object's cache key, so executing one only binds new values and hits
+the compiled cache, instead of rebuilding the statement and walking it for a key on every
+request. They select just the columns the callers need rather than whole ORM entities.
+"""
+
+from __future__ import annotations
+
+import uuid
+from typing import List, NamedTuple, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, bindparam, select
+from sqlalchemy.orm import Session
+
+from .models import Tenant, Tool
+
+_TENANT_ID = select(Tenant.id).where(Tenant.slug == bindparam("slug"))
+_TENANT = select(Tenant).where(Tenant.slug == bindparam("slug"))
+_TENANT_AND_TOOL_IDS = (
+    select(Tenant.id.label("tenant_id"), Tool.id.label("tool_id"))
+    .outerjoin(Tool, and_(Tool.tenant_id == Tenant.id, Tool.name == bindparam("tool_name")))
+    .where(Tenant.slug == bindparam("tenant_slug"))
+)
+_TOOL_IDS = select(Tool.id).where(Tool.tenant_id == bindparam("tenant_id"))
+_TOOL_ID = _TOOL_IDS.where(Tool.name == bindparam("tool_name"))
+
+
+class ToolRef(NamedTuple):
+    tenant_id: uuid.UUID
+    tool_id: uuid.UUID
+
+
+def find_tenant_id(session: Session, slug: str) -> Optional[uuid.UUID]:
+    return session.execute(_TENANT_ID, {"slug": slug}).scalar_one_or_none()
+
+
+def find_tenant(session: Session, slug: str) -> Optional[Tenant]:
+    """The ORM tenant, for write paths that update or stamp it."""
+    return session.execute(_TENANT, {"slug": slug}).scalar_one_or_none()
+
+
+def require_tenant_id(session: Session, slug: str) -> uuid.UUID:
+    tenant_id = find_tenant_id(session, slug)
+    if tenant_id is None:
+        raise _tenant_not_found(slug)
+    return tenant_id
+
+
+def require_tool(session: Session, tenant_slug: str, tool_name: str) -> ToolRef:
+    """Resolve tenant and tool in one round trip; 404 names whichever is missing."""
+    row = session.execute(
+        _TENANT_AND_TOOL_IDS, {"tenant_slug": tenant_slug, "tool_name": tool_name}
+    ).first()
+    if row is None:
+        raise _tenant_not_found(tenant_slug)
+    tenant_id, tool_id = row
+    if tool_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tool '{tool_name}' not registered for tenant '{tenant_slug}'",
+        )
+    return ToolRef(tenant_id, tool_id)
+
+
+def find_tool_ids(
+    session: Session, tenant_id: uuid.UUID, tool_name: Optional[str] = None
+) -> List[uuid.UUID]:
+    """Ids of one tool of a tenant, or of all of them when ``tool_name`` is ``None``."""
+    if tool_name is None:
+        result = session.execute(_TOOL_IDS, {"tenant_id": tenant_id})
+    else:
+        result = session.execute(_TOOL_ID, {"tenant_id": tenant_id, "tool_name": tool_name})
+    return list(result.scalars().all())
+
+
+def _tenant_not_found(slug: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Tenant '{slug}' not found",
+    )
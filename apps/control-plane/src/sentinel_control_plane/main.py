@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 import structlog
-from fastapi import APIRouter, FastAPI
+from fastapi import APIRouter, FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from opentelemetry import trace
 from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
@@ -14,17 +18,74 @@ from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
 
 from .config import get_settings
+from .database import get_async_engine, pool_stats
+from .dependencies import (
+    get_health_scheduler,
+    get_invalidation_bus,
+    get_kill_expiry_scheduler,
+    get_manifest_indexer,
+    get_manifest_writer,
+    get_metrics_flusher,
+    get_replica_router,
+)
+from .invalidation import InvalidationEvent
+from .metrics import CONTENT_TYPE, REGISTRY, MetricsMiddleware
+from .registry_version import RegistryVersionMiddleware
 from .routes import include_routes
+from .schemas import DatabasePoolStats, ReplicaReport, ReplicaStatus
+from .server_timing import SERVER_TIMING_HEADER, ServerTimingMiddleware
 
 logger = structlog.get_logger(__name__)
 
 
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    get_manifest_writer()  # replay any journaled writes before serving traffic
+    settings = get_settings()
+    if settings.database_replica_urls:
+        get_replica_router().start()
+    probes = None
+    if settings.health_checks_enabled:
+        probes = asyncio.create_task(get_health_scheduler().run())
+    if settings.kill_expiry_enabled:
+        get_kill_expiry_scheduler().start()  # restores anything that expired while down
+    if settings.invalidation_transport:
+        bus = get_invalidation_bus()
+        if settings.health_checks_enabled:
+            bus.subscribe(_refresh_health)
+        if settings.kill_expiry_enabled:
+            bus.subscribe(_reload_kill_expiry)
+        bus.start()
+    if settings.metrics_dir:
+        get_metrics_flusher().start()
+    yield
+    if get_kill_expiry_scheduler.cache_info().currsize:
+        get_kill_expiry_scheduler().close()
+    if get_invalidation_bus.cache_info().currsize:
+        get_invalidation_bus().close()
+    if probes is not None:
+        probes.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await probes
+    if get_manifest_writer.cache_info().currsize:
+        get_manifest_writer().close()
+    if get_settings().provenance_index_enabled:
+        get_manifest_indexer().close()
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
+    if get_replica_router.cache_info().currsize:
+        get_replica_router().close()
+    if get_metrics_flusher.cache_info().currsize:
+        get_metrics_flusher().close()
+
+
 def create_app() -> FastAPI:
     settings = get_settings()
     app = FastAPI(
         title="Sentinel MCP Control Plane",
         description="Personal R&D project for governing MCP tools.",
         version="0.1.0",
+        lifespan=lifespan,
     )
     app.add_middleware(
         CORSMiddleware,
@@ -32,23 +93,64 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Registry-Version", SERVER_TIMING_HEADER],
     )
+    app.add_middleware(RegistryVersionMiddleware)
+    if settings.server_timing_enabled:
+        app.add_middleware(ServerTimingMiddleware)
+    app.add_middleware(MetricsMiddleware)
 
     if settings.telemetry_enabled():
         _configure_tracing(settings.otel_exporter_otlp_endpoint or "")
 
     api_router = APIRouter()
-    include_routes(api_router)
+    include_routes(api_router, database_async=settings.database_async)
     app.include_router(api_router)
 
     @app.get("/healthz")
     def health() -> dict[str, str]:
         return {"status": "ok"}
 
+    @app.get("/healthz/pool", response_model=list[DatabasePoolStats])
+    def database_pools() -> list[DatabasePoolStats]:
+        """Checked-out connections, overflow in use and checkout waits per engine."""
+        return [DatabasePoolStats(**stats) for stats in pool_stats()]
+
+    @app.get("/healthz/replicas", response_model=ReplicaReport)
+    def database_replicas() -> ReplicaReport:
+        """Health, lag and read counts of the read replicas and of primary fallbacks."""
+        if not get_settings().database_replica_urls:
+            return ReplicaReport(enabled=False)
+        router = get_replica_router()
+        return ReplicaReport(
+            enabled=True,
+            primary_reads=router.primary_reads,
+            replicas=[ReplicaStatus(**stats) for stats in router.stats()],
+        )
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics() -> Response:
+        """Prometheus exposition of request, OPA, database, signing and storage latencies."""
+        if get_settings().metrics_dir:
+            samples = get_metrics_flusher().collect()
+        else:
+            samples = REGISTRY.snapshot()
+        return Response(REGISTRY.render(samples), media_type=CONTENT_TYPE)
+
     logger.info("control_plane.startup", settings=settings.as_dict())
     return app
 
 
+def _refresh_health(event: InvalidationEvent) -> None:
+    if event.kind != "policy":  # policy data does not change which tools are probed
+        get_health_scheduler().request_refresh()
+
+
+def _reload_kill_expiry(event: InvalidationEvent) -> None:
+    if event.kind in ("kill", "resync"):
+        get_kill_expiry_scheduler().request_reload()
+
+
 def _configure_tracing(endpoint: str) -> None:
     resource = Resource.create({"service.name": "sentinel-control-plane"})
     provider = TracerProvider(resource=resource)
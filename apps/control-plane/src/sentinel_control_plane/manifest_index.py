@@ -0,0 +1,148 @@
+"""Bulk indexing of provenance manifest metadata into Postgres."""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, ContextManager, Dict, List, Optional
+
+import structlog
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Insert
+
+from sentinel_provenance.storage import StoredManifest
+
+from .database import get_session
+from .models import ProvenanceManifest
+
+logger = structlog.get_logger(__name__)
+
+SessionFactory = Callable[[], ContextManager[Session]]
+
+
+class ManifestIndexer:
+    """Buffers manifest metadata and inserts it into ``provenance_manifests`` in bulk.
+
+    ``record`` only appends to an in-memory buffer; a background thread flushes the buffer
+    with one multi-row insert whenever ``batch_size`` rows are waiting or every
+    ``flush_interval`` seconds. If the database is unavailable, rows are kept for the next
+    flush up to ``max_buffer`` rows, after which the oldest are dropped and logged. A row
+    the database rejects (say, a value too long for its column) fails the whole insert, so
+    the batch is then retried one row at a time and only the rejected rows are dropped.
+    """
+
+    def __init__(
+        self,
+        session_factory: SessionFactory = get_session,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_buffer: int = 50_000,
+    ) -> None:
+        self._session_factory = session_factory
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._max_buffer = max_buffer
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def record(self, manifest_id: str, manifest: Dict[str, Any], stored: StoredManifest) -> None:
+        action = manifest.get("action", {})
+        row = {
+            "id": manifest_id,
+            "tenant_slug": str(action.get("tenant", "")),
+            "tool_name": str(action.get("tool", "")),
+            "action": str(action.get("action", "")),
+            "timestamp": manifest["timestamp"],
+            "storage_location": stored.location,
+            "size_bytes": stored.size,
+        }
+        with self._lock:
+            self._buffer.append(row)
+            full = len(self._buffer) >= self._batch_size
+        if full:
+            self._wake.set()
+        self._ensure_thread()
+
+    def flush(self) -> int:
+        """Insert every buffered row now; returns the number of rows written."""
+        with self._flush_lock:
+            with self._lock:
+                rows, self._buffer = self._buffer, []
+            if not rows:
+                return 0
+            try:
+                self._insert(rows)
+            except (DataError, IntegrityError):
+                return self._insert_each(rows)
+            except Exception:  # pylint: disable=broad-except
+                self._requeue(rows)
+                logger.exception("provenance.index_flush_failed", rows=len(rows))
+                return 0
+            return len(rows)
+
+    def close(self) -> None:
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.flush()
+
+    def _insert(self, rows: List[Dict[str, Any]]) -> None:
+        with self._session_factory() as session:
+            session.execute(_insert_ignoring_duplicates(session), rows)
+
+    def _insert_each(self, rows: List[Dict[str, Any]]) -> int:
+        written = 0
+        for position, row in enumerate(rows):
+            try:
+                self._insert([row])
+            except (DataError, IntegrityError):
+                logger.exception("provenance.index_row_dropped", manifest_id=row["id"])
+            except Exception:  # pylint: disable=broad-except
+                self._requeue(rows[position:])
+                logger.exception("provenance.index_flush_failed", rows=len(rows) - position)
+                break
+            else:
+                written += 1
+        return written
+
+    def _requeue(self, rows: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._buffer = rows + self._buffer
+            overflow = len(self._buffer) - self._max_buffer
+            if overflow > 0:
+                del self._buffer[:overflow]
+        if overflow > 0:
+            logger.warning("provenance.index_rows_dropped", rows=overflow)
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None or self._stopped.is_set():
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="provenance-indexer", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            self.flush()
+
+
+def _insert_ignoring_duplicates(session: Session) -> Insert:
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return pg_insert(ProvenanceManifest).on_conflict_do_nothing(index_elements=["id"])
+    if dialect == "sqlite":
+        return sqlite_insert(ProvenanceManifest).on_conflict_do_nothing(index_elements=["id"])
+    return insert(ProvenanceManifest)
@@ -0,0 +1,518 @@
+"""Prometheus metrics: per-thread recording, multi-worker aggregation, text exposition."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import uuid
+import weakref
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+import structlog
+from sqlalchemy import Engine, event
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .server_timing import record_stage
+
+logger = structlog.get_logger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+QUERY_OPERATIONS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"})
+
+Labels = Tuple[str, ...]
+Samples = Dict[str, Dict[Labels, List[float]]]
+Shard = Dict[Tuple[str, Labels], List[float]]
+
+
+class MetricsRegistry:
+    """Counters and histograms recorded without locks.
+
+    Every thread records into its own shard (a dict of value lists only that thread
+    writes), so the hot path is a thread-local lookup and a couple of list increments; the
+    asyncio loop is one thread and shares one shard. A scrape copies and sums the shards.
+    It can miss an observation that is mid-flight, which the next scrape picks up. When a
+    thread exits, its shard is folded into a retired aggregate, so short-lived threads
+    (threadpool turnover) do not grow the shard list.
+    """
+
+    def __init__(self) -> None:
+        self.metrics: Dict[str, Metric] = {}
+        self._shards: Dict[int, Shard] = {}
+        self._retired: Shard = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()  # only taken when a thread starts or stops recording
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(self, name, documentation, tuple(labelnames)))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        stage: Optional[str] = None,
+    ) -> Histogram:
+        return self._register(
+            Histogram(
+                self, name, documentation, tuple(labelnames), tuple(sorted(buckets)), stage
+            )
+        )
+
+    def shard(self) -> Shard:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard: Shard = {}
+            with self._lock:
+                self._shards[id(shard)] = shard
+            self._local.shard = shard
+            # Thread-local values are dropped when their thread exits, which runs this.
+            self._local.owner = _ShardOwner()
+            weakref.finalize(self._local.owner, self._retire, shard).atexit = False
+            return shard
+
+    def snapshot(self) -> Samples:
+        """This process's totals, per metric and label values."""
+        with self._lock:
+            shards = [*self._shards.values(), _copy(self._retired)]
+        samples: Samples = {}
+        for shard in shards:
+            for (name, labels), values in shard.copy().items():
+                _accumulate(samples.setdefault(name, {}), labels, values)
+        return samples
+
+    def _retire(self, shard: Shard) -> None:
+        with self._lock:
+            self._shards.pop(id(shard), None)
+            for key, values in shard.items():
+                total = self._retired.get(key)
+                if total is None:
+                    self._retired[key] = list(values)
+                else:
+                    for index, value in enumerate(values):
+                        total[index] += value
+
+    def render(self, samples: Samples) -> str:
+        lines: List[str] = []
+        for name, metric in sorted(self.metrics.items()):
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for labels, values in sorted(samples.get(name, {}).items()):
+                lines.extend(metric.exposition(labels, values))
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric: Any) -> Any:
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric '{metric.name}' is already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+
+class _ShardOwner:
+    """Lives in a recording thread's locals; its finalizer retires the thread's shard."""
+
+
+class Metric:
+    kind = ""
+
+    def __init__(
+        self, registry: MetricsRegistry, name: str, documentation: str, labelnames: Labels
+    ) -> None:
+        self._registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+
+    def exposition(self, labels: Labels, values: List[float]) -> List[str]:
+        raise NotImplementedError
+
+    def _labels(self, labels: Labels, *extra: Tuple[str, str]) -> str:
+        pairs = [*zip(self.labelnames, labels), *extra]
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        shard = self._registry.shard()
+        values = shard.get((self.name, labels))
+        if values is None:
+            values = shard[(self.name, labels)] = [0.0]
+        values[0] += amount
+
+    def exposition(self, labels: Labels, values: List[float]) -> List[str]:
+        return [f"{self.name}{self._labels(labels)} {_number(values[0])}"]
+
+
+class Histogram(Metric):
+    """Bucket counts, then the ``+Inf`` count, then the sum, per label values.
+
+    Observations of a histogram with a ``stage`` also count towards that stage of the
+    current request's ``Server-Timing``.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        name: str,
+        documentation: str,
+        labelnames: Labels,
+        buckets: Tuple[float, ...],
+        stage: Optional[str] = None,
+    ) -> None:
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = buckets
+        self.stage = stage
+
+    def observe(self, seconds: float, *labels: str) -> None:
+        shard = self._registry.shard()
+        values = shard.get((self.name, labels))
+        if values is None:
+            values = shard[(self.name, labels)] = [0.0] * (len(self.buckets) + 2)
+        values[bisect_left(self.buckets, seconds)] += 1
+        values[-1] += seconds
+        if self.stage is not None:
+            record_stage(self.stage, seconds)
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def exposition(self, labels: Labels, values: List[float]) -> List[str]:
+        lines = []
+        cumulative = 0.0
+        bounds = [*(_number(bound) for bound in self.buckets), "+Inf"]
+        for bound, count in zip(bounds, values[:-1]):
+            cumulative += count
+            bucket = self._labels(labels, ("le", bound))
+            lines.append(f"{self.name}_bucket{bucket} {_number(cumulative)}")
+        lines.append(f"{self.name}_sum{self._labels(labels)} {_number(values[-1])}")
+        lines.append(f"{self.name}_count{self._labels(labels)} {_number(cumulative)}")
+        return lines
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "sentinel_http_request_duration_seconds",
+    "Request latency by route template, method and status; _count is the request rate.",
+    ("method", "route", "status"),
+)
+OPA_SECONDS = REGISTRY.histogram(
+    "sentinel_opa_request_duration_seconds",
+    "Latency of PolicyClient.evaluate calls to OPA.",
+    ("outcome",),
+    stage="opa",
+)
+DB_QUERY_SECONDS = REGISTRY.histogram(
+    "sentinel_db_query_duration_seconds",
+    "Database statement latency by engine and statement type.",
+    ("engine", "operation"),
+    stage="db",
+)
+SIGN_SECONDS = REGISTRY.histogram(
+    "sentinel_provenance_sign_duration_seconds",
+    "Latency of ProvenanceSigner.sign_action, storage writes included.",
+    stage="sign",
+)
+STORAGE_SECONDS = REGISTRY.histogram(
+    "sentinel_provenance_storage_duration_seconds",
+    "Latency of manifest storage backend I/O by operation.",
+    ("operation",),
+    stage="storage",
+)
+POLICY_DECISIONS = REGISTRY.counter(
+    "sentinel_policy_decisions_total",
+    "Policy decisions by tenant, outcome and deny reason.",
+    ("tenant", "decision", "reason"),
+)
+
+
+class MetricsMiddleware:
+    """Times every HTTP request into ``HTTP_REQUEST_SECONDS`` by route template."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = [500]
+
+        async def send_with_status(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_REQUEST_SECONDS.observe(
+                elapsed, scope["method"], route_template(scope), str(status[0])
+            )
+
+
+def route_template(scope: Scope) -> str:
+    """The matched route's path template, or ``unmatched`` (never the raw path)."""
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    # FastAPI versions that keep included routers nested match routes relative to the
+    # include prefix; older ones copy routes into the app with the full path.
+    included = scope.get("fastapi", {}).get("included_router")
+    prefix = getattr(getattr(included, "include_context", None), "prefix", "")
+    return prefix + getattr(route, "path", "")
+
+
+def time_queries(engine: Engine, name: str) -> None:
+    """Record every statement ``engine`` runs into ``DB_QUERY_SECONDS``."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _started(connection: Any, *_args: Any) -> None:
+        connection.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _finished(connection: Any, _cursor: Any, statement: str, *_args: Any) -> None:
+        started = connection.info["query_started"].pop()
+        DB_QUERY_SECONDS.observe(time.perf_counter() - started, name, _operation(statement))
+
+    @event.listens_for(engine, "handle_error")
+    def _failed(context: Any) -> None:
+        pending = context.connection.info.get("query_started") if context.connection else None
+        if pending:
+            started = pending.pop()
+            DB_QUERY_SECONDS.observe(
+                time.perf_counter() - started, name, _operation(context.statement or "")
+            )
+
+
+class TimedStorageBackend:
+    """A provenance ``StorageBackend`` that times its I/O into ``STORAGE_SECONDS``."""
+
+    def __init__(self, backend: Any) -> None:
+        self._backend = backend
+
+    def put(self, key: str, data: bytes) -> str:
+        with STORAGE_SECONDS.time("put"):
+            return self._backend.put(key, data)
+
+    def put_many(self, items: Sequence[Tuple[str, bytes]]) -> List[str]:
+        with STORAGE_SECONDS.time("put"):
+            return self._backend.put_many(items)
+
+    def put_file(self, key: str, source: Path) -> str:
+        with STORAGE_SECONDS.time("put"):
+            return self._backend.put_file(key, source)
+
+    def get(self, key: str) -> bytes:
+        with STORAGE_SECONDS.time("get"):
+            return self._backend.get(key)
+
+    def get_range(self, key: str, offset: int, length: int) -> bytes:
+        with STORAGE_SECONDS.time("get"):
+            return self._backend.get_range(key, offset, length)
+
+    def delete(self, key: str) -> None:
+        with STORAGE_SECONDS.time("delete"):
+            self._backend.delete(key)
+
+    def list_keys(self, prefix: str = "") -> Iterator[str]:
+        return self._backend.list_keys(prefix)
+
+    def __getattr__(self, name: str) -> Any:  # close() and backend-specific extras
+        return getattr(self._backend, name)
+
+
+class MetricsFlusher:
+    """Shares this worker's totals with the other workers through ``directory``.
+
+    Each worker process writes its snapshot to its own file every ``flush_seconds`` (and
+    when it stops); a scrape on any worker sums its live totals with every other worker's
+    file. A worker whose process has exited and whose file has not been rewritten for
+    three flush intervals is absorbed by the next live worker to flush: it claims the
+    file with an atomic rename, adds the totals to its own and deletes the file, so
+    totals never go backwards and the directory does not grow with worker turnover. The
+    directory must only be shared by processes on one host (pids are checked locally).
+    """
+
+    def __init__(
+        self, registry: MetricsRegistry, directory: Path, flush_seconds: float = 5.0
+    ) -> None:
+        self._registry = registry
+        self._directory = directory
+        self._flush_seconds = flush_seconds
+        self._pid: Optional[int] = None
+        self._path = directory
+        self._absorbed: Samples = {}  # totals taken over from exited workers
+        self._claimed: Set[Path] = set()  # their files, until this worker's file has them
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def path(self) -> Path:
+        if self._pid != os.getpid():  # a forked worker must not share its parent's file
+            self._pid = os.getpid()
+            self._path = self._worker_file()
+            self._absorbed, self._claimed = {}, set()
+        return self._path
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="metrics-flush", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def flush(self) -> None:
+        self._claim_exited_workers()
+        with self._lock:
+            claimed = list(self._claimed)
+        samples = self._totals()
+        encoded = {
+            name: [[*labels, values] for labels, values in rows.items()]
+            for name, rows in samples.items()
+        }
+        partial = self.path.with_suffix(".tmp")
+        partial.write_text(json.dumps(encoded))
+        os.replace(partial, self.path)
+        for path in claimed:  # now counted in this worker's file
+            path.unlink(missing_ok=True)
+            with self._lock:
+                self._claimed.discard(path)
+
+    def collect(self) -> Samples:
+        """Live totals of this worker plus the last flushed totals of every other one."""
+        samples = self._totals()
+        own = self.path
+        for path in self._directory.glob("*.json"):
+            if path == own or path in self._claimed:
+                continue
+            encoded = _read_samples(path)
+            if encoded is not None:
+                _merge(samples, encoded)
+        return samples
+
+    def _totals(self) -> Samples:
+        samples = self._registry.snapshot()
+        with self._lock:
+            _merge(samples, self._absorbed)
+        return samples
+
+    def _claim_exited_workers(self) -> None:
+        """Take over the files of exited workers; ``flush`` deletes them once written."""
+        own = self.path
+        stale_before = time.time() - 3 * self._flush_seconds
+        for path in self._directory.glob("*.json"):
+            if path == own or path in self._claimed or not _exited(path, stale_before):
+                continue
+            claim = self._worker_file()
+            try:
+                os.rename(path, claim)  # only one worker wins the rename
+            except OSError:
+                continue
+            encoded = _read_samples(claim)
+            if encoded is None:
+                continue  # left in place under this worker's pid, claimed again later
+            with self._lock:
+                _merge(self._absorbed, encoded)
+                self._claimed.add(claim)
+
+    def _worker_file(self) -> Path:
+        return self._directory / f"{os.getpid()}-{uuid.uuid4().hex[:8]}.json"
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self._flush_seconds):
+            try:
+                self.flush()
+            except OSError:
+                logger.exception("metrics.flush_failed", directory=str(self._directory))
+
+
+def _read_samples(path: Path) -> Optional[Samples]:
+    try:
+        encoded = json.loads(path.read_text())
+    except (OSError, ValueError):  # a worker replacing its file mid-read
+        return None
+    return {
+        name: {tuple(labels): values for *labels, values in rows}
+        for name, rows in encoded.items()
+    }
+
+
+def _merge(samples: Samples, other: Samples) -> None:
+    for name, rows in other.items():
+        merged = samples.setdefault(name, {})
+        for labels, values in rows.items():
+            _accumulate(merged, labels, values)
+
+
+def _exited(path: Path, stale_before: float) -> bool:
+    """Whether ``path`` belongs to a worker process that no longer runs."""
+    try:
+        pid = int(path.name.split("-", 1)[0])
+        if path.stat().st_mtime >= stale_before:
+            return False
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except (OSError, ValueError):  # vanished, not ours to signal, or not a worker file
+        return False
+    return pid == os.getpid()  # left by an earlier process with this pid, or a failed claim
+
+
+def _accumulate(rows: Dict[Labels, List[float]], labels: Labels, values: Iterable[float]) -> None:
+    values = list(values)
+    total = rows.get(labels)
+    if total is None:
+        rows[labels] = values
+    else:
+        for index, value in enumerate(values):
+            total[index] += value
+
+
+def _copy(shard: Shard) -> Shard:
+    return {key: list(values) for key, values in shard.items()}
+
+
+def _operation(statement: str) -> str:
+    words = statement.lstrip()[:8].split(None, 1)
+    keyword = words[0].upper() if words else ""
+    return keyword if keyword in QUERY_OPERATIONS else "OTHER"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
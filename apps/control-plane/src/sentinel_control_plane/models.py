@@ -5,9 +5,20 @@ from __future__ import annotations
 import uuid as uuid_pkg
 from datetime import datetime
 
-from typing import Any, Dict
-
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, String, Text
+from typing import Any, Dict, Optional
+
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+)
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
@@ -25,12 +36,25 @@ class Tenant(Base):
     slug: Mapped[str] = mapped_column(String(64), unique=True, nullable=False, index=True)
     display_name: Mapped[str] = mapped_column(String(128), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, index=True)
 
     tools: Mapped[list["Tool"]] = relationship("Tool", back_populates="tenant")
 
 
 class Tool(Base):
     __tablename__ = "tools"
+    __table_args__ = (
+        Index("ix_tools_name_tenant", "tenant_id", "name", unique=True),
+        Index("ix_tools_version", "version"),
+        Index("ix_tools_owner", "owner"),
+        Index(
+            "ix_tools_scopes_gin",
+            "scopes",
+            postgresql_using="gin",
+            postgresql_ops={"scopes": "jsonb_path_ops"},
+        ),
+        Index("ix_tools_metadata_gin", "metadata_json", postgresql_using="gin"),
+    )
 
     id: Mapped[uuid_pkg.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid_pkg.uuid4
@@ -43,15 +67,55 @@ class Tool(Base):
     owner: Mapped[str] = mapped_column(String(64), nullable=False)
     scopes: Mapped[list[str]] = mapped_column(JSONB, default=list)
     extra_metadata: Mapped[Dict[str, Any]] = mapped_column("metadata_json", JSONB, default=dict)
+    healthcheck: Mapped[Optional[Dict[str, Any]]] = mapped_column(
+        JSONB(none_as_null=True), nullable=True
+    )
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
 
     tenant: Mapped[Tenant] = relationship("Tenant", back_populates="tools")
 
 
+class ToolHealth(Base):
+    """Latest health-probe result per tool, flushed in batches by the scheduler."""
+
+    __tablename__ = "tool_health"
+
+    tool_id: Mapped[uuid_pkg.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    healthy: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    status_code: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    latency_ms: Mapped[float] = mapped_column(Float, nullable=False)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    consecutive_failures: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    checked_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+
+class KillExpiration(Base):
+    """Pending automatic restore of a time-boxed kill (one per tool)."""
+
+    __tablename__ = "kill_expirations"
+
+    tool_id: Mapped[uuid_pkg.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("tools.id"), primary_key=True
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+    reason: Mapped[str] = mapped_column(Text, nullable=False, default="")
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class RegistryState(Base):
+    """Single-row counter bumped by every registry write (see ``registry_version``)."""
+
+    __tablename__ = "registry_state"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
 class PolicyLog(Base):
     __tablename__ = "policy_logs"
 
@@ -66,3 +130,23 @@ class PolicyLog(Base):
     reason: Mapped[str] = mapped_column(Text, nullable=True)
     event_metadata: Mapped[dict] = mapped_column(JSONB, default=dict)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class ProvenanceManifest(Base):
+    """Metadata index for manifests held in provenance storage."""
+
+    __tablename__ = "provenance_manifests"
+    __table_args__ = (
+        Index("ix_provenance_manifests_tenant_ts", "tenant_slug", "timestamp", "id"),
+        Index("ix_provenance_manifests_tool_ts", "tenant_slug", "tool_name", "timestamp", "id"),
+        Index("ix_provenance_manifests_ts", "timestamp", "id"),
+    )
+
+    id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    tenant_slug: Mapped[str] = mapped_column(String(64), nullable=False)
+    tool_name: Mapped[str] = mapped_column(String(128), nullable=False)
+    action: Mapped[str] = mapped_column(String(128), nullable=False)
+    timestamp: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    storage_location: Mapped[str] = mapped_column(Text, nullable=False)
+    size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,83 @@
+"""Monotonic registry version used for conditional GETs and delta sync."""
+
+from __future__ import annotations
+
+from contextvars import ContextVar
+from typing import List, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .models import RegistryState
+
+REGISTRY_STATE_ID = 1
+REGISTRY_VERSION_HEADER = "X-Registry-Version"
+
+# Versions bumped while serving the current request. A list rather than an int because
+# sync handlers run in a copy of the request's context: appends show through, sets would not.
+_written_versions: ContextVar[Optional[List[int]]] = ContextVar(
+    "sentinel_written_versions", default=None
+)
+
+
+def bump_registry_version(session: Session) -> int:
+    """Increment the registry version inside the caller's transaction and return it.
+
+    The counter row stays locked until the transaction ends, so registry writes commit in
+    version order and a reader that has seen version ``v`` has seen every change up to it.
+    """
+    version = session.execute(
+        update(RegistryState)
+        .where(RegistryState.id == REGISTRY_STATE_ID)
+        .values(version=RegistryState.version + 1)
+        .returning(RegistryState.version)
+    ).scalar_one_or_none()
+    if version is None:  # the migration seeds the row; this covers fresh test schemas
+        session.add(RegistryState(id=REGISTRY_STATE_ID, version=1))
+        session.flush()
+        version = 1
+    written = _written_versions.get()
+    if written is not None:
+        written.append(int(version))
+    return int(version)
+
+
+def current_registry_version(session: Session) -> int:
+    version: Optional[int] = session.execute(
+        select(RegistryState.version).where(RegistryState.id == REGISTRY_STATE_ID)
+    ).scalar_one_or_none()
+    return int(version or 0)
+
+
+def registry_etag(version: int) -> str:
+    return f'"registry-{version}"'
+
+
+class RegistryVersionMiddleware:
+    """Adds ``X-Registry-Version`` to successful responses of requests that wrote the registry.
+
+    Clients send it back as ``X-Min-Registry-Version`` to read their own writes when reads
+    may be served by a replica.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        written: List[int] = []
+        token = _written_versions.set(written)
+
+        async def send_with_version(message: Message) -> None:
+            if message["type"] == "http.response.start" and written and message["status"] < 400:
+                header = (REGISTRY_VERSION_HEADER.lower().encode(), str(max(written)).encode())
+                message["headers"] = [*message.get("headers", []), header]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_version)
+        finally:
+            _written_versions.reset(token)
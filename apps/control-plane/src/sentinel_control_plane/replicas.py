@@ -0,0 +1,182 @@
+"""Read-replica routing for read-only control-plane work."""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import structlog
+from sqlalchemy import Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session, sessionmaker
+
+from .manifest_index import SessionFactory
+from .registry_version import current_registry_version
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass
+class Replica:
+    name: str
+    engine: Engine
+    sessions: sessionmaker[Session] = field(init=False)
+    healthy: bool = False
+    version: int = -1
+    lag_seconds: float = 0.0
+    error: Optional[str] = None
+    reads: int = 0
+
+    def __post_init__(self) -> None:
+        self.sessions = sessionmaker(bind=self.engine, autoflush=False, expire_on_commit=False)
+
+
+class ReplicaRouter:
+    """Sends read-only sessions to healthy replicas round-robin.
+
+    Lag is measured in registry versions, which works on any database: every
+    ``check_seconds`` the router reads the version on the primary and on each replica, and
+    a replica's lag is how long ago the primary first showed a version the replica has not
+    reached yet (so it is accurate to within one check interval). Replicas that fail a
+    check or lag by more than ``max_lag_seconds`` are ejected until a later check passes;
+    one that fails to connect when a request picks it is ejected on the spot and the
+    request falls back to the primary.
+
+    A caller that needs its own writes (read-your-writes) passes the registry version it
+    wrote as ``min_version``; only replicas known to have reached it are eligible, and
+    otherwise the read goes to the primary.
+    """
+
+    def __init__(
+        self,
+        primary: SessionFactory,
+        replicas: Sequence[Tuple[str, Engine]],
+        *,
+        max_lag_seconds: float = 5.0,
+        check_seconds: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._primary = primary
+        self.replicas = [Replica(name, engine) for name, engine in replicas]
+        self._max_lag_seconds = max_lag_seconds
+        self._check_seconds = check_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._turn = itertools.count()
+        self._primary_versions: Deque[Tuple[float, int]] = deque(maxlen=4096)
+        self.primary_reads = 0
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self.check()  # no replica serves reads before its first successful check
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="replica-checks", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        for replica in self.replicas:
+            replica.engine.dispose()
+
+    @contextmanager
+    def session(self, primary: Session, min_version: Optional[int] = None) -> Iterator[Session]:
+        """A replica session for read-only work, or ``primary`` when no replica qualifies."""
+        replica = self.pick(min_version)
+        if replica is not None:
+            session = replica.sessions()
+            try:
+                session.connection()  # fail over before the caller has read anything
+            except DBAPIError as exc:
+                session.close()
+                self.eject(replica, str(exc.orig))
+            else:
+                try:
+                    yield session
+                finally:
+                    session.close()
+                return
+        with self._lock:
+            self.primary_reads += 1
+        yield primary
+
+    def pick(self, min_version: Optional[int] = None) -> Optional[Replica]:
+        with self._lock:
+            eligible = [
+                replica
+                for replica in self.replicas
+                if replica.healthy and (min_version is None or replica.version >= min_version)
+            ]
+            if not eligible:
+                return None
+            replica = eligible[next(self._turn) % len(eligible)]
+            replica.reads += 1
+            return replica
+
+    def eject(self, replica: Replica, reason: str) -> None:
+        with self._lock:
+            was_healthy, replica.healthy, replica.error = replica.healthy, False, reason
+        if was_healthy:
+            logger.warning("database.replica_ejected", replica=replica.name, reason=reason)
+
+    def check(self) -> None:
+        """Refresh every replica's version, lag and health."""
+        with self._primary() as session:
+            primary_version = current_registry_version(session)
+        now = self._clock()
+        if not self._primary_versions or self._primary_versions[-1][1] < primary_version:
+            self._primary_versions.append((now, primary_version))
+        for replica in self.replicas:
+            try:
+                with replica.sessions() as session:
+                    version = current_registry_version(session)
+            except DBAPIError as exc:
+                self.eject(replica, str(exc.orig))
+                continue
+            lag = self._lag(version, now)
+            with self._lock:
+                replica.version, replica.lag_seconds = version, lag
+            if lag > self._max_lag_seconds:
+                self.eject(replica, f"lagging {lag:.1f}s behind the primary")
+                continue
+            with self._lock:
+                admitted, replica.healthy, replica.error = not replica.healthy, True, None
+            if admitted:
+                logger.info("database.replica_admitted", replica=replica.name, version=version)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                {
+                    "name": replica.name,
+                    "healthy": replica.healthy,
+                    "version": replica.version,
+                    "lag_seconds": round(replica.lag_seconds, 3),
+                    "reads": replica.reads,
+                    "error": replica.error,
+                }
+                for replica in self.replicas
+            ]
+
+    def _lag(self, version: int, now: float) -> float:
+        for seen_at, primary_version in self._primary_versions:
+            if primary_version > version:
+                return now - seen_at
+        return 0.0
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self._check_seconds):
+            try:
+                self.check()
+            except Exception:  # the primary itself is unreachable; keep the last verdicts
+                logger.exception("database.replica_check_failed")
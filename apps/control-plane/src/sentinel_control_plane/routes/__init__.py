@@ -1,15 +1,42 @@
 """Route registration helpers."""
 
 from fastapi import APIRouter
+from fastapi.routing import APIRoute
 
+from .kill_switch import async_router as kill_async_router
 from .kill_switch import router as kill_router
 from .policy import router as policy_router
 from .provenance import router as provenance_router
+from .registry import async_router as registry_async_router
 from .registry import router as registry_router
 
 
-def include_routes(api: APIRouter) -> None:
-    api.include_router(registry_router, prefix="/register", tags=["registry"])
+def include_routes(api: APIRouter, *, database_async: bool = False) -> None:
+    """Mount every router; ``database_async`` swaps in the async-session handlers."""
+    if database_async:
+        registry = _prefer(registry_async_router, registry_router)
+        kill = _prefer(kill_async_router, kill_router)
+    else:
+        registry, kill = registry_router, kill_router
+    api.include_router(registry, prefix="/register", tags=["registry"])
     api.include_router(policy_router, prefix="/policy", tags=["policy"])
-    api.include_router(kill_router, prefix="/kill", tags=["kill-switch"])
+    api.include_router(kill, prefix="/kill", tags=["kill-switch"])
     api.include_router(provenance_router, prefix="/provenance", tags=["provenance"])
+
+
+def _prefer(preferred: APIRouter, fallback: APIRouter) -> APIRouter:
+    """``fallback``'s routes in order, each replaced by ``preferred``'s route for the same
+    path and methods when there is one."""
+    replacements = {
+        _route_key(route): route for route in preferred.routes if isinstance(route, APIRoute)
+    }
+    merged = APIRouter()
+    merged.routes.extend(
+        replacements.get(_route_key(route), route) if isinstance(route, APIRoute) else route
+        for route in fallback.routes
+    )
+    return merged
+
+
+def _route_key(route: APIRoute) -> tuple[str, frozenset[str]]:
+    return route.path, frozenset(route.methods or ())
@@ -2,20 +2,47 @@
 
 from __future__ import annotations
 
-from typing import List
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Sequence, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select, update
+from sqlalchemy import ColumnElement, Select, Update, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 import structlog
 from opentelemetry import trace
 
-from ..dependencies import db_session
+from ..dependencies import (
+    async_db_session,
+    db_session,
+    invalidation_bus,
+    kill_expiry_scheduler,
+    session_factory,
+)
+from ..invalidation import InvalidationBus
+from ..kill_expiry import KillExpiryScheduler, cancel_expirations, set_expirations
+from ..lookups import find_tool_ids, require_tenant_id
+from ..manifest_index import SessionFactory
 from ..models import Tenant, Tool
-from ..schemas import KillSwitchRequest, KillSwitchResponse, KillSwitchRestoreRequest
+from ..registry_version import bump_registry_version
+from ..schemas import (
+    KillSwitchBulkRequest,
+    KillSwitchBulkResponse,
+    KillSwitchBulkTool,
+    KillSwitchRequest,
+    KillSwitchResponse,
+    KillSwitchRestoreRequest,
+    KillSwitchSelector,
+)
+from ..server_timing import TimedRoute
+from ..tool_filters import has_scopes
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
+async_router = APIRouter(route_class=TimedRoute)
+TENANT_BATCH_SIZE = 500
 logger = structlog.get_logger(__name__)
 tracer = trace.get_tracer(__name__)
 
@@ -24,84 +51,116 @@ tracer = trace.get_tracer(__name__)
 def trigger_kill_switch(
     payload: KillSwitchRequest,
     session: Session = Depends(db_session),
+    bus: InvalidationBus | None = Depends(invalidation_bus),
+    expiry: KillExpiryScheduler | None = Depends(kill_expiry_scheduler),
+) -> KillSwitchResponse:
+    return _disable(session, payload, bus, expiry)
+
+
+@async_router.post("", response_model=KillSwitchResponse)
+async def trigger_kill_switch_async(
+    payload: KillSwitchRequest,
+    session: AsyncSession = Depends(async_db_session),
+    bus: InvalidationBus | None = Depends(invalidation_bus),
+    expiry: KillExpiryScheduler | None = Depends(kill_expiry_scheduler),
+) -> KillSwitchResponse:
+    return await session.run_sync(_disable, payload, bus, expiry)
+
+
+@router.post("/restore", response_model=KillSwitchResponse)
+def restore_tools(
+    payload: KillSwitchRestoreRequest,
+    session: Session = Depends(db_session),
+    bus: InvalidationBus | None = Depends(invalidation_bus),
+) -> KillSwitchResponse:
+    return _restore(session, payload, bus)
+
+
+@async_router.post("/restore", response_model=KillSwitchResponse)
+async def restore_tools_async(
+    payload: KillSwitchRestoreRequest,
+    session: AsyncSession = Depends(async_db_session),
+    bus: InvalidationBus | None = Depends(invalidation_bus),
+) -> KillSwitchResponse:
+    return await session.run_sync(_restore, payload, bus)
+
+
+def _disable(
+    session: Session,
+    payload: KillSwitchRequest,
+    bus: InvalidationBus | None,
+    expiry: KillExpiryScheduler | None,
 ) -> KillSwitchResponse:
     with tracer.start_as_current_span("kill_switch.disable") as span:
         span.set_attribute("sentinel.tenant", payload.tenant_slug)
         span.set_attribute("sentinel.tool", payload.tool_name or "*")
         span.set_attribute("sentinel.reason", payload.reason)
 
-        tenant = session.execute(select(Tenant).where(Tenant.slug == payload.tenant_slug)).scalar_one_or_none()
-        if not tenant:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Tenant '{payload.tenant_slug}' not found",
-            )
-
-        query = select(Tool).where(Tool.tenant_id == tenant.id)
-        if payload.tool_name:
-            query = query.where(Tool.name == payload.tool_name)
-        tools = session.execute(query).scalars().all()
-
-        if not tools:
+        tenant_id = require_tenant_id(session, payload.tenant_slug)
+        ids = find_tool_ids(session, tenant_id, payload.tool_name or None)
+        if not ids:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="No matching tools found to disable",
             )
 
-        tool_ids: List[str] = [str(tool.id) for tool in tools]
-        session.execute(
+        tool_ids: List[str] = [str(tool_id) for tool_id in ids]
+        version = bump_registry_version(session)
+        disabled = session.execute(
             update(Tool)
-            .where(Tool.id.in_([tool.id for tool in tools]))
-            .values(is_active=False)
-        )
+            .where(Tool.id.in_(ids), Tool.is_active.is_(True))
+            .values(is_active=False, version=version)
+            .returning(Tool.id)
+            .execution_options(synchronize_session=False)
+        ).scalars().all()
+        expires_at = _apply_expiry(session, disabled, ids, payload)
         session.flush()
+        if bus is not None:  # no tool name: the whole tenant changed
+            names = (payload.tool_name,) if payload.tool_name else ()
+            bus.publish(session, "kill", version, payload.tenant_slug, names)
         logger.info(
             "kill_switch.disabled",
             tenant=payload.tenant_slug,
             tool=payload.tool_name,
             affected_tools=tool_ids,
             reason=payload.reason,
+            expires_at=expires_at.isoformat() if expires_at else None,
         )
 
         span.set_attribute("sentinel.affected_count", len(tool_ids))
 
-    return KillSwitchResponse(status="disabled", affected_tools=tool_ids)
+    if expires_at and expiry is not None:
+        expiry.schedule(expires_at)
+    return KillSwitchResponse(status="disabled", affected_tools=tool_ids, expires_at=expires_at)
 
 
-@router.post("/restore", response_model=KillSwitchResponse)
-def restore_tools(
-    payload: KillSwitchRestoreRequest,
-    session: Session = Depends(db_session),
+def _restore(
+    session: Session, payload: KillSwitchRestoreRequest, bus: InvalidationBus | None
 ) -> KillSwitchResponse:
     with tracer.start_as_current_span("kill_switch.restore") as span:
         span.set_attribute("sentinel.tenant", payload.tenant_slug)
         span.set_attribute("sentinel.tool", payload.tool_name or "*")
 
-        tenant = session.execute(select(Tenant).where(Tenant.slug == payload.tenant_slug)).scalar_one_or_none()
-        if not tenant:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Tenant '{payload.tenant_slug}' not found",
-            )
-
-        query = select(Tool).where(Tool.tenant_id == tenant.id)
-        if payload.tool_name:
-            query = query.where(Tool.name == payload.tool_name)
-        tools = session.execute(query).scalars().all()
-
-        if not tools:
+        tenant_id = require_tenant_id(session, payload.tenant_slug)
+        ids = find_tool_ids(session, tenant_id, payload.tool_name or None)
+        if not ids:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="No matching tools found to restore",
             )
 
-        tool_ids: List[str] = [str(tool.id) for tool in tools]
+        tool_ids: List[str] = [str(tool_id) for tool_id in ids]
+        version = bump_registry_version(session)
         session.execute(
             update(Tool)
-            .where(Tool.id.in_([tool.id for tool in tools]))
-            .values(is_active=True)
+            .where(Tool.id.in_(ids))
+            .values(is_active=True, version=version)
         )
+        cancel_expirations(session, ids)
         session.flush()
+        if bus is not None:  # no tool name: the whole tenant changed
+            names = (payload.tool_name,) if payload.tool_name else ()
+            bus.publish(session, "kill", version, payload.tenant_slug, names)
         logger.info(
             "kill_switch.restored",
             tenant=payload.tenant_slug,
@@ -112,3 +171,165 @@ def restore_tools(
         span.set_attribute("sentinel.affected_count", len(tool_ids))
 
     return KillSwitchResponse(status="enabled", affected_tools=tool_ids)
+
+
+@router.post("/bulk", response_model=KillSwitchBulkResponse)
+def bulk_kill_switch(
+    payload: KillSwitchBulkRequest,
+    sessions: SessionFactory = Depends(session_factory),
+    bus: InvalidationBus | None = Depends(invalidation_bus),
+    expiry: KillExpiryScheduler | None = Depends(kill_expiry_scheduler),
+) -> KillSwitchBulkResponse:
+    """Disable or restore every tool matching a selector, across tenants.
+
+    Each batch of up to ``TENANT_BATCH_SIZE`` named tenants is one ``UPDATE tools ... FROM
+    tenants ... RETURNING`` (a selector without tenants is a single ``UPDATE``), so no tool
+    rows are loaded before they are changed. Only tools whose state actually flips are
+    updated and reported; matching tools already in the requested state are counted in
+    ``unchanged_count``, and a selector that matches no tool at all is a 404. All batches
+    share one transaction and one registry version, which is only bumped (and invalidations
+    only published) once a batch has a tool to flip; ``committed_ms`` is measured once the
+    transaction has committed.
+
+    A timed disable (``duration_seconds``) schedules the restore of the tools it flipped
+    only, so it never shortens or adds a deadline to a kill that was already in place; an
+    indefinite disable or a restore cancels the pending restores of every matching tool.
+    """
+    started = time.perf_counter()
+    selector = payload.selector
+    if not (selector.tenant_slugs or selector.tool_names or selector.owners or selector.scopes):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The selector must name at least one tenant, tool, owner or scope",
+        )
+    if payload.duration_seconds and payload.action == "restore":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="duration_seconds only applies to disable",
+        )
+    disable = payload.action == "disable"
+    expires_at = None
+    with tracer.start_as_current_span("kill_switch.bulk") as span:
+        span.set_attribute("sentinel.action", payload.action)
+        span.set_attribute("sentinel.reason", payload.reason)
+        with sessions() as session:
+            tenant_batches = [
+                selector.tenant_slugs[start : start + TENANT_BATCH_SIZE]
+                for start in range(0, len(selector.tenant_slugs), TENANT_BATCH_SIZE)
+            ] or [[]]
+            version: int | None = None  # bumped by the first batch with a tool to flip
+            changed: List[Tuple[uuid.UUID, uuid.UUID, str]] = []
+            matched = 0
+            for tenant_slugs in tenant_batches:
+                clauses = _selector_clauses(session, selector, tenant_slugs)
+                batch_matched, pending = session.execute(
+                    select(
+                        func.count(Tool.id), func.count(Tool.id).filter(Tool.is_active.is_(disable))
+                    ).where(*clauses)
+                ).one()
+                matched += batch_matched
+                flipped: List[uuid.UUID] = []
+                if pending:
+                    if version is None:
+                        version = bump_registry_version(session)
+                    for tool_id, tenant_id, name in session.execute(
+                        _bulk_update(clauses, disable, version)
+                    ):
+                        changed.append((tool_id, tenant_id, name))
+                        flipped.append(tool_id)
+                matching: Select[Any] = select(Tool.id).where(*clauses)
+                expires_at = _apply_expiry(session, flipped, matching, payload) or expires_at
+            if not matched:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"No matching tools found to {payload.action}",
+                )
+            # RETURNING carries tenant ids: SQLite cannot return columns of the FROM table
+            slugs = {
+                tenant_id: slug
+                for tenant_id, slug in session.execute(
+                    select(Tenant.id, Tenant.slug).where(
+                        Tenant.id.in_({tenant_id for _, tenant_id, _ in changed})
+                    )
+                )
+            }
+            affected = [(tool_id, slugs[tenant_id], name) for tool_id, tenant_id, name in changed]
+            if bus is not None and version is not None:
+                by_tenant: Dict[str, List[str]] = {}
+                for _, tenant_slug, name in affected:
+                    by_tenant.setdefault(tenant_slug, []).append(name)
+                for tenant_slug, names in sorted(by_tenant.items()):
+                    bus.publish(session, "kill", version, tenant_slug, tuple(sorted(names)))
+        committed_ms = round((time.perf_counter() - started) * 1000, 2)
+
+        logger.info(
+            "kill_switch.bulk",
+            action=payload.action,
+            reason=payload.reason,
+            affected_count=len(affected),
+            unchanged_count=matched - len(affected),
+            committed_ms=committed_ms,
+            expires_at=expires_at.isoformat() if expires_at else None,
+        )
+        span.set_attribute("sentinel.affected_count", len(affected))
+
+    if expires_at and expiry is not None:
+        expiry.schedule(expires_at)
+    return KillSwitchBulkResponse(
+        status="disabled" if disable else "enabled",
+        affected_count=len(affected),
+        unchanged_count=matched - len(affected),
+        affected_tools=[
+            KillSwitchBulkTool(id=tool_id, tenant_slug=tenant_slug, name=name)
+            for tool_id, tenant_slug, name in sorted(affected, key=lambda row: (row[1], row[2]))
+        ],
+        committed_ms=committed_ms,
+        expires_at=expires_at,
+    )
+
+
+def _selector_clauses(
+    session: Session, selector: KillSwitchSelector, tenant_slugs: List[str]
+) -> List[ColumnElement[bool]]:
+    clauses: List[ColumnElement[bool]] = []
+    if tenant_slugs:  # UPDATE tools ... FROM tenants
+        clauses += [Tool.tenant_id == Tenant.id, Tenant.slug.in_(tenant_slugs)]
+    if selector.tool_names:
+        clauses.append(Tool.name.in_(selector.tool_names))
+    if selector.owners:
+        clauses.append(Tool.owner.in_(selector.owners))
+    if selector.scopes:
+        dialect = session.get_bind().dialect.name
+        clauses.append(has_scopes(dialect, selector.scopes, match_all=False))
+    return clauses
+
+
+def _bulk_update(clauses: List[ColumnElement[bool]], disable: bool, version: int) -> Update:
+    return (
+        update(Tool)
+        .where(Tool.is_active.is_(disable), *clauses)
+        .values(is_active=not disable, version=version, updated_at=datetime.utcnow())
+        .returning(Tool.id, Tool.tenant_id, Tool.name)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _apply_expiry(
+    session: Session,
+    flipped: Sequence[uuid.UUID],
+    matching: Sequence[uuid.UUID] | Select[Any],
+    payload: KillSwitchRequest | KillSwitchBulkRequest,
+) -> datetime | None:
+    """Schedule the automatic restore of a timed disable; anything else cancels it.
+
+    Only ``flipped`` tools (disabled by this request) get a deadline: a tool that was
+    already disabled keeps the kill it had, indefinite or timed.
+    """
+    if payload.duration_seconds and getattr(payload, "action", "disable") == "disable":
+        if not flipped:
+            return None
+        expires_at = datetime.utcnow() + timedelta(seconds=payload.duration_seconds)
+        set_expirations(session, flipped, expires_at, payload.reason)
+        return expires_at
+    cancel_expirations(session, matching)
+    return None
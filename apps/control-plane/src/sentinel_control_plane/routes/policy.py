@@ -2,19 +2,26 @@
 
 from __future__ import annotations
 
+import time
+import uuid
+
 import structlog
 from opentelemetry import trace
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from sentinel_policy.client import PolicyClient, PolicyDecisionError
 
-from ..dependencies import db_session, policy_client
-from ..models import Tenant, Tool
+from ..config import Settings
+from ..dependencies import health_scheduler, policy_client, read_db_session, settings_provider
+from ..health import HealthScheduler
+from ..lookups import require_tool
+from ..metrics import OPA_SECONDS, POLICY_DECISIONS
+from ..models import ToolHealth
 from ..schemas import PolicyCheckRequest, PolicyDecision
+from ..server_timing import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 logger = structlog.get_logger(__name__)
 tracer = trace.get_tracer(__name__)
 
@@ -22,8 +29,10 @@ tracer = trace.get_tracer(__name__)
 @router.post("/check", response_model=PolicyDecision)
 def policy_check(
     payload: PolicyCheckRequest,
-    session: Session = Depends(db_session),
+    session: Session = Depends(read_db_session),
     opa: PolicyClient = Depends(policy_client),
+    settings: Settings = Depends(settings_provider),
+    scheduler: HealthScheduler | None = Depends(health_scheduler),
 ) -> PolicyDecision:
     with tracer.start_as_current_span("policy.check") as span:
         span.set_attribute("sentinel.tenant", payload.tenant_slug)
@@ -32,24 +41,23 @@ def policy_check(
         if payload.purpose:
             span.set_attribute("sentinel.purpose", payload.purpose)
 
-        tenant = session.execute(select(Tenant).where(Tenant.slug == payload.tenant_slug)).scalar_one_or_none()
-        if not tenant:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Tenant '{payload.tenant_slug}' not found",
-            )
-        tool = (
-            session.execute(
-                select(Tool).where(Tool.tenant_id == tenant.id, Tool.name == payload.tool_name)
-            )
-            .scalar_one_or_none()
-        )
-        if not tool:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Tool '{payload.tool_name}' not registered for tenant '{payload.tenant_slug}'",
+        tool = require_tool(session, payload.tenant_slug, payload.tool_name)
+        if settings.health_gate_policy and not _tool_healthy(session, scheduler, tool.tool_id):
+            logger.info(
+                "policy.decision",
+                tenant=payload.tenant_slug,
+                tool=payload.tool_name,
+                action=payload.action,
+                purpose=payload.purpose,
+                allow=False,
+                reason="tool_unhealthy",
             )
+            POLICY_DECISIONS.inc(payload.tenant_slug, "deny", "tool_unhealthy")
+            span.set_attribute("sentinel.policy.allow", False)
+            span.set_attribute("sentinel.policy.reason", "tool_unhealthy")
+            return PolicyDecision(allow=False, reason="tool_unhealthy")
 
+        started, outcome = time.perf_counter(), "error"
         try:
             decision = opa.evaluate(
                 "sentinel/policy",
@@ -62,11 +70,14 @@ def policy_check(
                     "context": payload.context,
                 },
             )
+            outcome = "ok"
         except PolicyDecisionError as exc:
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail=str(exc),
             ) from exc
+        finally:
+            OPA_SECONDS.observe(time.perf_counter() - started, outcome)
 
         allow = bool(decision.get("allow", False))
         reasons = decision.get("deny_reason")
@@ -87,6 +98,7 @@ def policy_check(
             reason=reason,
             quota_remaining=decision.get("quota_remaining"),
         )
+        POLICY_DECISIONS.inc(payload.tenant_slug, "allow" if allow else "deny", reason or "")
         span.set_attribute("sentinel.policy.allow", allow)
         if reason:
             span.set_attribute("sentinel.policy.reason", reason)
@@ -98,3 +110,12 @@ def policy_check(
             reason=reason,
             quota_remaining=decision.get("quota_remaining"),
         )
+
+
+def _tool_healthy(session: Session, scheduler: HealthScheduler | None, tool_id: uuid.UUID) -> bool:
+    """Latest probe verdict for the tool; tools without a probe result count as healthy."""
+    result = scheduler.result(tool_id) if scheduler is not None else None
+    if result is None:
+        stored = session.get(ToolHealth, tool_id)
+        return stored is None or stored.healthy
+    return result.healthy
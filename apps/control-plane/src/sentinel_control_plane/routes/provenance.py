@@ -2,24 +2,55 @@
 
 from __future__ import annotations
 
+import base64
+import binascii
+import hashlib
+import json
+import uuid
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, Optional
+
 import structlog
 from opentelemetry import trace
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select, tuple_
 from sqlalchemy.orm import Session
 
 from sentinel_provenance.signer import ProvenanceSigner
-from sentinel_provenance.verifier import ProvenanceVerifier
+from sentinel_provenance.storage import ManifestStorage
+from sentinel_provenance.verifier import ManifestSelector, ProvenanceVerifier, VerificationSummary
 
-from ..dependencies import db_session, provenance_signer, provenance_verifier
-from ..models import Tenant, Tool
+from ..config import Settings
+from ..dependencies import (
+    db_session,
+    get_manifest_cache,
+    provenance_signer,
+    provenance_storage,
+    provenance_verifier,
+    read_db_session,
+    session_factory,
+    settings_provider,
+)
+from ..lookups import require_tool
+from ..manifest_index import SessionFactory
+from ..metrics import SIGN_SECONDS
+from ..models import ProvenanceManifest
 from ..schemas import (
+    ProvenanceCacheStats,
+    ProvenanceChainReport,
+    ProvenanceManifestEntry,
+    ProvenanceManifestPage,
     ProvenanceResponse,
     ProvenanceSignRequest,
+    ProvenanceStreamResponse,
+    ProvenanceVerifyBatchRequest,
     ProvenanceVerifyResponse,
 )
+from ..server_timing import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 logger = structlog.get_logger(__name__)
 tracer = trace.get_tracer(__name__)
 
@@ -27,7 +58,7 @@ tracer = trace.get_tracer(__name__)
 @router.post("/sign", response_model=ProvenanceResponse, status_code=status.HTTP_201_CREATED)
 def sign_action(
     payload: ProvenanceSignRequest,
-    session: Session = Depends(db_session),
+    session: Session = Depends(read_db_session),
     signer: ProvenanceSigner = Depends(provenance_signer),
 ) -> ProvenanceResponse:
     with tracer.start_as_current_span("provenance.sign") as span:
@@ -36,14 +67,15 @@ def sign_action(
         span.set_attribute("sentinel.action", payload.action)
 
         _ensure_tool_exists(session, payload.tenant_slug, payload.tool_name)
-        manifest = signer.sign_action(
-            {
-                "tenant": payload.tenant_slug,
-                "tool": payload.tool_name,
-                "action": payload.action,
-                "payload": payload.payload,
-            }
-        )
+        with SIGN_SECONDS.time():
+            manifest = signer.sign_action(
+                {
+                    "tenant": payload.tenant_slug,
+                    "tool": payload.tool_name,
+                    "action": payload.action,
+                    "payload": payload.payload,
+                }
+            )
         manifest_id = manifest["signature"]
         logger.info(
             "provenance.signed",
@@ -60,6 +92,90 @@ def sign_action(
         )
 
 
+@router.post(
+    "/sign/stream", response_model=ProvenanceStreamResponse, status_code=status.HTTP_201_CREATED
+)
+async def sign_stream(
+    request: Request,
+    tenant_slug: str = Query(max_length=64),
+    tool_name: str = Query(max_length=128),
+    action: str = Query(max_length=128),
+    session: Session = Depends(read_db_session),
+    signer: ProvenanceSigner = Depends(provenance_signer),
+    storage: ManifestStorage = Depends(provenance_storage),
+    settings: Settings = Depends(settings_provider),
+) -> ProvenanceStreamResponse:
+    """Sign an action whose payload is the raw request body.
+
+    The envelope travels in the query string; the body is hashed and spooled to disk as it
+    arrives and stored as an attachment, so memory use does not grow with the payload. The
+    signed action carries the payload's digest, size and content type in place of the
+    payload itself.
+    """
+    with tracer.start_as_current_span("provenance.sign_stream") as span:
+        span.set_attribute("sentinel.tenant", tenant_slug)
+        span.set_attribute("sentinel.tool", tool_name)
+        span.set_attribute("sentinel.action", action)
+
+        max_bytes = settings.provenance_stream_max_bytes
+        declared = request.headers.get("content-length")
+        if declared is not None and declared.isdigit() and int(declared) > max_bytes:
+            raise _payload_too_large(max_bytes)
+        await run_in_threadpool(_ensure_tool_exists, session, tenant_slug, tool_name)
+
+        # File I/O and hashing run in the threadpool so a large upload never stalls the loop.
+        spool_path = Path(settings.provenance_spool_dir) / f"{uuid.uuid4().hex}.part"
+        spool = await run_in_threadpool(_open_spool, spool_path)
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            try:
+                async for chunk in request.stream():
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise _payload_too_large(max_bytes)
+                    await run_in_threadpool(_spool_chunk, spool, digest, chunk)
+            finally:
+                await run_in_threadpool(spool.close)
+            payload_sha256 = digest.hexdigest()
+            await run_in_threadpool(storage.add_attachment, payload_sha256, spool_path)
+        finally:
+            await run_in_threadpool(spool_path.unlink, True)
+
+        manifest = await run_in_threadpool(
+            _timed_sign,
+            signer,
+            {
+                "tenant": tenant_slug,
+                "tool": tool_name,
+                "action": action,
+                "payload": {
+                    "sha256": payload_sha256,
+                    "size": size,
+                    "content_type": request.headers.get("content-type"),
+                },
+            },
+            payload_sha256,
+        )
+        manifest_id = manifest["signature"]
+        logger.info(
+            "provenance.signed",
+            tenant=tenant_slug,
+            tool=tool_name,
+            action=action,
+            manifest_id=manifest_id,
+            payload_bytes=size,
+        )
+        span.set_attribute("sentinel.manifest_id", manifest_id)
+        return ProvenanceStreamResponse(
+            manifest_id=manifest_id,
+            signature=manifest_id,
+            timestamp=manifest["timestamp"],
+            payload_sha256=payload_sha256,
+            payload_bytes=size,
+        )
+
+
 @router.get("/verify/{manifest_id}", response_model=ProvenanceVerifyResponse)
 def verify_manifest(
     manifest_id: str,
@@ -81,21 +197,232 @@ def verify_manifest(
         )
 
 
-def _ensure_tool_exists(session: Session, tenant_slug: str, tool_name: str) -> None:
-    tenant = session.execute(select(Tenant).where(Tenant.slug == tenant_slug)).scalar_one_or_none()
-    if not tenant:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Tenant '{tenant_slug}' not found",
+@router.get("/cache/stats", response_model=ProvenanceCacheStats)
+def cache_stats() -> ProvenanceCacheStats:
+    """Hit rate and occupancy of the in-memory verification cache."""
+    cache = get_manifest_cache()
+    if cache is None:
+        return ProvenanceCacheStats(enabled=False)
+    return ProvenanceCacheStats(enabled=True, **cache.stats())
+
+
+@router.post("/verify-batch", response_class=StreamingResponse)
+def verify_batch(
+    payload: ProvenanceVerifyBatchRequest,
+    verifier: ProvenanceVerifier = Depends(provenance_verifier),
+    settings: Settings = Depends(settings_provider),
+    sessions: SessionFactory = Depends(session_factory),
+) -> StreamingResponse:
+    """Verify many manifests, streaming one NDJSON line per manifest and a final summary.
+
+    A tenant or time range is resolved to candidate ids through the manifest index when it
+    is enabled, so only matching manifests are read; manifests signed since the indexer's
+    last flush are not included. Without the index the whole store is scanned. Either way
+    the range is re-checked against each signed manifest.
+    """
+    selector = _batch_selector(payload.tenant_slug, payload.since, payload.until)
+    manifest_ids: Optional[Iterable[str]] = payload.manifest_ids or None
+    from_index = manifest_ids is None and selector is not None and settings.provenance_index_enabled
+    if from_index:
+        manifest_ids = _indexed_ids(sessions, payload.tenant_slug, payload.since, payload.until)
+    return StreamingResponse(
+        _stream_batch(verifier, manifest_ids, selector, payload.workers, skip_missing=from_index),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.get("/chains/{tenant_slug}/verify", response_model=ProvenanceChainReport)
+def verify_chain(
+    tenant_slug: str,
+    full: bool = False,
+    verifier: ProvenanceVerifier = Depends(provenance_verifier),
+) -> ProvenanceChainReport:
+    with tracer.start_as_current_span("provenance.verify_chain") as span:
+        span.set_attribute("sentinel.tenant", tenant_slug)
+        report = verifier.verify_chain(tenant_slug, full=full)
+        logger.info(
+            "provenance.chain_verified",
+            tenant=tenant_slug,
+            head_seq=report["head_seq"],
+            checked=report["checked"],
+            verified=report["verified"],
         )
-    tool = (
-        session.execute(
-            select(Tool).where(Tool.tenant_id == tenant.id, Tool.name == tool_name)
+        span.set_attribute("sentinel.verified", report["verified"])
+        return ProvenanceChainReport(**report)
+
+
+@router.get("/manifests", response_model=ProvenanceManifestPage)
+def list_manifests(
+    tenant_slug: Optional[str] = None,
+    tool_name: Optional[str] = None,
+    action: Optional[str] = None,
+    since: Optional[int] = Query(default=None, description="Inclusive lower bound (epoch ms)"),
+    until: Optional[int] = Query(default=None, description="Exclusive upper bound (epoch ms)"),
+    cursor: Optional[str] = None,
+    limit: int = Query(default=100, ge=1, le=1000),
+    session: Session = Depends(db_session),
+) -> ProvenanceManifestPage:
+    """Page through indexed manifests ordered by ``(timestamp, id)``."""
+    query = _manifest_query(tenant_slug, tool_name, action, since, until)
+    if cursor:
+        query = query.where(
+            tuple_(ProvenanceManifest.timestamp, ProvenanceManifest.id) > _decode_cursor(cursor)
         )
-        .scalar_one_or_none()
+    rows = session.execute(query.limit(limit + 1)).scalars().all()
+    items = [_manifest_entry(row) for row in rows[:limit]]
+    next_cursor = _encode_cursor(items[-1]) if len(rows) > limit else None
+    return ProvenanceManifestPage(items=items, next_cursor=next_cursor)
+
+
+@router.get("/manifests/export", response_class=StreamingResponse)
+def export_manifests(
+    tenant_slug: Optional[str] = None,
+    tool_name: Optional[str] = None,
+    action: Optional[str] = None,
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+    sessions: SessionFactory = Depends(session_factory),
+) -> StreamingResponse:
+    """Stream every matching index row as NDJSON straight off a server-side cursor."""
+    query = _manifest_query(tenant_slug, tool_name, action, since, until)
+    return StreamingResponse(_stream_manifests(sessions, query), media_type="application/x-ndjson")
+
+
+def _manifest_query(
+    tenant_slug: Optional[str],
+    tool_name: Optional[str],
+    action: Optional[str],
+    since: Optional[int],
+    until: Optional[int],
+) -> Select[Any]:
+    query = select(ProvenanceManifest)
+    if tenant_slug is not None:
+        query = query.where(ProvenanceManifest.tenant_slug == tenant_slug)
+    if tool_name is not None:
+        query = query.where(ProvenanceManifest.tool_name == tool_name)
+    if action is not None:
+        query = query.where(ProvenanceManifest.action == action)
+    if since is not None:
+        query = query.where(ProvenanceManifest.timestamp >= since)
+    if until is not None:
+        query = query.where(ProvenanceManifest.timestamp < until)
+    return query.order_by(ProvenanceManifest.timestamp, ProvenanceManifest.id)
+
+
+def _stream_manifests(
+    sessions: SessionFactory, query: Select[Any]
+) -> Iterator[str]:
+    with sessions() as session:
+        for row in session.execute(query.execution_options(yield_per=1000)).scalars():
+            yield _manifest_entry(row).model_dump_json() + "\n"
+
+
+def _manifest_entry(row: ProvenanceManifest) -> ProvenanceManifestEntry:
+    return ProvenanceManifestEntry(
+        id=row.id,
+        tenant_slug=row.tenant_slug,
+        tool_name=row.tool_name,
+        action=row.action,
+        timestamp=row.timestamp,
+        storage_location=row.storage_location,
+        size_bytes=row.size_bytes,
     )
-    if not tool:
+
+
+def _encode_cursor(entry: ProvenanceManifestEntry) -> str:
+    return base64.urlsafe_b64encode(f"{entry.timestamp}:{entry.id}".encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple[int, str]:
+    try:
+        timestamp, manifest_id = base64.urlsafe_b64decode(cursor).decode("utf-8").split(":", 1)
+        return int(timestamp), manifest_id
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Tool '{tool_name}' not registered for tenant '{tenant_slug}'",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        ) from exc
+
+
+def _indexed_ids(
+    sessions: SessionFactory,
+    tenant_slug: Optional[str],
+    since: Optional[int],
+    until: Optional[int],
+) -> Iterator[str]:
+    query = _manifest_query(tenant_slug, None, None, since, until)
+    with sessions() as session:
+        yield from session.execute(
+            query.with_only_columns(ProvenanceManifest.id).execution_options(yield_per=1000)
+        ).scalars()
+
+
+def _stream_batch(
+    verifier: ProvenanceVerifier,
+    manifest_ids: Optional[Iterable[str]],
+    selector: Optional[ManifestSelector],
+    workers: int,
+    skip_missing: bool = False,
+) -> Iterator[str]:
+    with tracer.start_as_current_span("provenance.verify_batch") as span:
+        summary = VerificationSummary()
+        results = verifier.verify_many(
+            manifest_ids, workers=workers, selector=selector, skip_missing=skip_missing
         )
+        for result in results:
+            summary.add(result)
+            yield json.dumps(result) + "\n"
+        logger.info(
+            "provenance.batch_verified",
+            total=summary.total,
+            verified=summary.verified,
+            failed=summary.failed,
+        )
+        span.set_attribute("sentinel.verified_count", summary.verified)
+        span.set_attribute("sentinel.failed_count", summary.failed)
+        yield json.dumps({"summary": summary.as_dict()}) + "\n"
+
+
+def _batch_selector(
+    tenant_slug: Optional[str], since: Optional[int], until: Optional[int]
+) -> Optional[ManifestSelector]:
+    if tenant_slug is None and since is None and until is None:
+        return None
+
+    def select_manifest(manifest: Dict[str, Any]) -> bool:
+        if tenant_slug is not None and manifest.get("action", {}).get("tenant") != tenant_slug:
+            return False
+        timestamp = manifest.get("timestamp", 0)
+        if since is not None and timestamp < since:
+            return False
+        if until is not None and timestamp >= until:
+            return False
+        return True
+
+    return select_manifest
+
+
+def _open_spool(spool_path: Path) -> BinaryIO:
+    spool_path.parent.mkdir(parents=True, exist_ok=True)
+    return spool_path.open("wb")
+
+
+def _spool_chunk(spool: BinaryIO, digest: "hashlib._Hash", chunk: bytes) -> None:
+    digest.update(chunk)
+    spool.write(chunk)
+
+
+def _payload_too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,  # the constant for 413 was renamed between Starlette releases
+        detail=f"Payload exceeds the {max_bytes}-byte limit",
+    )
+
+
+def _timed_sign(signer: ProvenanceSigner, action: Dict[str, Any], attachment_ref: str) -> Any:
+    with SIGN_SECONDS.time():
+        return signer.sign_action(action, attachment_ref)
+
+
+def _ensure_tool_exists(session: Session, tenant_slug: str, tool_name: str) -> None:
+    require_tool(session, tenant_slug, tool_name)
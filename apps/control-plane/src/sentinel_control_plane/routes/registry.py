@@ -2,78 +2,333 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Iterator
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from ..dependencies import db_session
-from ..models import Tenant, Tool
-from ..schemas import TenantResponse, ToolRegisterRequest, ToolResponse
+from ..dependencies import (
+    async_db_session,
+    db_session,
+    health_scheduler,
+    invalidation_bus,
+    read_db_session,
+    session_factory,
+)
+from ..health import HealthScheduler
+from ..invalidation import InvalidationBus
+from ..lookups import find_tenant, find_tool_ids, require_tenant_id
+from ..manifest_index import SessionFactory
+from ..models import Tenant, Tool, ToolHealth
+from ..registry_version import bump_registry_version, current_registry_version, registry_etag
+from ..schemas import (
+    RegistryChanges,
+    TenantResponse,
+    ToolBulkRegisterRequest,
+    ToolBulkRegisterResponse,
+    ToolBulkRegisterResult,
+    ToolHealthReport,
+    ToolHealthStatus,
+    ToolRegisterRequest,
+    ToolResponse,
+)
+from ..server_timing import TimedRoute
+from ..tool_filters import has_metadata_keys, has_scopes, metadata_matches
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
+async_router = APIRouter(route_class=TimedRoute)
+STREAM_BATCH_SIZE = 1000
+BULK_CHUNK_SIZE = 1000
 
 
 @router.get("", response_model=list[ToolResponse])
 def list_tools(
+    request: Request,
+    response: Response,
+    tenant_slug: str | None = None,
+    cursor: str | None = None,
+    limit: int | None = Query(default=None, ge=1, le=1000),
+    session: Session = Depends(read_db_session),
+) -> list[ToolResponse] | Response:
+    """List tools ordered by ``(tenant_id, name)``.
+
+    Without ``limit`` every matching tool is returned. With it the response is one keyset
+    page, and ``X-Next-Cursor`` carries the cursor for the next page when more rows exist.
+    The ``ETag`` is the registry version; a matching ``If-None-Match`` gets a 304.
+    """
+    return _list_tools(session, request, response, tenant_slug, cursor, limit)
+
+
+@async_router.get("", response_model=list[ToolResponse])
+async def list_tools_async(
+    request: Request,
+    response: Response,
+    tenant_slug: str | None = None,
+    cursor: str | None = None,
+    limit: int | None = Query(default=None, ge=1, le=1000),
+    session: AsyncSession = Depends(async_db_session),
+) -> list[ToolResponse] | Response:
+    """``GET /register`` on the async session."""
+    return await session.run_sync(_list_tools, request, response, tenant_slug, cursor, limit)
+
+
+@router.get("/search", response_model=list[ToolResponse])
+def search_tools(
+    request: Request,
+    response: Response,
+    scope: list[str] = Query(default=[], description="Required scope; repeat to require all"),
+    metadata_key: list[str] = Query(default=[], description="Metadata key that must be present"),
+    metadata: list[str] = Query(default=[], description="Metadata `key=value` pair to match"),
+    owner: str | None = None,
+    active: bool | None = None,
+    tenant_slug: str | None = None,
+    cursor: str | None = None,
+    limit: int | None = Query(default=None, ge=1, le=1000),
+    session: Session = Depends(read_db_session),
+) -> list[ToolResponse] | Response:
+    """Find tools across tenants by scopes, metadata keys and values, owner and state.
+
+    On Postgres the scope and metadata filters are served by the GIN indexes on ``scopes``
+    and ``metadata_json`` (see ``tool_filters``). Metadata values are parsed as JSON when
+    they can be (``tier=1`` matches the number 1), otherwise matched as strings. Paging and
+    ``ETag`` handling follow ``GET /register``.
+    """
+    return _search_tools(
+        session,
+        request,
+        response,
+        scope=scope,
+        metadata_key=metadata_key,
+        metadata=metadata,
+        owner=owner,
+        active=active,
+        tenant_slug=tenant_slug,
+        cursor=cursor,
+        limit=limit,
+    )
+
+
+@async_router.get("/search", response_model=list[ToolResponse])
+async def search_tools_async(
+    request: Request,
+    response: Response,
+    scope: list[str] = Query(default=[], description="Required scope; repeat to require all"),
+    metadata_key: list[str] = Query(default=[], description="Metadata key that must be present"),
+    metadata: list[str] = Query(default=[], description="Metadata `key=value` pair to match"),
+    owner: str | None = None,
+    active: bool | None = None,
+    tenant_slug: str | None = None,
+    cursor: str | None = None,
+    limit: int | None = Query(default=None, ge=1, le=1000),
+    session: AsyncSession = Depends(async_db_session),
+) -> list[ToolResponse] | Response:
+    """``GET /register/search`` on the async session."""
+    return await session.run_sync(
+        _search_tools,
+        request,
+        response,
+        scope=scope,
+        metadata_key=metadata_key,
+        metadata=metadata,
+        owner=owner,
+        active=active,
+        tenant_slug=tenant_slug,
+        cursor=cursor,
+        limit=limit,
+    )
+
+
+def _list_tools(
+    session: Session,
+    request: Request,
+    response: Response,
+    tenant_slug: str | None,
+    cursor: str | None,
+    limit: int | None,
+) -> list[ToolResponse] | Response:
+    not_modified = _check_etag(request, response, current_registry_version(session))
+    if not_modified is not None:
+        return not_modified
+    return _page(session, response, _tools_query(session, tenant_slug), cursor, limit)
+
+
+def _search_tools(
+    session: Session,
+    request: Request,
+    response: Response,
+    *,
+    scope: list[str],
+    metadata_key: list[str],
+    metadata: list[str],
+    owner: str | None,
+    active: bool | None,
+    tenant_slug: str | None,
+    cursor: str | None,
+    limit: int | None,
+) -> list[ToolResponse] | Response:
+    not_modified = _check_etag(request, response, current_registry_version(session))
+    if not_modified is not None:
+        return not_modified
+    query = _tools_query(session, tenant_slug)
+    if owner is not None:
+        query = query.where(Tool.owner == owner)
+    if active is not None:
+        query = query.where(Tool.is_active.is_(active))
+    dialect = session.get_bind().dialect.name
+    if scope:
+        query = query.where(has_scopes(dialect, scope))
+    if metadata_key:
+        query = query.where(has_metadata_keys(dialect, metadata_key))
+    if metadata:
+        pairs = dict(_parse_metadata_filter(item) for item in metadata)
+        query = query.where(metadata_matches(dialect, pairs))
+    return _page(session, response, query, cursor, limit)
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_tools(
     tenant_slug: str | None = None,
     session: Session = Depends(db_session),
-) -> list[ToolResponse]:
-    query = select(Tool)
-    tenant = None
-    if tenant_slug:
-        tenant = session.execute(select(Tenant).where(Tenant.slug == tenant_slug)).scalar_one_or_none()
-        if not tenant:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Tenant '{tenant_slug}' not found",
-            )
-        query = query.where(Tool.tenant_id == tenant.id)
-    tools = session.execute(query).scalars().all()
-    tools_response = [
-        ToolResponse(
-            id=tool.id,
-            tenant_id=tool.tenant_id,
-            name=tool.name,
-            url=tool.url,
-            owner=tool.owner,
-            scopes=list(tool.scopes or []),
-            metadata=tool.extra_metadata,
-            is_active=tool.is_active,
-            created_at=tool.created_at,
-            updated_at=tool.updated_at,
+    sessions: SessionFactory = Depends(session_factory),
+) -> StreamingResponse:
+    """Stream every matching tool as NDJSON straight off a server-side cursor."""
+    query = _tools_query(session, tenant_slug)
+    return StreamingResponse(_stream_tools(sessions, query), media_type="application/x-ndjson")
+
+
+@router.get("/changes", response_model=RegistryChanges)
+def registry_changes(
+    since: int = Query(ge=0, description="Registry version the client already has"),
+    session: Session = Depends(db_session),
+) -> RegistryChanges:
+    """Tools and tenants changed after registry version ``since``.
+
+    Clients poll with the ``version`` from the previous response. Registry rows are never
+    deleted (the kill switch only deactivates tools), so changed rows are the whole delta.
+    A ``since`` ahead of the server's version (for instance after a database restore)
+    returns 410 and the client should resync with a full ``GET /register``.
+    """
+    return _registry_changes(session, since)
+
+
+@async_router.get("/changes", response_model=RegistryChanges)
+async def registry_changes_async(
+    since: int = Query(ge=0, description="Registry version the client already has"),
+    session: AsyncSession = Depends(async_db_session),
+) -> RegistryChanges:
+    """``GET /register/changes`` on the async session."""
+    return await session.run_sync(_registry_changes, since)
+
+
+def _registry_changes(session: Session, since: int) -> RegistryChanges:
+    version = current_registry_version(session)
+    if since > version:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail=f"Registry version {since} is ahead of the current version {version}",
+        )
+    tools = session.execute(
+        select(Tool)
+        .where(Tool.version > since, Tool.version <= version)
+        .order_by(Tool.version, Tool.tenant_id, Tool.name)
+    ).scalars()
+    tenants = session.execute(
+        select(Tenant)
+        .where(Tenant.version > since, Tenant.version <= version)
+        .order_by(Tenant.version, Tenant.slug)
+    ).scalars()
+    return RegistryChanges(
+        version=version,
+        tools=[_tool_response(tool) for tool in tools],
+        tenants=[_tenant_response(tenant) for tenant in tenants],
+    )
+
+
+@router.get("/health", response_model=ToolHealthReport)
+def tool_health(
+    session: Session = Depends(db_session),
+    scheduler: HealthScheduler | None = Depends(health_scheduler),
+) -> ToolHealthReport:
+    """Latest probe result per tool that registered a health check.
+
+    Served from the scheduler's memory when probes run in this process, otherwise from the
+    last batch the scheduler flushed to ``tool_health``.
+    """
+    if scheduler is not None:
+        results = [result._asdict() for result in scheduler.results()]
+        return ToolHealthReport(
+            source="memory",
+            tools=[ToolHealthStatus(**result) for result in results],
         )
-        for tool in tools
-    ]
-    return tools_response
+    rows = session.execute(select(ToolHealth).order_by(ToolHealth.tool_id)).scalars()
+    return ToolHealthReport(
+        source="database",
+        tools=[ToolHealthStatus.model_validate(row, from_attributes=True) for row in rows],
+    )
 
 
 @router.get("/tenants", response_model=list[TenantResponse])
-def list_tenants(session: Session = Depends(db_session)) -> list[TenantResponse]:
+def list_tenants(
+    request: Request,
+    response: Response,
+    session: Session = Depends(read_db_session),
+) -> list[TenantResponse] | Response:
+    return _list_tenants(session, request, response)
+
+
+@async_router.get("/tenants", response_model=list[TenantResponse])
+async def list_tenants_async(
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(async_db_session),
+) -> list[TenantResponse] | Response:
+    return await session.run_sync(_list_tenants, request, response)
+
+
+def _list_tenants(
+    session: Session, request: Request, response: Response
+) -> list[TenantResponse] | Response:
+    not_modified = _check_etag(request, response, current_registry_version(session))
+    if not_modified is not None:
+        return not_modified
     tenants = session.execute(select(Tenant).order_by(Tenant.slug)).scalars().all()
-    return [
-        TenantResponse(
-            id=tenant.id,
-            slug=tenant.slug,
-            display_name=tenant.display_name,
-            created_at=tenant.created_at,
-        )
-        for tenant in tenants
-    ]
+    return [_tenant_response(tenant) for tenant in tenants]
 
 
 @router.post("", response_model=ToolResponse, status_code=status.HTTP_201_CREATED)
 def register_tool(
     payload: ToolRegisterRequest,
     session: Session = Depends(db_session),
+    bus: InvalidationBus | None = Depends(invalidation_bus),
 ) -> ToolResponse:
-    tenant = _get_or_create_tenant(session, payload.tenant_slug)
-    tool = (
-        session.execute(
-            select(Tool).where(Tool.tenant_id == tenant.id, Tool.name == payload.name)
-        )
-        .scalar_one_or_none()
-    )
-    if tool:
+    return _register_tool(session, payload, bus)
+
+
+@async_router.post("", response_model=ToolResponse, status_code=status.HTTP_201_CREATED)
+async def register_tool_async(
+    payload: ToolRegisterRequest,
+    session: AsyncSession = Depends(async_db_session),
+    bus: InvalidationBus | None = Depends(invalidation_bus),
+) -> ToolResponse:
+    return await session.run_sync(_register_tool, payload, bus)
+
+
+def _register_tool(
+    session: Session, payload: ToolRegisterRequest, bus: InvalidationBus | None
+) -> ToolResponse:
+    version = bump_registry_version(session)
+    tenant = _get_or_create_tenant(session, payload.tenant_slug, version)
+    if find_tool_ids(session, tenant.id, payload.name):
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=f"Tool '{payload.name}' already registered for tenant '{payload.tenant_slug}'",
@@ -86,9 +341,74 @@ def register_tool(
         owner=payload.owner,
         scopes=payload.scopes,
         extra_metadata=payload.metadata,
+        healthcheck=payload.healthcheck.model_dump() if payload.healthcheck else None,
+        version=version,
     )
     session.add(tool)
     session.flush()
+    if bus is not None:
+        if tenant.version == version:  # created by this request
+            bus.publish(session, "tenant", version, tenant.slug)
+        bus.publish(session, "tool", version, tenant.slug, (tool.name,))
+    return _tool_response(tool)
+
+
+def _display_name(slug: str) -> str:
+    return slug.replace("-", " ").title()
+
+
+def _upsert(session: Session, model: type[Tenant] | type[Tool]) -> Any:
+    if session.get_bind().dialect.name == "sqlite":
+        return sqlite_insert(model)
+    return pg_insert(model)
+
+
+def _tools_query(session: Session, tenant_slug: str | None) -> Select[Any]:
+    query = select(Tool)
+    if tenant_slug:
+        query = query.where(Tool.tenant_id == require_tenant_id(session, tenant_slug))
+    return query.order_by(Tool.tenant_id, Tool.name)
+
+
+def _page(
+    session: Session,
+    response: Response,
+    query: Select[Any],
+    cursor: str | None,
+    limit: int | None,
+) -> list[ToolResponse]:
+    if cursor:
+        query = query.where(tuple_(Tool.tenant_id, Tool.name) > _decode_cursor(cursor))
+    if limit is None:
+        return [_tool_response(tool) for tool in session.execute(query).scalars().all()]
+    tools = session.execute(query.limit(limit + 1)).scalars().all()
+    if len(tools) > limit:
+        response.headers["X-Next-Cursor"] = _encode_cursor(tools[limit - 1])
+    return [_tool_response(tool) for tool in tools[:limit]]
+
+
+def _parse_metadata_filter(item: str) -> tuple[str, Any]:
+    key, separator, raw = item.partition("=")
+    if not separator or not key:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid metadata filter '{item}', expected key=value",
+        )
+    try:
+        return key, json.loads(raw)
+    except ValueError:
+        return key, raw
+
+
+def _stream_tools(sessions: SessionFactory, query: Select[Any]) -> Iterator[str]:
+    # One chunk per fetched partition: each chunk costs a threadpool hop in StreamingResponse.
+    with sessions() as session:
+        result = session.execute(query.execution_options(yield_per=STREAM_BATCH_SIZE))
+        for tools in result.scalars().partitions():
+            yield "".join(_tool_response(tool).model_dump_json() + "\n" for tool in tools)
+
+
+def _tool_response(tool: Tool) -> ToolResponse:
     return ToolResponse(
         id=tool.id,
         tenant_id=tool.tenant_id,
@@ -103,11 +423,160 @@ def register_tool(
     )
 
 
-def _get_or_create_tenant(session: Session, slug: str) -> Tenant:
-    tenant = session.execute(select(Tenant).where(Tenant.slug == slug)).scalar_one_or_none()
+def _tenant_response(tenant: Tenant) -> TenantResponse:
+    return TenantResponse(
+        id=tenant.id,
+        slug=tenant.slug,
+        display_name=tenant.display_name,
+        created_at=tenant.created_at,
+    )
+
+
+def _check_etag(request: Request, response: Response, version: int) -> Response | None:
+    etag = registry_etag(version)
+    header = request.headers.get("if-none-match", "")
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    if etag in candidates or "*" in candidates:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return None
+
+
+def _encode_cursor(tool: Tool) -> str:
+    return base64.urlsafe_b64encode(f"{tool.tenant_id}:{tool.name}".encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple[uuid.UUID, str]:
+    try:
+        tenant_id, name = base64.urlsafe_b64decode(cursor).decode("utf-8").split(":", 1)
+        return uuid.UUID(tenant_id), name
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        ) from exc
+
+
+@router.post("/bulk", response_model=ToolBulkRegisterResponse)
+def register_tools_bulk(
+    payload: ToolBulkRegisterRequest,
+    session: Session = Depends(db_session),
+    bus: InvalidationBus | None = Depends(invalidation_bus),
+) -> ToolBulkRegisterResponse:
+    """Create or update many tools with set-based upserts.
+
+    Missing tenants are created with ``INSERT ... ON CONFLICT DO NOTHING`` and tools are
+    upserted on ``(tenant_id, name)``, so concurrent registrations of the same tenant or
+    tool cannot fail on a duplicate key. Existing tools keep their id and kill-switch state.
+    When a request names the same tool twice the last entry wins and earlier ones are
+    reported as ``duplicate``.
+    """
+    latest: dict[tuple[str, str], int] = {}
+    for index, tool in enumerate(payload.tools):
+        latest[(tool.tenant_slug, tool.name)] = index
+
+    version = bump_registry_version(session)
+    slugs = sorted({tool.tenant_slug for tool in payload.tools})
+    session.execute(
+        _upsert(session, Tenant)
+        .values(
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "slug": slug,
+                    "display_name": _display_name(slug),
+                    "version": version,
+                }
+                for slug in slugs
+            ]
+        )
+        .on_conflict_do_nothing(index_elements=["slug"])
+    )
+    tenants = session.execute(
+        select(Tenant.slug, Tenant.id, Tenant.version).where(Tenant.slug.in_(slugs))
+    ).all()
+    tenant_ids = {slug: tenant_id for slug, tenant_id, _ in tenants}
+
+    now = datetime.utcnow()
+    rows = sorted(  # a fixed row order keeps concurrent upserts from deadlocking
+        (
+            {
+                "id": uuid.uuid4(),
+                "tenant_id": tenant_ids[tool.tenant_slug],
+                "name": tool.name,
+                "url": tool.url,
+                "owner": tool.owner,
+                "scopes": tool.scopes,
+                "extra_metadata": tool.metadata,
+                "healthcheck": tool.healthcheck.model_dump() if tool.healthcheck else None,
+                "is_active": True,
+                "created_at": now,
+                "updated_at": now,
+                "version": version,
+            }
+            for tool in (payload.tools[index] for index in latest.values())
+        ),
+        key=lambda row: (str(row["tenant_id"]), row["name"]),
+    )
+    # An update keeps the existing id, so a row returned with the id proposed for it was
+    # inserted; unlike comparing created_at this does not depend on timestamp precision.
+    proposed_ids = {row["id"] for row in rows}
+    stored: dict[tuple[Any, str], tuple[uuid.UUID, bool]] = {}
+    for start in range(0, len(rows), BULK_CHUNK_SIZE):
+        statement = _upsert(session, Tool).values(rows[start : start + BULK_CHUNK_SIZE])
+        statement = statement.on_conflict_do_update(
+            index_elements=["tenant_id", "name"],
+            set_={
+                "url": statement.excluded.url,
+                "owner": statement.excluded.owner,
+                "scopes": statement.excluded.scopes,
+                "metadata_json": statement.excluded.metadata_json,
+                "healthcheck": statement.excluded.healthcheck,
+                "updated_at": statement.excluded.updated_at,
+                "version": statement.excluded.version,
+            },
+        ).returning(Tool.id, Tool.tenant_id, Tool.name)
+        for tool_id, tenant_id, name in session.execute(statement):
+            stored[(tenant_id, name)] = (tool_id, tool_id in proposed_ids)
+
+    results = []
+    for index, tool in enumerate(payload.tools):
+        if latest[(tool.tenant_slug, tool.name)] != index:
+            results.append(
+                ToolBulkRegisterResult(
+                    tenant_slug=tool.tenant_slug, name=tool.name, status="duplicate"
+                )
+            )
+            continue
+        tool_id, created = stored[(tenant_ids[tool.tenant_slug], tool.name)]
+        results.append(
+            ToolBulkRegisterResult(
+                tenant_slug=tool.tenant_slug,
+                name=tool.name,
+                status="created" if created else "updated",
+                id=tool_id,
+            )
+        )
+    if bus is not None:
+        for slug, _, tenant_version in tenants:
+            if tenant_version == version:  # created by this request
+                bus.publish(session, "tenant", version, slug)
+        for slug in slugs:
+            names = tuple(sorted(name for tenant_slug, name in latest if tenant_slug == slug))
+            bus.publish(session, "tool", version, slug, names)
+    created_count = sum(result.status == "created" for result in results)
+    return ToolBulkRegisterResponse(
+        created=created_count,
+        updated=len(latest) - created_count,
+        results=results,
+    )
+
+
+def _get_or_create_tenant(session: Session, slug: str, version: int) -> Tenant:
+    tenant = find_tenant(session, slug)
     if tenant:
         return tenant
-    tenant = Tenant(slug=slug, display_name=slug.replace("-", " ").title())
+    tenant = Tenant(slug=slug, display_name=_display_name(slug), version=version)
     session.add(tenant)
     session.flush()
     return tenant
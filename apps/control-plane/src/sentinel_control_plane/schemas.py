@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import uuid as uuid_pkg
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -38,6 +38,23 @@ class ToolRegisterRequest(BaseModel):
     healthcheck: Optional[ToolHealthCheck] = None
 
 
+class ToolBulkRegisterRequest(BaseModel):
+    tools: List[ToolRegisterRequest] = Field(min_length=1, max_length=10_000)
+
+
+class ToolBulkRegisterResult(BaseModel):
+    tenant_slug: str
+    name: str
+    status: Literal["created", "updated", "duplicate"]
+    id: Optional[uuid_pkg.UUID] = None
+
+
+class ToolBulkRegisterResponse(BaseModel):
+    created: int
+    updated: int
+    results: List[ToolBulkRegisterResult]
+
+
 class ToolResponse(BaseModel):
     id: uuid_pkg.UUID
     tenant_id: uuid_pkg.UUID
@@ -51,6 +68,27 @@ class ToolResponse(BaseModel):
     updated_at: datetime
 
 
+class ToolHealthStatus(BaseModel):
+    tool_id: uuid_pkg.UUID
+    healthy: bool
+    status_code: Optional[int] = None
+    latency_ms: float
+    error: Optional[str] = None
+    consecutive_failures: int
+    checked_at: datetime
+
+
+class ToolHealthReport(BaseModel):
+    source: Literal["memory", "database"]
+    tools: List[ToolHealthStatus]
+
+
+class RegistryChanges(BaseModel):
+    version: int
+    tools: List[ToolResponse]
+    tenants: List[TenantResponse]
+
+
 class PolicyCheckRequest(BaseModel):
     tenant_slug: str
     tool_name: str
@@ -70,11 +108,13 @@ class KillSwitchRequest(BaseModel):
     tenant_slug: str
     tool_name: Optional[str] = None
     reason: str
+    duration_seconds: Optional[int] = Field(default=None, ge=1, le=30 * 24 * 3600)
 
 
 class KillSwitchResponse(BaseModel):
     status: str
     affected_tools: List[str]
+    expires_at: Optional[datetime] = None
 
 
 class KillSwitchRestoreRequest(BaseModel):
@@ -82,10 +122,42 @@ class KillSwitchRestoreRequest(BaseModel):
     tool_name: Optional[str] = None
 
 
-class ProvenanceSignRequest(BaseModel):
+class KillSwitchSelector(BaseModel):
+    """Tools matching every non-empty field; scopes match when a tool holds any of them."""
+
+    tenant_slugs: List[str] = Field(default_factory=list)
+    tool_names: List[str] = Field(default_factory=list)
+    owners: List[str] = Field(default_factory=list)
+    scopes: List[str] = Field(default_factory=list)
+
+
+class KillSwitchBulkRequest(BaseModel):
+    selector: KillSwitchSelector
+    action: Literal["disable", "restore"] = "disable"
+    reason: str
+    duration_seconds: Optional[int] = Field(default=None, ge=1, le=30 * 24 * 3600)
+
+
+class KillSwitchBulkTool(BaseModel):
+    id: uuid_pkg.UUID
     tenant_slug: str
-    tool_name: str
-    action: str
+    name: str
+
+
+class KillSwitchBulkResponse(BaseModel):
+    status: str
+    affected_count: int
+    unchanged_count: int = 0
+    affected_tools: List[KillSwitchBulkTool]
+    committed_ms: float
+    expires_at: Optional[datetime] = None
+
+
+class ProvenanceSignRequest(BaseModel):
+    # Bounded by the provenance_manifests index columns the manifest is recorded in.
+    tenant_slug: str = Field(max_length=64)
+    tool_name: str = Field(max_length=128)
+    action: str = Field(max_length=128)
     payload: Dict[str, Any]
 
 
@@ -95,7 +167,85 @@ class ProvenanceResponse(BaseModel):
     timestamp: int
 
 
+class ProvenanceStreamResponse(ProvenanceResponse):
+    payload_sha256: str
+    payload_bytes: int
+
+
 class ProvenanceVerifyResponse(BaseModel):
     manifest_id: str
     verified: bool
     manifest: Dict[str, Any]
+
+
+class ProvenanceVerifyBatchRequest(BaseModel):
+    manifest_ids: List[str] = Field(default_factory=list, max_length=10_000)
+    tenant_slug: Optional[str] = None
+    since: Optional[int] = Field(default=None, description="Inclusive lower bound (epoch ms)")
+    until: Optional[int] = Field(default=None, description="Exclusive upper bound (epoch ms)")
+    workers: int = Field(default=4, ge=1, le=32)
+
+
+class ProvenanceCacheStats(BaseModel):
+    enabled: bool
+    entries: int = 0
+    bytes: int = 0
+    max_bytes: int = 0
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    hit_rate: float = 0.0
+
+
+class DatabasePoolStats(BaseModel):
+    name: str
+    size: int
+    max_overflow: int
+    checked_out: int
+    checked_out_peak: int
+    overflow_in_use: int
+    checkouts: int
+    timeouts: int
+    wait_ms_total: float
+    wait_ms_max: float
+    wait_ms_p50: float
+    wait_ms_p99: float
+
+
+class ReplicaStatus(BaseModel):
+    name: str
+    healthy: bool
+    version: int
+    lag_seconds: float
+    reads: int
+    error: Optional[str] = None
+
+
+class ReplicaReport(BaseModel):
+    enabled: bool
+    primary_reads: int = 0
+    replicas: List[ReplicaStatus] = Field(default_factory=list)
+
+
+class ProvenanceChainReport(BaseModel):
+    tenant: str
+    head_seq: int
+    resumed_from_seq: int
+    checked: int
+    verified: bool
+    errors: List[str]
+
+
+class ProvenanceManifestEntry(BaseModel):
+    id: str
+    tenant_slug: str
+    tool_name: str
+    action: str
+    timestamp: int
+    storage_location: str
+    size_bytes: int
+
+
+class ProvenanceManifestPage(BaseModel):
+    items: List[ProvenanceManifestEntry]
+    next_cursor: Optional[str] = None
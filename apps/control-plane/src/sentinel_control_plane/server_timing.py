@@ -0,0 +1,136 @@
+"""Per-request stage timings reported in a ``Server-Timing`` header and the request log."""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+
+import structlog
+from fastapi.routing import APIRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = structlog.get_logger(__name__)
+
+SERVER_TIMING_HEADER = "Server-Timing"
+STAGES = ("db", "opa", "sign", "storage", "serialize")
+
+
+class StageTimings:
+    """Seconds spent per stage while serving one request.
+
+    Stages may nest (``sign`` includes the ``storage`` writes it makes), so they are not
+    meant to add up to ``total``.
+    """
+
+    __slots__ = ("started", "returned", "stages")
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.returned: Optional[float] = None  # when the endpoint function returned
+        self.stages: Dict[str, float] = {}
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def milliseconds(self) -> Dict[str, float]:
+        timings = {stage: self.stages[stage] for stage in STAGES if stage in self.stages}
+        timings["total"] = time.perf_counter() - self.started
+        return {stage: round(seconds * 1000, 3) for stage, seconds in timings.items()}
+
+
+# Sync handlers and queries run in a copy of the request's context, so the collector is a
+# mutable object they add to rather than a value they set.
+_timings: ContextVar[Optional[StageTimings]] = ContextVar("sentinel_stage_timings", default=None)
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    """Add ``seconds`` to ``stage`` of the current request; a no-op outside one."""
+    timings = _timings.get()
+    if timings is not None:
+        timings.add(stage, seconds)
+
+
+def server_timing(timings: Dict[str, float]) -> str:
+    return ", ".join(f"{stage};dur={milliseconds}" for stage, milliseconds in timings.items())
+
+
+class TimedRoute(APIRoute):
+    """An ``APIRoute`` whose endpoint notes when it returned, so the time FastAPI then
+    spends validating and serializing the response is reported as ``serialize``."""
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        super().__init__(path, _noting_return(endpoint), **kwargs)
+
+
+def _noting_return(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def timed_async(*args: Any, **kwargs: Any) -> Any:
+            result = await endpoint(*args, **kwargs)
+            _note_return()
+            return result
+
+        return timed_async
+
+    @functools.wraps(endpoint)
+    def timed(*args: Any, **kwargs: Any) -> Any:
+        result = endpoint(*args, **kwargs)
+        _note_return()
+        return result
+
+    return timed
+
+
+def _note_return() -> None:
+    timings = _timings.get()
+    if timings is not None:
+        timings.returned = time.perf_counter()
+
+
+class ServerTimingMiddleware:
+    """Collects stage timings for every HTTP request and reports them.
+
+    They go out in a ``Server-Timing`` header on the response and in a
+    ``request.timings`` log event once the response has been sent.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        timings = StageTimings()
+        token = _timings.set(timings)
+        reported: List[Dict[str, float]] = []
+        status = [500]
+
+        async def send_with_timings(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+                if timings.returned is not None:
+                    timings.add("serialize", time.perf_counter() - timings.returned)
+                reported.append(timings.milliseconds())
+                value = server_timing(reported[0]).encode()
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (SERVER_TIMING_HEADER.lower().encode(), value),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timings)
+        finally:
+            _timings.reset(token)
+            logger.info(
+                "request.timings",
+                method=scope["method"],
+                path=scope["path"],
+                status=status[0],
+                timings=reported[0] if reported else timings.milliseconds(),
+            )
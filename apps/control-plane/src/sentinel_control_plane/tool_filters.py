@@ -0,0 +1,57 @@
+"""JSON filters over ``Tool.scopes`` and ``Tool.extra_metadata`` for both dialects.
+
+On Postgres the filters compile to JSONB containment (``@>``) and key-existence (``?&``)
+operators, which the GIN indexes on ``scopes`` and ``metadata_json`` serve. SQLite (tests,
+benchmarks) has no JSONB operators, so the same filters go through its JSON1 functions.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from sqlalchemy import ColumnElement, Text, and_, exists, false, func, literal, or_, select, true
+from sqlalchemy.dialects import postgresql
+
+from .models import Tool
+
+
+def has_scopes(dialect: str, scopes: List[str], *, match_all: bool = True) -> ColumnElement[bool]:
+    """Tools holding every scope in ``scopes`` (or, with ``match_all=False``, any of them)."""
+    if not scopes:
+        return true() if match_all else false()
+    if dialect == "sqlite":
+        clauses = [_sqlite_has_scope(scope) for scope in scopes]
+    elif match_all:
+        return Tool.scopes.contains(scopes)
+    else:
+        # one containment test per scope: jsonb_path_ops serves @> but not ?|
+        clauses = [Tool.scopes.contains([scope]) for scope in scopes]
+    return and_(*clauses) if match_all else or_(*clauses)
+
+
+def has_metadata_keys(dialect: str, keys: List[str]) -> ColumnElement[bool]:
+    if dialect == "sqlite":
+        return and_(
+            *(func.json_type(Tool.extra_metadata, _json_path(key)).is_not(None) for key in keys)
+        )
+    return Tool.extra_metadata.has_all(postgresql.array(keys, type_=Text))
+
+
+def metadata_matches(dialect: str, pairs: Dict[str, Any]) -> ColumnElement[bool]:
+    if dialect == "sqlite":
+        return and_(
+            *(
+                func.json_extract(Tool.extra_metadata, _json_path(key)) == value
+                for key, value in pairs.items()
+            )
+        )
+    return Tool.extra_metadata.contains(pairs)
+
+
+def _sqlite_has_scope(scope: str) -> ColumnElement[bool]:
+    values = func.json_each(Tool.scopes).table_valued("value")
+    return exists(select(literal(1)).select_from(values).where(values.c.value == scope))
+
+
+def _json_path(key: str) -> str:
+    return '$."' + key.replace('"', '""') + '"'
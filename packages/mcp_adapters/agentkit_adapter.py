@@ -2,18 +2,30 @@
 
 from __future__ import annotations
 
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, Optional
 
 import httpx
 
+from .server_timing import TimingCallback, report_timings
 
-class AgentKitAdapter:
-    """Wraps AgentKit tool execution with policy checks and provenance hooks."""
 
-    def __init__(self, control_plane_url: str, tenant_slug: str) -> None:
+class AgentKitAdapter:
+    """Wraps AgentKit tool execution with policy checks and provenance hooks.
+
+    ``on_timing(endpoint, timings)`` receives the control plane's per-stage milliseconds
+    for each call when it sends ``Server-Timing`` (``SERVER_TIMING_ENABLED``).
+    """
+
+    def __init__(
+        self,
+        control_plane_url: str,
+        tenant_slug: str,
+        on_timing: Optional[TimingCallback] = None,
+    ) -> None:
         self._base = control_plane_url.rstrip("/")
         self._tenant = tenant_slug
         self._client = httpx.Client(timeout=2.0)
+        self._on_timing = on_timing
 
     def wrap(self, tool_name: str, func: Callable[..., Any]) -> Callable[..., Any]:
         """Return a wrapped callable enforcing policy allow/deny semantics."""
@@ -26,7 +38,9 @@ class AgentKitAdapter:
                 "usage": kwargs.get("usage", 0),
                 "context": kwargs.get("context", {}),
             }
-            decision = self._client.post(f"{self._base}/policy/check", json=payload).json()
+            response = self._client.post(f"{self._base}/policy/check", json=payload)
+            report_timings(self._on_timing, "/policy/check", response)
+            decision = response.json()
             if not decision.get("allow"):
                 raise PermissionError(decision.get("reason", "tool invocation denied"))
 
@@ -38,7 +52,8 @@ class AgentKitAdapter:
                 "action": "invoke",
                 "payload": {"args": args, "kwargs": kwargs, "result": result},
             }
-            self._client.post(f"{self._base}/provenance/sign", json=manifest_payload)
+            signed = self._client.post(f"{self._base}/provenance/sign", json=manifest_payload)
+            report_timings(self._on_timing, "/provenance/sign", signed)
             return result
 
         return wrapper
@@ -2,18 +2,30 @@
 
 from __future__ import annotations
 
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, Optional
 
 import httpx
 
+from .server_timing import TimingCallback, report_timings
 
-class LangGraphMiddleware:
-    """Provides before/after hooks for LangGraph edges."""
 
-    def __init__(self, control_plane_url: str, tenant_slug: str) -> None:
+class LangGraphMiddleware:
+    """Provides before/after hooks for LangGraph edges.
+
+    ``on_timing(endpoint, timings)`` receives the control plane's per-stage milliseconds
+    for each policy check when it sends ``Server-Timing`` (``SERVER_TIMING_ENABLED``).
+    """
+
+    def __init__(
+        self,
+        control_plane_url: str,
+        tenant_slug: str,
+        on_timing: Optional[TimingCallback] = None,
+    ) -> None:
         self._base = control_plane_url.rstrip("/")
         self._tenant = tenant_slug
         self._client = httpx.Client(timeout=2.0)
+        self._on_timing = on_timing
 
     def tool_guard(self, tool_name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
         """Decorator for LangGraph tool callables."""
@@ -28,6 +40,7 @@ class LangGraphMiddleware:
                     "context": kwargs.get("context", {}),
                 }
                 response = self._client.post(f"{self._base}/policy/check", json=payload)
+                report_timings(self._on_timing, "/policy/check", response)
                 decision = response.json()
                 if not decision.get("allow"):
                     raise PermissionError(decision.get("reason", "policy denied tool call"))
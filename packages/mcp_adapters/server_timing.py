@@ -0,0 +1,39 @@
+"""Read the control plane's ``Server-Timing`` stage breakdown off its responses."""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, Optional
+
+import httpx
+
+TimingCallback = Callable[[str, Dict[str, float]], None]
+
+
+def parse_server_timing(value: str) -> Dict[str, float]:
+    """Milliseconds per metric of a ``Server-Timing`` header; metrics without ``dur`` are 0."""
+    timings: Dict[str, float] = {}
+    for metric in value.split(","):
+        name, *params = (part.strip() for part in metric.split(";"))
+        if not name:
+            continue
+        duration = 0.0
+        for param in params:
+            key, _, raw = param.partition("=")
+            if key.strip().lower() == "dur":
+                try:
+                    duration = float(raw.strip().strip('"'))
+                except ValueError:
+                    pass
+        timings[name] = duration
+    return timings
+
+
+def report_timings(
+    callback: Optional[TimingCallback], endpoint: str, response: httpx.Response
+) -> None:
+    """Pass ``response``'s stage timings to ``callback`` when both exist."""
+    if callback is None:
+        return
+    header = response.headers.get("server-timing")
+    if header:
+        callback(endpoint, parse_server_timing(header))
@@ -6,13 +6,30 @@ export type SkillInvocation = {
 
 type Fetcher = typeof fetch;
 
+/** Milliseconds per stage from the control plane's `Server-Timing` header. */
+export type TimingCallback = (endpoint: string, timings: Record<string, number>) => void;
+
+export function parseServerTiming(value: string): Record<string, number> {
+  const timings: Record<string, number> = {};
+  for (const metric of value.split(",")) {
+    const [name, ...params] = metric.split(";").map((part) => part.trim());
+    if (!name) continue;
+    const duration = params.find((param) => param.toLowerCase().startsWith("dur="));
+    const parsed = duration ? Number(duration.slice(4).replace(/"/g, "")) : 0;
+    timings[name] = Number.isFinite(parsed) ? parsed : 0;
+  }
+  return timings;
+}
+
 export class SkillsHook {
   private controlPlaneUrl: string;
   private fetcher: Fetcher;
+  private onTiming?: TimingCallback;
 
-  constructor(controlPlaneUrl: string, fetcher: Fetcher = fetch) {
+  constructor(controlPlaneUrl: string, fetcher: Fetcher = fetch, onTiming?: TimingCallback) {
     this.controlPlaneUrl = controlPlaneUrl.replace(/\/$/, "");
     this.fetcher = fetcher;
+    this.onTiming = onTiming;
   }
 
   async intercept(invocation: SkillInvocation): Promise<void> {
@@ -27,6 +44,11 @@ export class SkillsHook {
       }),
     });
 
+    const serverTiming = policyRes.headers.get("server-timing");
+    if (this.onTiming && serverTiming) {
+      this.onTiming("/policy/check", parseServerTiming(serverTiming));
+    }
+
     if (!policyRes.ok) {
       throw new Error(`Policy check failed: ${policyRes.status}`);
     }
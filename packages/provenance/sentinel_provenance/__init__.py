@@ -1,4 +1,15 @@
+from .cache import ManifestCache
+from .retention import RetentionEngine, RetentionPolicy
 from .signer import ProvenanceSigner
-from .verifier import ProvenanceVerifier
+from .verifier import ProvenanceVerifier, VerificationSummary
+from .writer import GroupCommitWriter
 
-__all__ = ["ProvenanceSigner", "ProvenanceVerifier"]
+__all__ = [
+    "GroupCommitWriter",
+    "ManifestCache",
+    "ProvenanceSigner",
+    "ProvenanceVerifier",
+    "RetentionEngine",
+    "RetentionPolicy",
+    "VerificationSummary",
+]
@@ -0,0 +1,356 @@
+"""Byte-level storage backends used by :class:`ManifestStorage`."""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Protocol, Sequence, Tuple
+from urllib.parse import quote
+from xml.etree import ElementTree
+
+S3_NAMESPACE = "{http://s3.amazonaws.com/doc/2006-03-01/}"
+
+
+class StorageBackend(Protocol):
+    """Minimal key/value interface a manifest store needs from its backing storage.
+
+    Keys are ``/``-separated relative paths. ``get`` raises ``FileNotFoundError`` for
+    missing keys and ``list_keys`` yields the keys directly under a prefix. ``put_file``
+    stores a file without reading it into memory and may move ``source`` in doing so.
+    """
+
+    def put(self, key: str, data: bytes) -> str: ...
+
+    def put_many(self, items: Sequence[Tuple[str, bytes]]) -> List[str]: ...
+
+    def put_file(self, key: str, source: Path) -> str: ...
+
+    def get(self, key: str) -> bytes: ...
+
+    def get_range(self, key: str, offset: int, length: int) -> bytes: ...
+
+    def delete(self, key: str) -> None: ...
+
+    def list_keys(self, prefix: str = "") -> Iterator[str]: ...
+
+
+class LocalBackend:
+    """Stores objects as files below ``base_path``."""
+
+    def __init__(self, base_path: Path) -> None:
+        self.base_path = base_path
+        self.base_path.mkdir(parents=True, exist_ok=True)
+
+    def put(self, key: str, data: bytes) -> str:
+        path = self.base_path / key
+        if "/" in key:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        if _cacheable(key):
+            path.write_bytes(data)  # immutable objects are written once under a fresh key
+            return str(path)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+        return str(path)
+
+    def put_many(self, items: Sequence[Tuple[str, bytes]]) -> List[str]:
+        return [self.put(key, data) for key, data in items]
+
+    def put_file(self, key: str, source: Path) -> str:
+        path = self.base_path / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.replace(source, path)
+        except OSError:  # source is on another filesystem
+            shutil.copyfile(source, path)
+        return str(path)
+
+    def get(self, key: str) -> bytes:
+        return (self.base_path / key).read_bytes()
+
+    def get_range(self, key: str, offset: int, length: int) -> bytes:
+        with (self.base_path / key).open("rb") as handle:
+            handle.seek(offset)
+            return handle.read(length)
+
+    def delete(self, key: str) -> None:
+        (self.base_path / key).unlink(missing_ok=True)
+
+    def list_keys(self, prefix: str = "") -> Iterator[str]:
+        directory = self.base_path / prefix if prefix else self.base_path
+        if not directory.is_dir():
+            return
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file() and not entry.name.startswith("."):
+                    yield f"{prefix.rstrip('/')}/{entry.name}" if prefix else entry.name
+
+
+class S3Backend:
+    """S3-compatible object storage with a pooled client and a local read-through cache.
+
+    ``put_many`` uploads a batch concurrently over one pooled HTTP client, and objects
+    larger than ``multipart_threshold`` are sent as multipart uploads with parts in
+    parallel. Reads of immutable keys (everything outside ``_meta/``) are served from an
+    on-disk LRU cache in ``cache_dir`` once fetched. Requires ``httpx``.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: str,
+        access_key: str,
+        secret_key: str,
+        region: str = "us-east-1",
+        prefix: str = "",
+        max_connections: int = 32,
+        multipart_threshold: int = 8 * 1024 * 1024,
+        part_size: int = 8 * 1024 * 1024,
+        cache_dir: Optional[Path] = None,
+        cache_max_bytes: int = 64 * 1024 * 1024,
+        transport: Optional[Any] = None,
+    ) -> None:
+        import httpx  # optional dependency: pip install sentinel-provenance[s3]
+
+        self._bucket = bucket
+        self._endpoint = endpoint_url.rstrip("/")
+        self._host = httpx.URL(self._endpoint).netloc.decode("ascii")
+        self._access_key = access_key
+        self._secret_key = secret_key
+        self._region = region
+        self._prefix = prefix.strip("/")
+        self._multipart_threshold = multipart_threshold
+        self._part_size = part_size
+        self._client = httpx.Client(
+            timeout=30.0,
+            limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_connections
+            ),
+            transport=transport,
+        )
+        self._pool = ThreadPoolExecutor(max_workers=max_connections, thread_name_prefix="s3-upload")
+        self._cache = _DiskCache(cache_dir, cache_max_bytes) if cache_dir else None
+
+    def put(self, key: str, data: bytes) -> str:
+        if len(data) > self._multipart_threshold:
+            self._put_multipart(
+                key, len(data), lambda offset, length: data[offset : offset + length]
+            )
+        else:
+            self._request("PUT", key, body=data)
+        if self._cache is not None and _cacheable(key):
+            self._cache.put(key, data)
+        return f"s3://{self._bucket}/{self._object_key(key)}"
+
+    def put_many(self, items: Sequence[Tuple[str, bytes]]) -> List[str]:
+        return list(self._pool.map(lambda item: self.put(*item), items))
+
+    def put_file(self, key: str, source: Path) -> str:
+        size = source.stat().st_size
+        if size <= self._multipart_threshold:
+            return self.put(key, source.read_bytes())
+
+        def read_part(offset: int, length: int) -> bytes:
+            with source.open("rb") as handle:
+                handle.seek(offset)
+                return handle.read(length)
+
+        # Large files are not added to the read cache; parts are read as they are sent.
+        self._put_multipart(key, size, read_part)
+        return f"s3://{self._bucket}/{self._object_key(key)}"
+
+    def get(self, key: str) -> bytes:
+        if self._cache is not None and _cacheable(key):
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+        response = self._request("GET", key, allow_missing=True)
+        if response.status_code == 404:
+            raise FileNotFoundError(key)
+        data = response.content
+        if self._cache is not None and _cacheable(key):
+            self._cache.put(key, data)
+        return data
+
+    def get_range(self, key: str, offset: int, length: int) -> bytes:
+        response = self._request(
+            "GET", key, allow_missing=True, headers={"range": f"bytes={offset}-{offset + length - 1}"}
+        )
+        if response.status_code == 404:
+            raise FileNotFoundError(key)
+        if response.status_code == 206:
+            return response.content
+        return response.content[offset : offset + length]  # server ignored the range
+
+    def delete(self, key: str) -> None:
+        self._request("DELETE", key, allow_missing=True)
+        if self._cache is not None:
+            self._cache.discard(key)
+
+    def list_keys(self, prefix: str = "") -> Iterator[str]:
+        object_prefix = self._object_key(prefix.rstrip("/") + "/" if prefix else "")
+        params = {"list-type": "2", "prefix": object_prefix, "delimiter": "/"}
+        while True:
+            response = self._request("GET", None, params=params)
+            root = ElementTree.fromstring(response.content)
+            for contents in root.iter(f"{S3_NAMESPACE}Contents"):
+                object_key = contents.findtext(f"{S3_NAMESPACE}Key") or ""
+                yield object_key[len(self._prefix) + 1 :] if self._prefix else object_key
+            token = root.findtext(f"{S3_NAMESPACE}NextContinuationToken")
+            if root.findtext(f"{S3_NAMESPACE}IsTruncated") != "true" or not token:
+                return
+            params = {**params, "continuation-token": token}
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
+        self._client.close()
+
+    def _put_multipart(self, key: str, size: int, read_part: Callable[[int, int], bytes]) -> None:
+        response = self._request("POST", key, params={"uploads": ""})
+        upload_id = ElementTree.fromstring(response.content).findtext(f"{S3_NAMESPACE}UploadId")
+        offsets = range(0, size, self._part_size)
+
+        def upload_part(numbered: Tuple[int, int]) -> str:
+            number, offset = numbered
+            part = self._request(
+                "PUT",
+                key,
+                params={"partNumber": str(number), "uploadId": upload_id or ""},
+                body=read_part(offset, min(self._part_size, size - offset)),
+            )
+            return part.headers["ETag"]
+
+        try:
+            etags = list(self._pool.map(upload_part, enumerate(offsets, start=1)))
+        except Exception:
+            self._request("DELETE", key, params={"uploadId": upload_id or ""}, allow_missing=True)
+            raise
+        parts = "".join(
+            f"<Part><PartNumber>{number}</PartNumber><ETag>{etag}</ETag></Part>"
+            for number, etag in enumerate(etags, start=1)
+        )
+        body = f"<CompleteMultipartUpload>{parts}</CompleteMultipartUpload>".encode("utf-8")
+        self._request("POST", key, params={"uploadId": upload_id or ""}, body=body)
+
+    def _object_key(self, key: str) -> str:
+        return f"{self._prefix}/{key}" if self._prefix else key
+
+    def _request(
+        self,
+        method: str,
+        key: Optional[str],
+        params: Optional[Dict[str, str]] = None,
+        body: bytes = b"",
+        allow_missing: bool = False,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Any:
+        path = f"/{self._bucket}" + (f"/{self._object_key(key)}" if key is not None else "")
+        params = params or {}
+        headers = {**self._sign(method, path, params, body), **(headers or {})}
+        response = self._client.request(
+            method, f"{self._endpoint}{quote(path)}", params=params, content=body, headers=headers
+        )
+        if response.status_code >= 300 and not (allow_missing and response.status_code == 404):
+            raise OSError(
+                f"S3 {method} {path} failed: {response.status_code} {response.text[:200]}"
+            )
+        return response
+
+    def _sign(self, method: str, path: str, params: Dict[str, str], body: bytes) -> Dict[str, str]:
+        """AWS Signature Version 4 headers for a path-style request."""
+        now = datetime.now(timezone.utc)
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        date = amz_date[:8]
+        payload_hash = hashlib.sha256(body).hexdigest()
+        headers = {"host": self._host, "x-amz-content-sha256": payload_hash, "x-amz-date": amz_date}
+        canonical_query = "&".join(
+            f"{quote(name, safe='-_.~')}={quote(value, safe='-_.~')}"
+            for name, value in sorted(params.items())
+        )
+        signed_headers = ";".join(sorted(headers))
+        canonical_request = "\n".join(
+            [
+                method,
+                quote(path, safe="/-_.~"),
+                canonical_query,
+                "".join(f"{name}:{headers[name]}\n" for name in sorted(headers)),
+                signed_headers,
+                payload_hash,
+            ]
+        )
+        scope = f"{date}/{self._region}/s3/aws4_request"
+        string_to_sign = "\n".join(
+            [
+                "AWS4-HMAC-SHA256",
+                amz_date,
+                scope,
+                hashlib.sha256(canonical_request.encode()).hexdigest(),
+            ]
+        )
+        key = f"AWS4{self._secret_key}".encode("utf-8")
+        for part in (date, self._region, "s3", "aws4_request"):
+            key = hmac.new(key, part.encode("utf-8"), hashlib.sha256).digest()
+        signature = hmac.new(key, string_to_sign.encode("utf-8"), hashlib.sha256).hexdigest()
+        headers["authorization"] = (
+            f"AWS4-HMAC-SHA256 Credential={self._access_key}/{scope}, "
+            f"SignedHeaders={signed_headers}, Signature={signature}"
+        )
+        del headers["host"]
+        return headers
+
+
+class _DiskCache:
+    """Size-bounded LRU of immutable objects kept in a local directory."""
+
+    def __init__(self, directory: Path, max_bytes: int) -> None:
+        self._directory = directory
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+        try:
+            return self._path(key).read_bytes()
+        except FileNotFoundError:
+            self.discard(key)
+            return None
+
+    def put(self, key: str, data: bytes) -> None:
+        if len(data) > self._max_bytes:
+            return
+        self._path(key).write_bytes(data)
+        evicted = []
+        with self._lock:
+            self._size += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            while self._size > self._max_bytes:
+                old_key, size = self._entries.popitem(last=False)
+                self._size -= size
+                evicted.append(old_key)
+        for old_key in evicted:
+            self._path(old_key).unlink(missing_ok=True)
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._size -= self._entries.pop(key, 0)
+        self._path(key).unlink(missing_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self._directory / quote(key, safe="")
+
+
+def _cacheable(key: str) -> bool:
+    return not key.startswith("_meta/")
@@ -0,0 +1,113 @@
+"""In-memory cache of parsed manifests and their verification results."""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+
+CacheKey = Tuple[str, str]
+
+
+class CachedVerification(NamedTuple):
+    manifest: Dict[str, Any]
+    verified: bool
+    size: int
+    cached_at: float
+
+
+class ManifestCache:
+    """Least-recently-used cache bounded by the in-memory size of the cached manifests.
+
+    Entries are keyed by ``(manifest_id, key_id)`` so results computed under one signing
+    key are never served to a verifier using another. Manifests are never rewritten in
+    place but they are deleted: register :meth:`invalidate_many` as a delete listener on
+    the storage (see ``ManifestStorage.add_delete_listener``) to drop entries the same
+    process deletes, and set ``max_age_seconds`` to bound how long a manifest deleted by
+    another process (a retention job) can still be served.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 32 * 1024 * 1024,
+        max_age_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_bytes = max_bytes
+        self._max_age_seconds = max_age_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[CacheKey, CachedVerification]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, manifest_id: str, key_id: str) -> Optional[CachedVerification]:
+        key = (manifest_id, key_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry):
+                self._size -= self._entries.pop(key).size
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, manifest_id: str, key_id: str, manifest: Dict[str, Any], verified: bool) -> None:
+        size = _footprint(manifest)
+        if size > self._max_bytes:
+            return
+        entry = CachedVerification(manifest, verified, size, self._clock())
+        with self._lock:
+            previous = self._entries.pop((manifest_id, key_id), None)
+            if previous is not None:
+                self._size -= previous.size
+            self._entries[(manifest_id, key_id)] = entry
+            self._size += size
+            while self._size > self._max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+                self.evictions += 1
+
+    def invalidate(self, manifest_id: str) -> None:
+        self.invalidate_many([manifest_id])
+
+    def invalidate_many(self, manifest_ids: Iterable[str]) -> None:
+        dropped = set(manifest_ids)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] in dropped]:
+                self._size -= self._entries.pop(key).size
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self._max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def _expired(self, entry: CachedVerification) -> bool:
+        if self._max_age_seconds is None:
+            return False
+        return self._clock() - entry.cached_at > self._max_age_seconds
+
+
+def _footprint(value: Any) -> int:
+    """Approximate bytes held by a parsed JSON value (shared small objects count each time)."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_footprint(key) + _footprint(item) for key, item in value.items())
+    elif isinstance(value, list):
+        size += sum(_footprint(item) for item in value)
+    return size
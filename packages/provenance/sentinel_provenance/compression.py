@@ -0,0 +1,79 @@
+"""Dictionary-assisted zlib compression for provenance manifests."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import zlib
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional
+
+MAGIC = b"SMZ1"
+MAX_DICTIONARY_BYTES = 32 * 1024  # zlib only looks back across a 32 KiB window
+_FRAGMENT_BOUNDARY = re.compile(rb"(?<=[,{\[])")
+
+
+def encode_manifest(manifest: Dict[str, Any]) -> bytes:
+    return json.dumps(manifest, separators=(",", ":")).encode("utf-8")
+
+
+def train_dictionary(samples: Iterable[Dict[str, Any]], max_bytes: int = MAX_DICTIONARY_BYTES) -> bytes:
+    """Build a preset dictionary from representative manifests.
+
+    Manifests from one tenant or tool share keys and most values, so JSON fragments that
+    recur across samples are collected and ordered by usefulness. zlib favours matches
+    near the end of the dictionary, so the most valuable fragments are placed last,
+    followed by one whole sample as a structural template.
+    """
+    counts: Counter[bytes] = Counter()
+    template = b""
+    for sample in samples:
+        encoded = encode_manifest(sample)
+        template = encoded
+        counts.update(set(_FRAGMENT_BOUNDARY.split(encoded)))
+    if not template:
+        return b""
+    budget = max_bytes - min(len(template), max_bytes // 4)
+    fragments = sorted(
+        (fragment for fragment, count in counts.items() if count > 1 and len(fragment) > 3),
+        key=lambda fragment: counts[fragment] * len(fragment),
+        reverse=True,
+    )
+    chosen = []
+    for fragment in fragments:
+        if len(fragment) > budget:
+            continue
+        chosen.append(fragment)
+        budget -= len(fragment)
+    return (b"".join(reversed(chosen)) + template)[-max_bytes:]
+
+
+def dictionary_id(dictionary: bytes) -> str:
+    return hashlib.sha256(dictionary).hexdigest()[:16]
+
+
+def compress(raw: bytes, dictionary: Optional[bytes], dict_id: str = "", level: int = 6) -> bytes:
+    """Compress ``raw`` into the framed ``SMZ1`` format."""
+    if dictionary:
+        compressor = zlib.compressobj(level, zdict=dictionary)
+    else:
+        compressor = zlib.compressobj(level)
+    header = MAGIC + bytes([len(dict_id)]) + dict_id.encode("ascii")
+    return header + compressor.compress(raw) + compressor.flush()
+
+
+def frame_dictionary_id(data: bytes) -> str:
+    if not data.startswith(MAGIC):
+        raise ValueError("Not a compressed manifest")
+    length = data[len(MAGIC)]
+    return data[len(MAGIC) + 1 : len(MAGIC) + 1 + length].decode("ascii")
+
+
+def decompress(data: bytes, dictionary: Optional[bytes]) -> bytes:
+    offset = len(MAGIC) + 1 + data[len(MAGIC)]
+    if dictionary:
+        decompressor = zlib.decompressobj(zdict=dictionary)
+    else:
+        decompressor = zlib.decompressobj()
+    return decompressor.decompress(data[offset:]) + decompressor.flush()
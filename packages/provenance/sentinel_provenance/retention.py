@@ -0,0 +1,179 @@
+"""Retention and tiering for provenance stores."""
+
+from __future__ import annotations
+
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple
+from urllib.parse import quote
+
+from .signer import RETENTION_FLOOR_NAMESPACE, ProvenanceSigner
+from .storage import ARCHIVE_SEGMENT_NAMESPACE, ManifestStorage
+
+RETENTION_NAMESPACE = "retention"
+DAY_MS = 24 * 60 * 60 * 1000
+
+
+class RetentionPolicy(NamedTuple):
+    """How long a tenant's manifests stay hot and when they are deleted (``None`` = never)."""
+
+    hot_days: Optional[float] = None
+    delete_after_days: Optional[float] = None
+
+
+class RetentionEngine:
+    """Archives and expires manifests according to per-tenant policies.
+
+    Each :meth:`run` is one bounded step: it reads at most ``max_manifests`` hot manifests,
+    continuing from where the previous run stopped, and throttles itself to
+    ``max_bytes_per_second`` of manifest reads. Manifests past their tenant's hot window
+    are packed into compressed archive segments of up to ``segment_max_bytes``; manifests
+    and segments past ``delete_after_days`` are deleted. Deleting part of a chain records
+    a signed retention floor so chain verification starts above the deleted range.
+    """
+
+    def __init__(
+        self,
+        storage: ManifestStorage,
+        signer: ProvenanceSigner,
+        policies: Mapping[str, RetentionPolicy],
+        default_policy: RetentionPolicy = RetentionPolicy(),
+        max_manifests: int = 5_000,
+        max_bytes_per_second: Optional[int] = None,
+        segment_max_bytes: int = 4 * 1024 * 1024,
+        payload_grace_seconds: float = 3600.0,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._storage = storage
+        self._signer = signer
+        self._policies = policies
+        self._default_policy = default_policy
+        self._max_manifests = max_manifests
+        self._max_bytes_per_second = max_bytes_per_second
+        self._segment_max_bytes = segment_max_bytes
+        self._payload_grace_ms = int(payload_grace_seconds * 1000)
+        self._clock = clock
+        self._sleep = sleep
+
+    def policy_for(self, tenant: str) -> RetentionPolicy:
+        return self._policies.get(tenant, self._default_policy)
+
+    def run(self) -> Dict[str, Any]:
+        """Run one bounded retention step and return what it did."""
+        started = self._clock()
+        now_ms = int(started * 1000)
+        cursor = (self._storage.read_record(RETENTION_NAMESPACE, "cursor") or {}).get("after", "")
+        manifest_ids = sorted(
+            manifest_id for manifest_id in self._storage.iter_ids() if manifest_id > cursor
+        )
+        batch = manifest_ids[: self._max_manifests]
+        report: Dict[str, Any] = {
+            "scanned": 0,
+            "archived": 0,
+            "deleted": 0,
+            "segments_written": 0,
+            "segments_deleted": 0,
+            "payloads_collected": 0,
+            "bytes_read": 0,
+            "pass_complete": len(batch) == len(manifest_ids),
+        }
+        floors: Dict[str, Tuple[int, str, int]] = {}
+        expired: List[str] = []
+        pending: Dict[str, List[Tuple[str, int]]] = {}
+        pending_bytes: Dict[str, int] = {}
+
+        for manifest_id in batch:
+            try:
+                manifest, size = self._storage.read_stored(manifest_id)
+            except FileNotFoundError:
+                continue
+            report["scanned"] += 1
+            report["bytes_read"] += size
+            self._throttle(started, report["bytes_read"])
+            tenant = str(manifest.get("action", {}).get("tenant", "default"))
+            policy = self.policy_for(tenant)
+            age_ms = now_ms - int(manifest.get("timestamp", now_ms))
+            if _expired(policy.delete_after_days, age_ms):
+                expired.append(manifest_id)
+                _raise_floor(floors, manifest)
+            elif _expired(policy.hot_days, age_ms):
+                pending.setdefault(tenant, []).append((manifest_id, int(manifest["timestamp"])))
+                pending_bytes[tenant] = pending_bytes.get(tenant, 0) + size
+                if pending_bytes[tenant] >= self._segment_max_bytes:
+                    report["archived"] += self._write_segment(tenant, pending.pop(tenant), now_ms)
+                    report["segments_written"] += 1
+                    pending_bytes[tenant] = 0
+        for tenant, entries in pending.items():
+            report["archived"] += self._write_segment(tenant, entries, now_ms)
+            report["segments_written"] += 1
+
+        expired_segments = []
+        for segment_name in list(self._storage.iter_record_keys(ARCHIVE_SEGMENT_NAMESPACE)):
+            record = self._storage.read_record(ARCHIVE_SEGMENT_NAMESPACE, segment_name) or {}
+            policy = self.policy_for(record.get("tenant", "default"))
+            age_ms = now_ms - record.get("max_timestamp", now_ms)
+            if _expired(policy.delete_after_days, age_ms):
+                for _, manifest in self._storage.segment_manifests(segment_name):
+                    _raise_floor(floors, manifest)
+                expired_segments.append(segment_name)
+
+        # Floors go first: a crash before the deletes leaves extra manifests, not a gap.
+        self._write_floors(floors)
+        for manifest_id in expired:
+            self._storage.delete(manifest_id)
+            report["deleted"] += 1
+        for segment_name in expired_segments:
+            report["deleted"] += self._storage.delete_segment(segment_name)
+            report["segments_deleted"] += 1
+
+        next_cursor = "" if report["pass_complete"] else batch[-1]
+        self._storage.write_record(RETENTION_NAMESPACE, "cursor", {"after": next_cursor})
+        report["payloads_collected"] = self._storage.collect_payloads(
+            self._payload_grace_ms, now_ms
+        )
+        return report
+
+    def _write_segment(self, tenant: str, entries: List[Tuple[str, int]], now_ms: int) -> int:
+        timestamps = [timestamp for _, timestamp in entries]
+        segment_name = f"{quote(tenant, safe='')}/{now_ms}-{uuid.uuid4().hex[:8]}"
+        result = self._storage.archive(
+            segment_name,
+            [manifest_id for manifest_id, _ in entries],
+            metadata={
+                "tenant": tenant,
+                "min_timestamp": min(timestamps),
+                "max_timestamp": max(timestamps),
+            },
+        )
+        return len(result["manifest_ids"])
+
+    def _write_floors(self, floors: Dict[str, Tuple[int, str, int]]) -> None:
+        for chain_key, (seq, manifest_id, timestamp) in floors.items():
+            current = self._storage.read_record(RETENTION_FLOOR_NAMESPACE, chain_key)
+            if current is not None and current["seq"] >= seq:
+                continue
+            floor = self._signer.sign_checkpoint(
+                chain_key, {"seq": seq, "manifest_id": manifest_id, "timestamp": timestamp}
+            )
+            self._storage.write_record(RETENTION_FLOOR_NAMESPACE, chain_key, floor)
+
+    def _throttle(self, started: float, bytes_read: int) -> None:
+        if not self._max_bytes_per_second:
+            return
+        ahead = bytes_read / self._max_bytes_per_second - (self._clock() - started)
+        if ahead > 0:
+            self._sleep(ahead)
+
+
+def _expired(days: Optional[float], age_ms: int) -> bool:
+    return days is not None and age_ms >= days * DAY_MS
+
+
+def _raise_floor(floors: Dict[str, Tuple[int, str, int]], manifest: Dict[str, Any]) -> None:
+    chain = manifest.get("chain")
+    if not chain:
+        return
+    current = floors.get(chain["tenant"])
+    if current is None or chain["seq"] > current[0]:
+        floors[chain["tenant"]] = (chain["seq"], manifest["signature"], manifest["timestamp"])
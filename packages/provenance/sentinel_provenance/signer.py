@@ -3,32 +3,185 @@
 from __future__ import annotations
 
 import hashlib
+import threading
 import time
-from typing import Any, Dict
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from urllib.parse import quote
 
-from .storage import ManifestStorage
+from .storage import ManifestStorage, StoredManifest
+from .writer import GroupCommitWriter
+
+CHAIN_NAMESPACE = "chains"
+CHECKPOINT_NAMESPACE = "checkpoints"
+RETENTION_FLOOR_NAMESPACE = "retention_floors"
+
+WriteListener = Callable[[str, Dict[str, Any], StoredManifest], None]
 
 
 class ProvenanceSigner:
-    """Produces signed manifests to describe agent tool actions."""
+    """Produces signed manifests to describe agent tool actions.
+
+    Manifests are hash-chained per tenant: each one records its sequence number and the
+    id of the previous manifest, and both are covered by the signature. Every
+    ``checkpoint_interval`` manifests a signed checkpoint of the chain head is written so
+    verifiers can resume from it. The chain head is cached in memory, so each chain must
+    have a single signer instance writing to it; signers sharing one store (replicas on
+    the same object storage) pass a distinct ``chain_id`` so each keeps its own chains,
+    named ``<tenant>@<chain_id>``. ``on_write`` is called with the manifest id, manifest
+    and stored location after each manifest is written.
 
-    def __init__(self, storage: ManifestStorage, signing_key: str) -> None:
+    With a :class:`GroupCommitWriter`, writes happen on the writer thread; in ``durable``
+    mode ``sign_action`` returns once the manifest's batch is committed, in ``fast`` mode
+    as soon as it is queued. The cached head moves on when a manifest is queued so the
+    next one can chain onto it; if the write fails, the chain is rolled back to the head
+    in storage before the next manifest is signed.
+    """
+
+    def __init__(
+        self,
+        storage: ManifestStorage,
+        signing_key: str,
+        checkpoint_interval: int = 1000,
+        on_write: Optional[WriteListener] = None,
+        writer: Optional[GroupCommitWriter] = None,
+        chain_id: Optional[str] = None,
+    ) -> None:
         self._storage = storage
         self._signing_key = signing_key
+        self._checkpoint_interval = checkpoint_interval
+        self._on_write = on_write
+        self._writer = writer
+        self._chain_id = chain_id
+        self._key_id = hashlib.sha256(f"key-id|{signing_key}".encode("utf-8")).hexdigest()[:16]
+        self._heads: Dict[str, Dict[str, Any]] = {}
+        self._epochs: Dict[str, int] = {}  # bumped on every rollback of a chain
+        self._rollbacks: Deque[Tuple[str, int]] = deque()
+        self._lock = threading.Lock()
 
-    def sign_action(self, action: Dict[str, Any]) -> Dict[str, Any]:
-        """Attach a pseudo-signature to an action manifest."""
-        timestamp = int(time.time() * 1000)
-        manifest = {
-            "action": action,
-            "timestamp": timestamp,
-            "signature": self._hash_payload(action, timestamp),
-            "signing_key_hint": self._signing_key[:8],
-        }
-        manifest_id = manifest["signature"]
-        self._storage.write(manifest_id, manifest)
+    def sign_action(
+        self, action: Dict[str, Any], attachment_ref: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Attach a pseudo-signature to an action manifest and link it into the chain.
+
+        ``attachment_ref`` names an attachment already stored with
+        :meth:`ManifestStorage.add_attachment`; the action should describe it (for instance
+        by its digest) so the signature covers the attached bytes.
+        """
+        chain_key = str(action.get("tenant", "default"))
+        if self._chain_id:
+            chain_key = f"{chain_key}@{self._chain_id}"
+        with self._lock:
+            self._apply_rollbacks()
+            head = self._chain_head(chain_key)
+            timestamp = int(time.time() * 1000)
+            chain = {"tenant": chain_key, "seq": head["seq"] + 1, "prev": head["manifest_id"]}
+            manifest: Dict[str, Any] = {
+                "action": action,
+                "timestamp": timestamp,
+                "chain": chain,
+                "signature": self._hash_payload(action, timestamp, chain),
+                "signing_key_hint": self._signing_key[:8],
+            }
+            if attachment_ref is not None:
+                manifest["attachment_ref"] = attachment_ref
+            manifest_id: str = manifest["signature"]
+            head = {"seq": chain["seq"], "manifest_id": manifest_id, "timestamp": timestamp}
+            records: List[Tuple[str, str, Dict[str, Any]]] = [(CHAIN_NAMESPACE, chain_key, head)]
+            if head["seq"] % self._checkpoint_interval == 0:
+                checkpoint = self.sign_checkpoint(chain_key, head)
+                records.append((checkpoint_namespace(chain_key), f"{head['seq']:012d}", checkpoint))
+            if self._writer is not None:
+                future = self._writer.submit(manifest_id, manifest, records)
+                future.add_done_callback(
+                    self._written(chain_key, self._epochs.get(chain_key, 0), manifest_id, manifest)
+                )
+            else:
+                stored = self._storage.write(manifest_id, manifest)
+                for namespace, key, record in records:
+                    self._storage.write_record(namespace, key, record)
+            self._heads[chain_key] = head
+        if self._writer is None:
+            if self._on_write is not None:
+                self._on_write(manifest_id, manifest, stored)
+            return manifest
+        if self._writer.mode == "durable":
+            future.result()
         return manifest
 
-    def _hash_payload(self, action: Dict[str, Any], timestamp: int) -> str:
+    @property
+    def key_id(self) -> str:
+        """Stable fingerprint of the signing key, safe to use in cache keys and logs."""
+        return self._key_id
+
+    def sign_checkpoint(self, tenant: str, head: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a signed checkpoint for the given chain head."""
+        checkpoint = {
+            "tenant": tenant,
+            "seq": head["seq"],
+            "manifest_id": head["manifest_id"],
+            "timestamp": head["timestamp"],
+        }
+        checkpoint["signature"] = self._hash_checkpoint(checkpoint)
+        return checkpoint
+
+    def verify_checkpoint(self, checkpoint: Dict[str, Any]) -> bool:
+        try:
+            return bool(checkpoint.get("signature") == self._hash_checkpoint(checkpoint))
+        except KeyError:
+            return False
+
+    def _chain_head(self, tenant: str) -> Dict[str, Any]:
+        head = self._heads.get(tenant)
+        if head is None:
+            head = self._storage.read_record(CHAIN_NAMESPACE, tenant) or {
+                "seq": 0,
+                "manifest_id": None,
+                "timestamp": 0,
+            }
+            self._heads[tenant] = head
+        return head
+
+    def _written(
+        self, chain_key: str, epoch: int, manifest_id: str, manifest: Dict[str, Any]
+    ) -> Callable[["Future[StoredManifest]"], None]:
+        # Runs on the writer thread, which must not wait for ``_lock`` (a signer holding
+        # it may be blocked on the writer's full queue), so rollbacks are only queued here.
+        def written(future: "Future[StoredManifest]") -> None:
+            if future.exception() is not None:
+                self._rollbacks.append((chain_key, epoch))
+            elif self._on_write is not None:
+                self._on_write(manifest_id, manifest, future.result())
+
+        return written
+
+    def _apply_rollbacks(self) -> None:
+        """Drop cached heads of chains whose queued manifests failed to commit."""
+        while self._rollbacks:
+            chain_key, epoch = self._rollbacks.popleft()
+            if self._epochs.get(chain_key, 0) == epoch:  # later failures of the same branch
+                self._heads.pop(chain_key, None)
+                self._epochs[chain_key] = epoch + 1
+
+    def _hash_payload(
+        self, action: Dict[str, Any], timestamp: int, chain: Optional[Dict[str, Any]] = None
+    ) -> str:
         payload = f"{action}|{timestamp}|{self._signing_key}"
+        if chain is not None:
+            payload = (
+                f"{action}|{timestamp}|{chain['tenant']}|{chain['seq']}|{chain['prev']}"
+                f"|{self._signing_key}"
+            )
         return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _hash_checkpoint(self, checkpoint: Dict[str, Any]) -> str:
+        payload = (
+            f"checkpoint|{checkpoint['tenant']}|{checkpoint['seq']}|{checkpoint['manifest_id']}"
+            f"|{checkpoint['timestamp']}|{self._signing_key}"
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def checkpoint_namespace(tenant: str) -> str:
+    return f"{CHECKPOINT_NAMESPACE}/{quote(tenant, safe='')}"
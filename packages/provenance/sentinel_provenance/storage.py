@@ -2,25 +2,607 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+import zlib
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import quote, unquote
+
+from . import compression as codec
+from .backends import LocalBackend, StorageBackend
+
+RECORD_ROOT = "_meta"
+DICTIONARY_ROOT = "_dicts"
+DICTIONARY_NAMESPACE = "dictionaries"
+PAYLOAD_ROOT = "_payloads"
+PAYLOAD_NAMESPACE = "payload_refs"
+PAYLOAD_RELEASE_NAMESPACE = "payload_releases"
+PAYLOAD_MARK_NAMESPACE = "payload_marks"
+ATTACHMENT_ROOT = "_attachments"
+ATTACHMENT_NAMESPACE = "attachment_refs"
+ATTACHMENT_RELEASE_NAMESPACE = "attachment_releases"
+ATTACHMENT_MARK_NAMESPACE = "attachment_marks"
+ARCHIVE_ROOT = "_archive"
+ARCHIVE_INDEX_NAMESPACE = "archive_index"
+ARCHIVE_SEGMENT_NAMESPACE = "archive_segments"
+ARCHIVE_SHARD_CHARS = 3
+PLAIN_SUFFIX = ".json"
+COMPRESSED_SUFFIX = ".json.z"
+DICTIONARY_SCOPES = ("tenant", "tool")
+WRITER_SEPARATOR = "~"  # count record keys are <digest>~<writer id>
+
+logger = logging.getLogger(__name__)
+
+
+DeleteListener = Callable[[Sequence[str]], None]
+# Raised reading a manifest whose bytes are damaged (bad JSON, framing or zlib stream).
+UNREADABLE_ERRORS = (OSError, ValueError, IndexError, zlib.error)
+
+
+class StoredManifest(NamedTuple):
+    location: str
+    size: int
+
+
+class ManifestRead(NamedTuple):
+    manifest_id: str
+    manifest: Optional[Dict[str, Any]]
+    error: Optional[str]  # "missing" or "unreadable" when ``manifest`` is None
+
+
+class _BlobKind(NamedTuple):
+    root: str
+    namespace: str
+    release_namespace: str
+    mark_namespace: str
+
+
+_PAYLOADS = _BlobKind(
+    PAYLOAD_ROOT, PAYLOAD_NAMESPACE, PAYLOAD_RELEASE_NAMESPACE, PAYLOAD_MARK_NAMESPACE
+)
+_ATTACHMENTS = _BlobKind(
+    ATTACHMENT_ROOT, ATTACHMENT_NAMESPACE, ATTACHMENT_RELEASE_NAMESPACE, ATTACHMENT_MARK_NAMESPACE
+)
+
+
+class _BlobCount:
+    """References and releases of one blob, summed over every writer's count records."""
+
+    __slots__ = ("refs", "released", "size", "raw_size", "records")
+
+    def __init__(self) -> None:
+        self.refs = 0
+        self.released = 0
+        self.size = 0
+        self.raw_size = 0
+        self.records: List[Tuple[str, str]] = []  # (namespace, key) of each count record
 
 
 class ManifestStorage:
-    """Stores provenance manifests locally (placeholder for object storage)."""
+    """Stores provenance manifests on a pluggable backend.
+
+    Manifests live on the local filesystem below ``base_path`` unless a ``backend`` such
+    as :class:`~sentinel_provenance.backends.S3Backend` is given. With
+    ``compression="zlib"`` manifests are written as framed, zlib-compressed compact JSON.
+    ``dictionary_scope`` selects a trained preset dictionary per tenant or per tool when
+    one exists (see :meth:`train_dictionary`). Reads detect the format from the stored
+    bytes, so plain and compressed manifests can coexist in one store.
 
-    def __init__(self, base_path: Path) -> None:
-        self._base_path = base_path
-        self._base_path.mkdir(parents=True, exist_ok=True)
+    With ``dedup_payloads`` an action payload of at least ``dedup_min_bytes`` is stored
+    once as a content-addressed blob; the manifest keeps ``payload: null`` in its place
+    plus a top-level ``payload_ref`` digest, and reads put the payload back in the same
+    position so signatures still match. Each storage instance keeps its own reference
+    and release counts per blob (``<digest>~<writer id>`` records) and only ever rewrites
+    those, so writers in other processes or replicas sharing the backend never overwrite
+    each other's counts; :meth:`collect_payloads` sums every writer's records and removes
+    blobs whose releases have matched their references for a grace period. Counts can
+    only over-count (for instance when a journal is replayed after a crash), which leaks
+    a blob, never loses one.
 
-    def write(self, manifest_id: str, manifest: Dict[str, Any]) -> Path:
-        path = self._base_path / f"{manifest_id}.json"
-        path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
-        return path
+    :meth:`add_attachment` stores a raw, streamed payload as a content-addressed
+    attachment referenced by a manifest's top-level ``attachment_ref``; attachments are
+    reference-counted and collected the same way.
+
+    :meth:`archive` packs manifests into compressed, append-only archive segments
+    indexed by manifest id; reads fall back to the archive when a manifest is no longer
+    in the hot store.
+
+    Listeners added with :meth:`add_delete_listener` are called with the ids of manifests
+    this instance deletes, so in-process caches can drop them.
+    """
+
+    def __init__(
+        self,
+        base_path: Optional[Path] = None,
+        compression: Optional[str] = None,
+        dictionary_scope: Optional[str] = None,
+        compression_level: int = 6,
+        backend: Optional[StorageBackend] = None,
+        dedup_payloads: bool = False,
+        dedup_min_bytes: int = 1024,
+    ) -> None:
+        if compression not in (None, "zlib"):
+            raise ValueError(f"Unsupported manifest compression '{compression}'")
+        if dictionary_scope not in (None, *DICTIONARY_SCOPES):
+            raise ValueError(f"Unsupported dictionary scope '{dictionary_scope}'")
+        if backend is None:
+            if base_path is None:
+                raise ValueError("ManifestStorage needs a base_path or a backend")
+            backend = LocalBackend(base_path)
+        self._backend = backend
+        self._compression = compression
+        self._dictionary_scope = dictionary_scope
+        self._compression_level = compression_level
+        self._dictionaries: Dict[str, bytes] = {}
+        self._scope_dictionaries: Dict[str, Optional[str]] = {}
+        self._dedup_payloads = dedup_payloads
+        self._dedup_min_bytes = dedup_min_bytes
+        self._payload_lock = threading.Lock()  # guards this instance's own count records
+        self._writer_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._delete_listeners: List[DeleteListener] = []
+
+    def add_delete_listener(self, listener: DeleteListener) -> None:
+        self._delete_listeners.append(listener)
+
+    def write(self, manifest_id: str, manifest: Dict[str, Any]) -> StoredManifest:
+        return self.write_many([(manifest_id, manifest)])[0]
+
+    def write_many(self, entries: Sequence[Tuple[str, Dict[str, Any]]]) -> List[StoredManifest]:
+        """Write a batch of manifests with one backend call (concurrent uploads on S3)."""
+        items = []
+        references: Dict[str, int] = {}
+        payloads: Dict[str, bytes] = {}
+        for manifest_id, manifest in entries:
+            if self._dedup_payloads:
+                manifest, digest, payload = self._externalize_payload(manifest)
+                if digest is not None:
+                    references[digest] = references.get(digest, 0) + 1
+                    payloads[digest] = payload
+            items.append(self._encode(manifest_id, manifest))
+        if references:
+            self._add_payload_references(references, payloads)
+        locations = self._backend.put_many(items)
+        return [StoredManifest(location, len(data)) for location, (_, data) in zip(locations, items)]
 
     def read(self, manifest_id: str) -> Dict[str, Any]:
-        path = self._base_path / f"{manifest_id}.json"
-        if not path.exists():
+        return self._restore_payload(self.read_stored(manifest_id)[0])[0]
+
+    def read_stored(self, manifest_id: str) -> Tuple[Dict[str, Any], int]:
+        """Read a manifest as stored, without restoring a deduplicated payload."""
+        data = self._locate_any(manifest_id)
+        if data is None:
+            raise FileNotFoundError(f"Manifest {manifest_id} not found")
+        return self._decode(data), len(data)
+
+    def read_many(self, manifest_ids: Iterable[str]) -> Iterator[ManifestRead]:
+        """Read several manifests in one pass.
+
+        A missing manifest yields ``error="missing"`` and one that cannot be read or decoded
+        yields ``error="unreadable"`` (and is logged) instead of raising, so a single bad
+        entry does not abort the rest of the batch.
+        """
+        for manifest_id in manifest_ids:
+            try:
+                data = self._locate_any(manifest_id)
+                if data is None:
+                    yield ManifestRead(manifest_id, None, "missing")
+                    continue
+                manifest = self._restore_payload(self._decode(data))[0]
+            except FileNotFoundError:
+                yield ManifestRead(manifest_id, None, "missing")
+            except UNREADABLE_ERRORS:
+                logger.warning("Could not read manifest %s", manifest_id, exc_info=True)
+                yield ManifestRead(manifest_id, None, "unreadable")
+            else:
+                yield ManifestRead(manifest_id, manifest, None)
+
+    def iter_ids(self) -> Iterator[str]:
+        """Yield ids of manifests in the hot store without loading the manifests."""
+        for key in self._backend.list_keys():
+            if key.endswith(COMPRESSED_SUFFIX):
+                yield key[: -len(COMPRESSED_SUFFIX)]
+            elif key.endswith(PLAIN_SUFFIX):
+                yield key[: -len(PLAIN_SUFFIX)]
+
+    def iter_archived_ids(self) -> Iterator[str]:
+        """Yield ids of archived manifests from the archive index."""
+        for shard in self.iter_record_keys(ARCHIVE_INDEX_NAMESPACE):
+            yield from sorted(self.read_record(ARCHIVE_INDEX_NAMESPACE, shard) or {})
+
+    def stored_size(self, manifest_id: str) -> int:
+        return self.read_stored(manifest_id)[1]
+
+    def delete(self, manifest_id: str) -> None:
+        """Remove a manifest from the hot store and release its payload blob reference."""
+        located = self._locate(manifest_id)
+        if located is None:
             raise FileNotFoundError(f"Manifest {manifest_id} not found")
-        return json.loads(path.read_text(encoding="utf-8"))
+        key, data = located
+        manifest = self._decode(data)
+        self._backend.delete(key)
+        self._release_blobs([manifest])
+        self._notify_deleted([manifest_id])
+
+    def archive(
+        self,
+        segment_name: str,
+        manifest_ids: Sequence[str],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Move hot manifests into one compressed archive segment.
+
+        The segment is written and indexed before the hot copies are deleted, so a crash
+        at any point leaves every manifest readable (at worst twice). ``metadata`` is kept
+        in the segment record. Returns the ids that were archived and the segment size.
+        """
+        chunks: List[bytes] = []
+        archived: List[str] = []
+        hot_keys: List[str] = []
+        offset = 0
+        segment_key = f"{ARCHIVE_ROOT}/{segment_name}.seg"
+        index_updates: Dict[str, Dict[str, List[Any]]] = {}
+        for manifest_id in manifest_ids:
+            located = self._locate(manifest_id)
+            if located is None:
+                continue
+            key, data = located
+            if not data.startswith(codec.MAGIC):
+                data = self._compress(self._decode(data))
+            shard_updates = index_updates.setdefault(_archive_shard(manifest_id), {})
+            shard_updates[manifest_id] = [segment_name, offset, len(data)]
+            chunks.append(data)
+            archived.append(manifest_id)
+            hot_keys.append(key)
+            offset += len(data)
+        if not archived:
+            return {"manifest_ids": [], "bytes": 0}
+        self._backend.put(segment_key, b"".join(chunks))
+        self.write_record(
+            ARCHIVE_SEGMENT_NAMESPACE,
+            segment_name,
+            {**(metadata or {}), "manifest_ids": archived, "bytes": offset},
+        )
+        for shard, updates in index_updates.items():
+            entries = self.read_record(ARCHIVE_INDEX_NAMESPACE, shard) or {}
+            entries.update(updates)
+            self.write_record(ARCHIVE_INDEX_NAMESPACE, shard, entries)
+        for key in hot_keys:
+            self._backend.delete(key)
+        return {"manifest_ids": archived, "bytes": offset}
+
+    def segment_manifests(self, segment_name: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield the manifests an archive segment still owns, without restoring payloads."""
+        record = self.read_record(ARCHIVE_SEGMENT_NAMESPACE, segment_name)
+        if record is None:
+            return
+        data = self._backend.get(f"{ARCHIVE_ROOT}/{segment_name}.seg")
+        for manifest_id, (offset, length) in self._segment_entries(segment_name, record).items():
+            yield manifest_id, self._decode(data[offset : offset + length])
+
+    def delete_segment(self, segment_name: str) -> int:
+        """Delete an archive segment, its index entries and its payload references."""
+        record = self.read_record(ARCHIVE_SEGMENT_NAMESPACE, segment_name)
+        if record is None:
+            return 0
+        owned = dict(self.segment_manifests(segment_name))
+        shards: Dict[str, List[str]] = {}
+        for manifest_id in owned:
+            shards.setdefault(_archive_shard(manifest_id), []).append(manifest_id)
+        for shard, manifest_ids in shards.items():
+            entries = self.read_record(ARCHIVE_INDEX_NAMESPACE, shard) or {}
+            for manifest_id in manifest_ids:
+                entries.pop(manifest_id, None)
+            if entries:
+                self.write_record(ARCHIVE_INDEX_NAMESPACE, shard, entries)
+            else:
+                self.delete_record(ARCHIVE_INDEX_NAMESPACE, shard)
+        self._release_blobs(owned.values())
+        self._backend.delete(f"{ARCHIVE_ROOT}/{segment_name}.seg")
+        self.delete_record(ARCHIVE_SEGMENT_NAMESPACE, segment_name)
+        self._notify_deleted(list(owned))
+        return len(owned)
+
+    def collect_payloads(self, grace_ms: int = 3_600_000, now_ms: Optional[int] = None) -> int:
+        """Delete payload and attachment blobs unreferenced for at least ``grace_ms``.
+
+        The first pass that sees a blob fully released only marks it; a later pass deletes
+        it if no writer has added a reference in between. Returns the blobs deleted.
+        """
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        deleted = 0
+        with self._payload_lock:
+            for kind in (_PAYLOADS, _ATTACHMENTS):
+                for digest, count in self._blob_counts(kind).items():
+                    if not count.released:
+                        continue
+                    mark = self.read_record(kind.mark_namespace, digest)
+                    if count.released < count.refs:
+                        if mark is not None:
+                            self.delete_record(kind.mark_namespace, digest)
+                        continue
+                    if mark is None or mark["refs_seen"] != count.refs:
+                        mark = {"unreferenced_since": now_ms, "refs_seen": count.refs}
+                        self.write_record(kind.mark_namespace, digest, mark)
+                        continue
+                    if now_ms - mark["unreferenced_since"] < grace_ms:
+                        continue
+                    self._backend.delete(f"{kind.root}/{digest}")
+                    for namespace, key in count.records:
+                        self.delete_record(namespace, key)
+                    self.delete_record(kind.mark_namespace, digest)
+                    deleted += 1
+        return deleted
+
+    def add_attachment(self, digest: str, source: Path) -> int:
+        """Store the file at ``source`` as the attachment ``digest`` and count a reference.
+
+        ``digest`` must be the SHA-256 of the file, computed by the caller while it was
+        written. The file is moved into the store when possible, so callers should treat
+        it as consumed. Returns the attachment size in bytes.
+        """
+        key = self._count_key(digest)
+        with self._payload_lock:
+            record = self.read_record(ATTACHMENT_NAMESPACE, key)
+            if record is None:  # this writer's first reference; another may have stored it
+                size = source.stat().st_size
+                if not size or not self._blob_stored(f"{ATTACHMENT_ROOT}/{digest}"):
+                    self._backend.put_file(f"{ATTACHMENT_ROOT}/{digest}", source)
+                record = {"refs": 0, "size": size, "raw_size": size}
+            record["refs"] += 1
+            self.write_record(ATTACHMENT_NAMESPACE, key, record)
+        return int(record["size"])
+
+    def read_attachment(self, digest: str) -> bytes:
+        return self._backend.get(f"{ATTACHMENT_ROOT}/{digest}")
+
+    def payload_stats(self) -> Dict[str, Any]:
+        """Summarise payload deduplication: logical versus stored payload bytes."""
+        blobs = references = logical = stored = 0
+        for count in self._blob_counts(_PAYLOADS).values():
+            if not count.size:  # releases without any reference record left
+                continue
+            refs = max(count.refs - count.released, 0)
+            blobs += 1
+            references += refs
+            logical += refs * count.raw_size
+            stored += count.size
+        return {
+            "blobs": blobs,
+            "references": references,
+            "logical_bytes": logical,
+            "stored_bytes": stored,
+            "dedup_ratio": round(logical / stored, 2) if stored else None,
+        }
+
+    def recompress(self, manifest_id: str) -> Tuple[int, int]:
+        """Rewrite a manifest with the current compression settings.
+
+        Returns the stored size before and after. The old object is removed only once the
+        new one is in place.
+        """
+        located = self._locate(manifest_id)
+        if located is None:
+            raise FileNotFoundError(f"Manifest {manifest_id} not found")
+        old_key, data = located
+        new_key, new_data = self._encode(manifest_id, self._decode(data))
+        self._backend.put(new_key, new_data)
+        if new_key != old_key:
+            self._backend.delete(old_key)
+        return len(data), len(new_data)
+
+    def train_dictionary(self, scope_key: str, samples: Iterable[Dict[str, Any]]) -> Optional[str]:
+        """Train and activate a compression dictionary for a tenant or tool scope key.
+
+        Scope keys come from :meth:`dictionary_scope_key`. Returns the dictionary id, or
+        ``None`` when there were no samples. Manifests written with an older dictionary
+        stay readable because dictionaries are never deleted.
+        """
+        dictionary = codec.train_dictionary(samples)
+        if not dictionary:
+            return None
+        dict_id = codec.dictionary_id(dictionary)
+        self._backend.put(f"{DICTIONARY_ROOT}/{dict_id}.zdict", dictionary)
+        self._dictionaries[dict_id] = dictionary
+        self.write_record(DICTIONARY_NAMESPACE, scope_key, {"dict_id": dict_id})
+        self._scope_dictionaries[scope_key] = dict_id
+        return dict_id
+
+    def dictionary_scope_key(self, manifest: Dict[str, Any]) -> Optional[str]:
+        if self._dictionary_scope is None:
+            return None
+        action = manifest.get("action", {})
+        if self._dictionary_scope == "tenant":
+            return f"tenant:{action.get('tenant')}"
+        return f"tool:{action.get('tenant')}/{action.get('tool')}"
+
+    def write_record(self, namespace: str, key: str, record: Dict[str, Any]) -> None:
+        """Atomically replace a small metadata record (chain heads, checkpoints, state)."""
+        self._backend.put(self._record_key(namespace, key), json.dumps(record).encode("utf-8"))
+
+    def delete_record(self, namespace: str, key: str) -> None:
+        self._backend.delete(self._record_key(namespace, key))
+
+    def read_record(self, namespace: str, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            data = self._backend.get(self._record_key(namespace, key))
+        except FileNotFoundError:
+            return None
+        return json.loads(data)
+
+    def iter_record_keys(self, namespace: str) -> Iterator[str]:
+        """Yield record keys in a namespace in sorted order."""
+        prefix = f"{RECORD_ROOT}/{namespace}/"
+        names = sorted(
+            key[len(prefix) :] for key in self._backend.list_keys(prefix) if key.endswith(".json")
+        )
+        for name in names:
+            yield unquote(name[: -len(".json")])
+
+    def _locate_any(self, manifest_id: str) -> Optional[bytes]:
+        located = self._locate(manifest_id)
+        if located is not None:
+            return located[1]
+        shard = self.read_record(ARCHIVE_INDEX_NAMESPACE, _archive_shard(manifest_id)) or {}
+        entry = shard.get(manifest_id)
+        if entry is None:
+            return None
+        segment_name, offset, length = entry
+        return self._backend.get_range(f"{ARCHIVE_ROOT}/{segment_name}.seg", offset, length)
+
+    def _segment_entries(
+        self, segment_name: str, record: Dict[str, Any]
+    ) -> Dict[str, Tuple[int, int]]:
+        # Only entries the index still attributes to this segment; a manifest archived
+        # twice after a crash belongs to the newer segment.
+        entries: Dict[str, Tuple[int, int]] = {}
+        shards: Dict[str, Dict[str, Any]] = {}
+        for manifest_id in record["manifest_ids"]:
+            shard = _archive_shard(manifest_id)
+            if shard not in shards:
+                shards[shard] = self.read_record(ARCHIVE_INDEX_NAMESPACE, shard) or {}
+            entry = shards[shard].get(manifest_id)
+            if entry is not None and entry[0] == segment_name:
+                entries[manifest_id] = (entry[1], entry[2])
+        return entries
+
+    def _locate(self, manifest_id: str) -> Optional[Tuple[str, bytes]]:
+        for suffix in (COMPRESSED_SUFFIX, PLAIN_SUFFIX):
+            key = f"{manifest_id}{suffix}"
+            try:
+                return key, self._backend.get(key)
+            except FileNotFoundError:
+                continue
+        return None
+
+    def _encode(self, manifest_id: str, manifest: Dict[str, Any]) -> Tuple[str, bytes]:
+        if self._compression is None:
+            return f"{manifest_id}{PLAIN_SUFFIX}", json.dumps(manifest, indent=2).encode("utf-8")
+        return f"{manifest_id}{COMPRESSED_SUFFIX}", self._compress(manifest)
+
+    def _compress(self, manifest: Dict[str, Any]) -> bytes:
+        dict_id = self._scope_dictionary(self.dictionary_scope_key(manifest))
+        dictionary = self._dictionary(dict_id) if dict_id else None
+        return codec.compress(
+            codec.encode_manifest(manifest), dictionary, dict_id or "", self._compression_level
+        )
+
+    def _decode(self, data: bytes) -> Dict[str, Any]:
+        if data.startswith(codec.MAGIC):
+            dict_id = codec.frame_dictionary_id(data)
+            dictionary = self._dictionary(dict_id) if dict_id else None
+            data = codec.decompress(data, dictionary)
+        return json.loads(data)
+
+    def _externalize_payload(
+        self, manifest: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], Optional[str], bytes]:
+        action = manifest.get("action")
+        if not isinstance(action, dict) or action.get("payload") is None:
+            return manifest, None, b""
+        payload = json.dumps(action["payload"]).encode("utf-8")
+        if len(payload) < self._dedup_min_bytes:
+            return manifest, None, b""
+        digest = hashlib.sha256(payload).hexdigest()
+        stored = {**manifest, "action": {**action, "payload": None}, "payload_ref": digest}
+        return stored, digest, payload
+
+    def _restore_payload(self, manifest: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        digest = manifest.pop("payload_ref", None)
+        if digest is None:
+            return manifest, 0
+        data = self._backend.get(f"{PAYLOAD_ROOT}/{digest}")
+        raw = codec.decompress(data, None) if data.startswith(codec.MAGIC) else data
+        manifest["action"]["payload"] = json.loads(raw)
+        return manifest, len(data)
+
+    def _add_payload_references(self, references: Dict[str, int], payloads: Dict[str, bytes]) -> None:
+        # Blob before count: a crash in between leaves an orphan blob, never a dangling ref.
+        with self._payload_lock:
+            for digest, count in references.items():
+                key = self._count_key(digest)
+                record = self.read_record(PAYLOAD_NAMESPACE, key)
+                if record is None:  # this writer's first reference; another may have stored it
+                    payload = payloads[digest]
+                    data = payload
+                    if self._compression is not None:
+                        data = codec.compress(payload, None, "", self._compression_level)
+                    if not self._blob_stored(f"{PAYLOAD_ROOT}/{digest}"):
+                        self._backend.put(f"{PAYLOAD_ROOT}/{digest}", data)
+                    record = {"refs": 0, "size": len(data), "raw_size": len(payload)}
+                record["refs"] += count
+                self.write_record(PAYLOAD_NAMESPACE, key, record)
+
+    def _notify_deleted(self, manifest_ids: Sequence[str]) -> None:
+        for listener in self._delete_listeners:
+            listener(manifest_ids)
+
+    def _release_blobs(self, manifests: Iterable[Dict[str, Any]]) -> None:
+        releases: Dict[Tuple[_BlobKind, str], int] = {}
+        for manifest in manifests:
+            for kind, field in ((_PAYLOADS, "payload_ref"), (_ATTACHMENTS, "attachment_ref")):
+                digest = manifest.get(field)
+                if digest is not None:
+                    releases[(kind, digest)] = releases.get((kind, digest), 0) + 1
+        if not releases:
+            return
+        with self._payload_lock:
+            for (kind, digest), count in releases.items():
+                key = self._count_key(digest)
+                record = self.read_record(kind.release_namespace, key) or {"released": 0}
+                record["released"] += count
+                self.write_record(kind.release_namespace, key, record)
+
+    def _blob_stored(self, key: str) -> bool:
+        try:
+            self._backend.get_range(key, 0, 1)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _count_key(self, digest: str) -> str:
+        return f"{digest}{WRITER_SEPARATOR}{self._writer_id}"
+
+    def _blob_counts(self, kind: _BlobKind) -> Dict[str, _BlobCount]:
+        counts: Dict[str, _BlobCount] = {}
+        for namespace in (kind.namespace, kind.release_namespace):
+            for key in self.iter_record_keys(namespace):
+                record = self.read_record(namespace, key)
+                if record is None:
+                    continue
+                count = counts.setdefault(key.split(WRITER_SEPARATOR, 1)[0], _BlobCount())
+                count.records.append((namespace, key))
+                if namespace == kind.namespace:
+                    count.refs += record["refs"]
+                    count.size, count.raw_size = record["size"], record["raw_size"]
+                else:
+                    count.released += record["released"]
+        return counts
+
+    def _scope_dictionary(self, scope_key: Optional[str]) -> Optional[str]:
+        if scope_key is None:
+            return None
+        if scope_key not in self._scope_dictionaries:
+            record = self.read_record(DICTIONARY_NAMESPACE, scope_key)
+            self._scope_dictionaries[scope_key] = record["dict_id"] if record else None
+        return self._scope_dictionaries[scope_key]
+
+    def _dictionary(self, dict_id: str) -> bytes:
+        dictionary = self._dictionaries.get(dict_id)
+        if dictionary is None:
+            dictionary = self._backend.get(f"{DICTIONARY_ROOT}/{dict_id}.zdict")
+            self._dictionaries[dict_id] = dictionary
+        return dictionary
+
+    def _record_key(self, namespace: str, key: str) -> str:
+        return f"{RECORD_ROOT}/{namespace}/{quote(key, safe='')}.json"
+
+
+def _archive_shard(manifest_id: str) -> str:
+    return manifest_id[:ARCHIVE_SHARD_CHARS]
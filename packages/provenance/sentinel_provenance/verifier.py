@@ -2,23 +2,253 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict
+import itertools
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set
 
-from .signer import ProvenanceSigner
-from .storage import ManifestStorage
+from .cache import ManifestCache
+from .signer import (
+    CHAIN_NAMESPACE,
+    RETENTION_FLOOR_NAMESPACE,
+    ProvenanceSigner,
+    checkpoint_namespace,
+)
+from .storage import UNREADABLE_ERRORS, ManifestStorage
+
+ManifestSelector = Callable[[Dict[str, Any]], bool]
+VERIFIED_NAMESPACE = "verified"
 
 
 class ProvenanceVerifier:
-    """Verifies stored manifests using the signer hashing routine."""
+    """Verifies stored manifests using the signer hashing routine.
+
+    With a :class:`ManifestCache`, :meth:`verify` serves repeat lookups from memory. The
+    batch and chain audits always read storage.
+    """
 
-    def __init__(self, storage: ManifestStorage, signer: ProvenanceSigner) -> None:
+    def __init__(
+        self,
+        storage: ManifestStorage,
+        signer: ProvenanceSigner,
+        cache: Optional[ManifestCache] = None,
+    ) -> None:
         self._storage = storage
         self._signer = signer
+        self._cache = cache
 
     def verify(self, manifest_id: str) -> Dict[str, Any]:
-        manifest = self._storage.read(manifest_id)
+        if self._cache is None:
+            manifest = self._storage.read(manifest_id)
+            manifest["verified"] = self._check(manifest)
+            return manifest
+        key_id = self._signer.key_id
+        cached = self._cache.get(manifest_id, key_id)
+        if cached is None:
+            manifest = self._storage.read(manifest_id)
+            verified = self._check(manifest)
+            self._cache.put(manifest_id, key_id, manifest, verified)
+        else:
+            manifest, verified = cached.manifest, cached.verified
+        return {**manifest, "verified": verified}
+
+    def verify_many(
+        self,
+        manifest_ids: Optional[Iterable[str]] = None,
+        *,
+        workers: int = 4,
+        batch_size: int = 64,
+        selector: Optional[ManifestSelector] = None,
+        skip_missing: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """Verify manifests in parallel, yielding compact results as batches complete.
+
+        Ids are consumed lazily and at most ``workers * 2`` batches are in flight, so
+        memory stays bounded regardless of how many ids the iterable produces. Without
+        ``manifest_ids`` the whole store, archive included, is scanned. Manifests rejected by
+        ``selector`` are skipped without producing a result, as are ids with no manifest
+        when ``skip_missing`` is set (ids taken from an index that outlives deletions).
+        """
+        if manifest_ids is None:
+            manifest_ids = itertools.chain(
+                self._storage.iter_ids(), self._storage.iter_archived_ids()
+            )
+        ids = iter(manifest_ids)
+        max_in_flight = workers * 2
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="provenance-verify") as pool:
+            pending: Set[Future[List[Dict[str, Any]]]] = set()
+            exhausted = False
+            while pending or not exhausted:
+                while not exhausted and len(pending) < max_in_flight:
+                    batch = list(itertools.islice(ids, batch_size))
+                    if not batch:
+                        exhausted = True
+                        break
+                    pending.add(pool.submit(self._verify_batch, batch, selector, skip_missing))
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+
+    def verify_chain(self, tenant: str, *, full: bool = False) -> Dict[str, Any]:
+        """Walk a tenant's chain from its head back to the last verified checkpoint.
+
+        Each manifest's signature, sequence number and back-link are checked, along with
+        every signed checkpoint in the walked range, so deleted, reordered or truncated
+        manifests are detected. On success the newest checkpoint becomes the resume point,
+        which keeps the cost of incremental runs proportional to the manifests added since.
+        Manifests below a signed retention floor were deleted by policy and are not walked,
+        even with ``full``.
+        """
+        report: Dict[str, Any] = {
+            "tenant": tenant,
+            "head_seq": 0,
+            "resumed_from_seq": 0,
+            "checked": 0,
+            "verified": True,
+            "errors": [],
+        }
+        head = self._storage.read_record(CHAIN_NAMESPACE, tenant)
+        if head is None:
+            return report
+        anchor = None if full else self._resume_anchor(tenant)
+        floor = self._retention_floor(tenant)
+        if floor is not None and (anchor is None or floor["seq"] > anchor["seq"]):
+            anchor = floor
+        stop_seq = anchor["seq"] if anchor else 0
+        checkpoints = self._checkpoints_after(tenant, stop_seq)
+        errors: List[str] = report["errors"]
+        report["head_seq"] = head["seq"]
+        report["resumed_from_seq"] = stop_seq
+
+        for seq, checkpoint in checkpoints.items():
+            if not self._signer.verify_checkpoint(checkpoint):
+                errors.append(f"checkpoint {seq} has an invalid signature")
+            elif seq > head["seq"]:
+                errors.append(f"chain head {head['seq']} is behind signed checkpoint {seq}")
+
+        manifest_id: Optional[str] = head["manifest_id"]
+        seq = head["seq"]
+        while seq > stop_seq:
+            try:
+                manifest = self._storage.read(manifest_id or "")
+            except FileNotFoundError:
+                errors.append(f"seq {seq}: manifest {manifest_id} is missing")
+                break
+            except UNREADABLE_ERRORS:
+                errors.append(f"seq {seq}: manifest {manifest_id} is unreadable")
+                break
+            chain = manifest.get("chain") or {}
+            if chain.get("tenant") != tenant or chain.get("seq") != seq:
+                errors.append(f"seq {seq}: manifest {manifest_id} is out of order")
+                break
+            if not self._check(manifest):
+                errors.append(f"seq {seq}: signature mismatch for {manifest_id}")
+            expected = checkpoints.get(seq)
+            if expected is not None and expected["manifest_id"] != manifest_id:
+                errors.append(f"seq {seq}: manifest {manifest_id} does not match checkpoint")
+            report["checked"] += 1
+            manifest_id = chain.get("prev")
+            seq -= 1
+        else:
+            expected_prev = anchor["manifest_id"] if anchor else None
+            if manifest_id != expected_prev:
+                errors.append(f"seq {stop_seq + 1}: back-link does not reach seq {stop_seq}")
+
+        report["verified"] = not errors
+        if not errors:
+            verified = [seq for seq in checkpoints if seq <= head["seq"]]
+            if verified:
+                self._storage.write_record(VERIFIED_NAMESPACE, tenant, {"seq": max(verified)})
+        return report
+
+    def verify_chains(self, *, full: bool = False) -> Iterator[Dict[str, Any]]:
+        """Verify every tenant chain in the store."""
+        for tenant in list(self._storage.iter_record_keys(CHAIN_NAMESPACE)):
+            yield self.verify_chain(tenant, full=full)
+
+    def _resume_anchor(self, tenant: str) -> Optional[Dict[str, Any]]:
+        state = self._storage.read_record(VERIFIED_NAMESPACE, tenant)
+        if state is None:
+            return None
+        checkpoint = self._storage.read_record(checkpoint_namespace(tenant), f"{state['seq']:012d}")
+        if checkpoint is None or not self._signer.verify_checkpoint(checkpoint):
+            return None
+        return checkpoint
+
+    def _retention_floor(self, tenant: str) -> Optional[Dict[str, Any]]:
+        floor = self._storage.read_record(RETENTION_FLOOR_NAMESPACE, tenant)
+        if floor is None or not self._signer.verify_checkpoint(floor):
+            return None
+        return floor
+
+    def _checkpoints_after(self, tenant: str, seq: int) -> Dict[int, Dict[str, Any]]:
+        namespace = checkpoint_namespace(tenant)
+        checkpoints: Dict[int, Dict[str, Any]] = {}
+        for key in self._storage.iter_record_keys(namespace):
+            if int(key) > seq:
+                checkpoints[int(key)] = self._storage.read_record(namespace, key) or {}
+        return checkpoints
+
+    def _verify_batch(
+        self,
+        manifest_ids: List[str],
+        selector: Optional[ManifestSelector],
+        skip_missing: bool = False,
+    ) -> List[Dict[str, Any]]:
+        results: List[Dict[str, Any]] = []
+        for manifest_id, manifest, read_error in self._storage.read_many(manifest_ids):
+            if manifest is None:
+                if skip_missing and read_error == "missing":
+                    continue
+                results.append({"manifest_id": manifest_id, "verified": False, "error": read_error})
+                continue
+            if selector is not None and not selector(manifest):
+                continue
+            try:
+                verified = self._check(manifest)
+                error = None if verified else "signature_mismatch"
+            except (KeyError, TypeError):
+                verified, error = False, "malformed"
+            results.append({"manifest_id": manifest_id, "verified": verified, "error": error})
+        return results
+
+    def _check(self, manifest: Dict[str, Any]) -> bool:
         action = manifest["action"]
         timestamp = manifest["timestamp"]
-        expected_signature = self._signer._hash_payload(action, timestamp)  # pylint: disable=protected-access
-        manifest["verified"] = manifest["signature"] == expected_signature
-        return manifest
+        chain = manifest.get("chain")
+        expected_signature = self._signer._hash_payload(action, timestamp, chain)  # pylint: disable=protected-access
+        return bool(manifest["signature"] == expected_signature)
+
+
+class VerificationSummary:
+    """Aggregates batch verification results with a bounded failure sample."""
+
+    def __init__(self, max_failures: int = 100) -> None:
+        self.total = 0
+        self.verified = 0
+        self.failed = 0
+        self.errors: Dict[str, int] = {}
+        self.failures: List[Dict[str, Any]] = []
+        self._max_failures = max_failures
+
+    def add(self, result: Dict[str, Any]) -> None:
+        self.total += 1
+        if result["verified"]:
+            self.verified += 1
+            return
+        self.failed += 1
+        error = result.get("error") or "unknown"
+        self.errors[error] = self.errors.get(error, 0) + 1
+        if len(self.failures) < self._max_failures:
+            self.failures.append(result)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "verified": self.verified,
+            "failed": self.failed,
+            "errors": dict(self.errors),
+            "failures": list(self.failures),
+            "failures_truncated": self.failed > len(self.failures),
+        }
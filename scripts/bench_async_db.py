@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+"""Compare request throughput of the sync and async database layers under concurrency.
+
+Builds one app per mode (``DATABASE_ASYNC`` off and on) and drives both over ASGI with
+``--concurrency`` clients issuing registry reads (a keyset page and a scope search).
+Sync handlers hold a threadpool thread across every database round
+trip; async handlers only hold a pooled connection. SQLite (the default, seeded in a temp
+directory) has no network round trips, so it understates the gap; point
+``--database-url`` at a migrated Postgres to measure the real one.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterator, List
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from sentinel_control_plane.config import get_settings
+from sentinel_control_plane.database import async_database_url
+from sentinel_control_plane.dependencies import async_db_session, db_session
+from sentinel_control_plane.main import create_app
+from sentinel_control_plane.models import KillExpiration, RegistryState, Tenant, Tool
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def seed(url: str, tools: int) -> None:
+    engine = create_engine(url)
+    for model in (Tenant, Tool, RegistryState, KillExpiration):
+        model.__table__.create(engine)
+    tenant_id = uuid.uuid4()
+    with engine.begin() as connection:
+        connection.execute(insert(Tenant), [{"id": tenant_id, "slug": "bench", "display_name": "B"}])
+        connection.execute(
+            insert(Tool),
+            [
+                {
+                    "tenant_id": tenant_id,
+                    "name": f"tool-{index:05d}",
+                    "url": "u",
+                    "owner": "bench",
+                    "scopes": [f"scope:{index % 10}"],
+                    "extra_metadata": {},
+                }
+                for index in range(tools)
+            ],
+        )
+    engine.dispose()
+
+
+def build_app(url: str, database_async: bool, pool_size: int) -> FastAPI:
+    os.environ["DATABASE_ASYNC"] = "true" if database_async else "false"
+    get_settings.cache_clear()
+    app = create_app()
+    del os.environ["DATABASE_ASYNC"]
+    get_settings.cache_clear()
+
+    pool = {"pool_size": pool_size, "max_overflow": 0}
+    factory = sessionmaker(bind=create_engine(url, **pool), expire_on_commit=False)
+    async_factory = async_sessionmaker(
+        bind=create_async_engine(async_database_url(url), **pool), expire_on_commit=False
+    )
+
+    @contextmanager
+    def get_session() -> Iterator[Session]:
+        session = factory()
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    @asynccontextmanager
+    async def get_async_session() -> AsyncIterator[AsyncSession]:
+        session = async_factory()
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    def database() -> Iterator[Session]:
+        with get_session() as session:
+            yield session
+
+    async def async_database() -> AsyncIterator[AsyncSession]:
+        async with get_async_session() as session:
+            yield session
+
+    app.dependency_overrides[db_session] = database
+    app.dependency_overrides[async_db_session] = async_database
+    return app
+
+
+async def drive(app: FastAPI, concurrency: int, requests: int) -> Dict[str, object]:
+    latencies: List[float] = []
+    counter = iter(range(requests))
+    transport = httpx.ASGITransport(app=app)
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        for index in counter:
+            started = time.perf_counter()
+            if index % 2:
+                response = await client.get("/register", params={"limit": 50})
+            else:
+                response = await client.get("/register/search", params={"scope": "scope:3"})
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return {
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "latency_ms": {
+            "p50": round(statistics.median(latencies) * 1000, 2),
+            "p99": round(percentile(latencies, 0.99) * 1000, 2),
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--tools", type=int, default=1_000)
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=None,
+        help="Connections per engine (default: --concurrency). A sync request keeps its "
+        "connection while it waits for a threadpool thread to validate the response, so with "
+        "fewer connections than requests in flight the sync layer stalls until the pool times out",
+    )
+    parser.add_argument("--database-url", default=None, help="Migrated and seeded registry")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.database_url or f"sqlite:///{Path(tmp) / 'registry.db'}"
+        if args.database_url is None:
+            seed(url, args.tools)
+        results: Dict[str, object] = {"concurrency": args.concurrency, "requests": args.requests}
+        for label, database_async in (("sync", False), ("async", True)):
+            app = build_app(url, database_async, args.pool_size or args.concurrency)
+            results[label] = asyncio.run(drive(app, args.concurrency, args.requests))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
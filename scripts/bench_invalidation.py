@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+"""Measure cross-replica invalidation latency with several control planes in one process.
+
+Each replica is its own app instance with its own invalidation bus; writes (register, kill,
+restore) go to a random replica and every replica records how long each event took to
+arrive. ``--transport memory`` needs nothing running (SQLite plus an in-process hub);
+``redis`` publishes through ``--redis-url``; ``postgres`` uses LISTEN/NOTIFY on
+``--database-url``, whose schema must already be migrated.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from sentinel_control_plane.dependencies import db_session, invalidation_bus
+from sentinel_control_plane.invalidation import (
+    InvalidationBus,
+    InvalidationEvent,
+    InvalidationTransport,
+    MemoryHub,
+    MemoryTransport,
+    PostgresTransport,
+    RedisTransport,
+)
+from sentinel_control_plane.main import create_app
+from sentinel_control_plane.models import RegistryState, Tenant, Tool
+from sentinel_control_plane.registry_version import current_registry_version
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--replicas", type=int, default=4)
+    parser.add_argument("--writes", type=int, default=200)
+    parser.add_argument("--transport", choices=("memory", "redis", "postgres"), default="memory")
+    parser.add_argument("--redis-url", default="redis://localhost:6379/0")
+    parser.add_argument("--database-url", default=None, help="Required for --transport postgres")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.database_url or f"sqlite:///{Path(tmp) / 'registry.db'}"
+        engine = create_engine(url)
+        if args.database_url is None:
+            for model in (Tenant, Tool, RegistryState):
+                model.__table__.create(engine)
+        factory = sessionmaker(bind=engine, expire_on_commit=False)
+
+        @contextmanager
+        def get_session() -> Iterator[Session]:
+            session = factory()
+            try:
+                yield session
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+            finally:
+                session.close()
+
+        def database() -> Iterator[Session]:
+            with get_session() as session:
+                yield session
+
+        def version() -> int:
+            with get_session() as session:
+                return current_registry_version(session)
+
+        hub = MemoryHub()
+
+        def transport() -> InvalidationTransport:
+            if args.transport == "postgres":
+                return PostgresTransport(url, channel="sentinel_invalidation_bench")
+            if args.transport == "redis":
+                return RedisTransport(args.redis_url, channel="sentinel_invalidation_bench")
+            return MemoryTransport(hub, poll_seconds=0.01)
+
+        latencies: Dict[str, List[float]] = {}
+        lock = threading.Lock()
+        clients, buses = [], []
+        for index in range(args.replicas):
+            name = f"replica-{index}"
+            bus = InvalidationBus(transport(), current_version=version, replica_id=name)
+
+            def record(event: InvalidationEvent, name: str = name) -> None:
+                if event.kind != "resync":
+                    with lock:
+                        latencies.setdefault(name, []).append(time.time() - event.published_at)
+
+            bus.subscribe(record)
+            app = create_app()
+            app.dependency_overrides[db_session] = database
+            app.dependency_overrides[invalidation_bus] = (lambda bus: lambda: bus)(bus)
+            bus.start()
+            if not bus.wait_connected(timeout=10):
+                raise SystemExit(f"{name} could not connect to the {args.transport} transport")
+            clients.append(TestClient(app))
+            buses.append(bus)
+
+        rng = random.Random(0)
+        started = time.perf_counter()
+        expected = 0
+        for index in range(args.writes):
+            client = rng.choice(clients)
+            name = f"tool-{index % 50}"
+            if index < 50:
+                tool = {"tenant_slug": "bench", "name": name, "url": "u", "owner": "bench"}
+                client.post("/register", json=tool).raise_for_status()
+                expected += 2 if index == 0 else 1  # the first write also creates the tenant
+            else:
+                path = "/kill" if index % 2 else "/kill/restore"
+                body = {"tenant_slug": "bench", "tool_name": name, "reason": "bench"}
+                client.post(path, json=body).raise_for_status()
+                expected += 1
+        deadline = time.time() + 10
+        while time.time() < deadline and any(
+            len(latencies.get(bus.replica_id, [])) < expected for bus in buses
+        ):
+            time.sleep(0.01)
+        elapsed = time.perf_counter() - started
+        for bus in buses:
+            bus.close()
+
+    samples = [value * 1000 for values in latencies.values() for value in values]
+    print(
+        json.dumps(
+            {
+                "transport": args.transport,
+                "replicas": args.replicas,
+                "writes": args.writes,
+                "delivered": len(samples),
+                "expected": expected * args.replicas,
+                "resyncs": sum(bus.resyncs for bus in buses),
+                "writes_per_second": round(args.writes / elapsed, 1),
+                "latency_ms": {
+                    "p50": round(statistics.median(samples), 2) if samples else None,
+                    "p99": round(percentile(samples, 0.99), 2) if samples else None,
+                    "max": round(max(samples), 2) if samples else None,
+                },
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
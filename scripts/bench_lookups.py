@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""Measure the CPU cost of resolving a tenant and tool the old way and through ``lookups``.
+
+``orm`` is the lookup the routes used to do: two statements built on every call, each
+loading a full ORM entity. ``lookups`` is ``require_tool``: one statement built at import
+with bound parameters and a JOIN that fetches just the two ids. Both run against an
+in-memory SQLite registry (so the database itself costs next to nothing) with one session
+per lookup, as a request would, and report process CPU time per lookup (best of
+``--repeat`` runs).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import uuid
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from sentinel_control_plane.lookups import require_tool
+from sentinel_control_plane.models import Tenant, Tool
+
+
+def seed(factory: sessionmaker[Session], tenants: int, tools: int) -> List[Tuple[str, str]]:
+    tenant_ids = [uuid.uuid4() for _ in range(tenants)]
+    with factory.begin() as session:
+        session.execute(
+            insert(Tenant),
+            [
+                {"id": tenant_id, "slug": f"tenant-{index}", "display_name": f"Tenant {index}"}
+                for index, tenant_id in enumerate(tenant_ids)
+            ],
+        )
+        session.execute(
+            insert(Tool),
+            [
+                {
+                    "tenant_id": tenant_ids[index % tenants],
+                    "name": f"tool-{index:05d}",
+                    "url": "u",
+                    "owner": "bench",
+                    "scopes": ["read"],
+                    "extra_metadata": {"team": "bench"},
+                }
+                for index in range(tools)
+            ],
+        )
+    return [(f"tenant-{index % tenants}", f"tool-{index:05d}") for index in range(tools)]
+
+
+def orm_lookup(session: Session, tenant_slug: str, tool_name: str) -> uuid.UUID:
+    tenant = session.execute(select(Tenant).where(Tenant.slug == tenant_slug)).scalar_one()
+    tool = session.execute(
+        select(Tool).where(Tool.tenant_id == tenant.id, Tool.name == tool_name)
+    ).scalar_one()
+    return tool.id
+
+
+def lookups_lookup(session: Session, tenant_slug: str, tool_name: str) -> uuid.UUID:
+    return require_tool(session, tenant_slug, tool_name).tool_id
+
+
+def measure(
+    factory: sessionmaker[Session],
+    lookup: Callable[[Session, str, str], uuid.UUID],
+    keys: List[Tuple[str, str]],
+    iterations: int,
+) -> float:
+    for tenant_slug, tool_name in keys[:100]:  # warm the compiled cache
+        with factory() as session:
+            lookup(session, tenant_slug, tool_name)
+    started = time.process_time()
+    for index in range(iterations):
+        tenant_slug, tool_name = keys[index % len(keys)]
+        with factory() as session:
+            lookup(session, tenant_slug, tool_name)
+    elapsed = time.process_time() - started
+    return elapsed / iterations * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--tenants", type=int, default=20)
+    parser.add_argument("--tools", type=int, default=2_000)
+    parser.add_argument("--iterations", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=5, help="Report the best of N runs")
+    args = parser.parse_args()
+
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Tenant.__table__.create(engine)
+    Tool.__table__.create(engine)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    keys = seed(factory, args.tenants, args.tools)
+
+    cpu_us: Dict[str, float] = {}
+    for label, lookup in (("orm", orm_lookup), ("lookups", lookups_lookup)):
+        cpu_us[label] = min(
+            measure(factory, lookup, keys, args.iterations) for _ in range(args.repeat)
+        )
+    results = {
+        "iterations": args.iterations,
+        "cpu_us_per_lookup": {label: round(value, 1) for label, value in cpu_us.items()},
+        "cpu_saved_percent": round((1 - cpu_us["lookups"] / cpu_us["orm"]) * 100, 1),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""Benchmark incremental vs full provenance chain verification on a synthetic store."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from sentinel_provenance.signer import ProvenanceSigner
+from sentinel_provenance.storage import ManifestStorage
+from sentinel_provenance.verifier import ProvenanceVerifier
+
+
+def populate(signer: ProvenanceSigner, tenants: int, count: int, offset: int = 0) -> None:
+    for index in range(offset, offset + count):
+        signer.sign_action(
+            {
+                "tenant": f"tenant-{index % tenants}",
+                "tool": "bench-tool",
+                "action": "invoke",
+                "payload": {"index": index},
+            }
+        )
+
+
+def timed_verify(verifier: ProvenanceVerifier, full: bool) -> dict:
+    started = time.perf_counter()
+    checked = 0
+    verified = True
+    for report in verifier.verify_chains(full=full):
+        checked += report["checked"]
+        verified = verified and report["verified"]
+    return {"seconds": round(time.perf_counter() - started, 4), "checked": checked, "verified": verified}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--manifests", type=int, default=50_000, help="Initial store size")
+    parser.add_argument("--new", type=int, default=1_000, help="Manifests appended before the incremental run")
+    parser.add_argument("--tenants", type=int, default=10)
+    parser.add_argument("--checkpoint-interval", type=int, default=1_000)
+    parser.add_argument("--path", type=Path, help="Store location (defaults to a temp dir)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = ManifestStorage(args.path or Path(tmp))
+        signer = ProvenanceSigner(storage, "bench-key", checkpoint_interval=args.checkpoint_interval)
+        verifier = ProvenanceVerifier(storage, signer)
+
+        populate(signer, args.tenants, args.manifests)
+        baseline = timed_verify(verifier, full=False)
+        populate(signer, args.tenants, args.new, offset=args.manifests)
+        incremental = timed_verify(verifier, full=False)
+        full = timed_verify(verifier, full=True)
+
+    speedup = full["seconds"] / incremental["seconds"] if incremental["seconds"] else float("inf")
+    print(
+        json.dumps(
+            {
+                "manifests": args.manifests + args.new,
+                "new": args.new,
+                "tenants": args.tenants,
+                "initial_full": baseline,
+                "incremental": incremental,
+                "full": full,
+                "speedup": round(speedup, 1),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""Measure storage and write bandwidth saved by content-addressed payload deduplication."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from sentinel_provenance.signer import ProvenanceSigner
+from sentinel_provenance.storage import ManifestStorage
+
+
+def directory_bytes(root: Path) -> int:
+    return sum(path.stat().st_size for path in root.rglob("*") if path.is_file())
+
+
+def run(root: Path, dedup: bool, args: argparse.Namespace) -> dict:
+    rng = random.Random(7)
+    documents = [
+        {"doc_id": index, "text": "".join(rng.choice("abcdefgh ") for _ in range(args.payload_bytes))}
+        for index in range(args.distinct)
+    ]
+    storage = ManifestStorage(root, compression=args.compression, dedup_payloads=dedup)
+    signer = ProvenanceSigner(storage, "bench-key")
+
+    started = time.perf_counter()
+    for index in range(args.manifests):
+        signer.sign_action(
+            {
+                "tenant": f"tenant-{index % 4}",
+                "tool": "retriever",
+                "action": "invoke",
+                "payload": documents[rng.randrange(args.distinct)],
+            }
+        )
+    elapsed = time.perf_counter() - started
+    result = {
+        "stored_bytes": directory_bytes(root),
+        "manifests_per_second": round(args.manifests / elapsed, 1),
+    }
+    if dedup:
+        result["payloads"] = storage.payload_stats()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--manifests", type=int, default=2_000)
+    parser.add_argument("--distinct", type=int, default=50, help="Distinct payloads in the workload")
+    parser.add_argument("--payload-bytes", type=int, default=8_192)
+    parser.add_argument("--compression", choices=["zlib"], default=None)
+    args = parser.parse_args()
+
+    results = {}
+    for label, dedup in (("inline", False), ("dedup", True)):
+        with tempfile.TemporaryDirectory() as tmp:
+            results[label] = run(Path(tmp), dedup, args)
+    results["storage_reduction"] = round(
+        results["inline"]["stored_bytes"] / results["dedup"]["stored_bytes"], 2
+    )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+"""Compare per-manifest fsync with group commit across signing concurrency levels."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from sentinel_provenance.signer import ProvenanceSigner
+from sentinel_provenance.storage import ManifestStorage
+from sentinel_provenance.writer import GroupCommitWriter
+
+
+def run(root: Path, concurrency: int, manifests: int, max_batch: int) -> dict:
+    storage = ManifestStorage(root / "store")
+    writer = GroupCommitWriter(storage, journal_path=root / "journal", max_batch=max_batch)
+    writer.start()
+    signer = ProvenanceSigner(storage, "bench-key", writer=writer)
+
+    def sign(index: int) -> None:
+        signer.sign_action(
+            {"tenant": f"tenant-{index % 4}", "tool": "bench-tool", "action": "invoke", "payload": {"i": index}}
+        )
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(sign, range(manifests)))
+    elapsed = time.perf_counter() - started
+    writer.close()
+    return {
+        "manifests_per_second": round(manifests / elapsed, 1),
+        "batches": writer.batches_committed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--manifests", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--batch-size", type=int, default=256)
+    args = parser.parse_args()
+
+    results = []
+    for concurrency in args.concurrency:
+        row = {"concurrency": concurrency}
+        for label, max_batch in (("per_manifest_fsync", 1), ("group_commit", args.batch_size)):
+            with tempfile.TemporaryDirectory() as tmp:
+                row[label] = run(Path(tmp), concurrency, args.manifests, max_batch)
+        results.append(row)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+"""Compare full, keyset-paged and NDJSON-streamed tool listings on a large seeded registry.
+
+Drives the control plane over ASGI in-process against a throwaway SQLite database and
+reports time to first byte, total time and peak Python heap (from a second, traced run).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Tuple
+from urllib.parse import urlencode
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session, sessionmaker
+
+from sentinel_control_plane.dependencies import db_session, session_factory
+from sentinel_control_plane.main import app
+from sentinel_control_plane.models import Tenant, Tool
+
+
+def seed(database: Path, tenants: int, tools: int) -> Callable[[], Iterator[Session]]:
+    engine = create_engine(f"sqlite:///{database}")
+    Tenant.__table__.create(engine)
+    Tool.__table__.create(engine)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    tenant_ids = [uuid.uuid4() for _ in range(tenants)]
+    with factory.begin() as session:
+        session.execute(
+            insert(Tenant),
+            [
+                {"id": tenant_id, "slug": f"tenant-{index}", "display_name": f"Tenant {index}"}
+                for index, tenant_id in enumerate(tenant_ids)
+            ],
+        )
+        for start in range(0, tools, 10_000):
+            session.execute(
+                insert(Tool),
+                [
+                    {
+                        "tenant_id": tenant_ids[index % tenants],
+                        "name": f"tool-{index:07d}",
+                        "url": f"https://tools.example.com/{index}",
+                        "owner": "bench",
+                        "scopes": ["read", "write"],
+                        "extra_metadata": {"team": f"team-{index % 50}"},
+                    }
+                    for index in range(start, min(start + 10_000, tools))
+                ],
+            )
+
+    @contextmanager
+    def get_session() -> Iterator[Session]:
+        session = factory()
+        try:
+            yield session
+            session.commit()
+        finally:
+            session.close()
+
+    return get_session
+
+
+def request(path: str, query: str = "") -> Tuple[float, int, bytes, Dict[str, str]]:
+    """Call the app over ASGI; returns first-byte time, bytes received, buffered body, headers."""
+    state: Dict[str, Any] = {"first_byte": 0.0, "size": 0, "headers": {}, "received": False}
+    chunks = []
+
+    async def receive() -> Dict[str, Any]:
+        if state["received"]:  # the client stays connected until the response completes
+            await asyncio.Event().wait()
+        state["received"] = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Dict[str, Any]) -> None:
+        if message["type"] == "http.response.start":
+            state["headers"] = {k.decode(): v.decode() for k, v in message["headers"]}
+        elif message["type"] == "http.response.body" and message.get("body"):
+            state["first_byte"] = state["first_byte"] or time.perf_counter()
+            state["size"] += len(message["body"])
+            if path != "/register/export":  # a streaming client consumes lines as they arrive
+                chunks.append(message["body"])
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 0),
+        "server": ("bench", 80),
+    }
+    asyncio.run(app(scope, receive, send))
+    return state["first_byte"], state["size"], b"".join(chunks), state["headers"]
+
+
+def measure(run: Callable[[], Tuple[float, int]]) -> dict:
+    started = time.perf_counter()
+    first_byte, size = run()
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()  # a second, traced run: tracing slows allocation-heavy code
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "ttfb_ms": round((first_byte - started) * 1000, 1),
+        "total_ms": round(elapsed * 1000, 1),
+        "response_mb": round(size / 1e6, 1),
+        "peak_mb": round(peak / 1e6, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--tools", type=int, default=200_000)
+    parser.add_argument("--tenants", type=int, default=20)
+    parser.add_argument("--page-size", type=int, default=1_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        get_session = seed(Path(tmp) / "registry.db", args.tenants, args.tools)
+
+        def database() -> Iterator[Session]:
+            with get_session() as session:
+                yield session
+
+        app.dependency_overrides[db_session] = database
+        app.dependency_overrides[session_factory] = lambda: get_session
+
+        def full() -> Tuple[float, int]:
+            first_byte, size, body, _ = request("/register")
+            assert len(json.loads(body)) == args.tools
+            return first_byte, size
+
+        def paged() -> Tuple[float, int]:
+            first_byte, total, cursor, count = 0.0, 0, None, 0
+            while True:
+                params = {"limit": args.page_size, **({"cursor": cursor} if cursor else {})}
+                page_first_byte, size, body, headers = request("/register", urlencode(params))
+                first_byte = first_byte or page_first_byte
+                total += size
+                count += len(json.loads(body))
+                cursor = headers.get("x-next-cursor")
+                if cursor is None:
+                    assert count == args.tools
+                    return first_byte, total
+
+        def streamed() -> Tuple[float, int]:
+            first_byte, size, _, _ = request("/register/export")
+            return first_byte, size
+
+        results: Dict[str, Any] = {"tools": args.tools}
+        for label, run in (("full", full), ("paged", paged), ("ndjson", streamed)):
+            results[label] = measure(run)
+        app.dependency_overrides.clear()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""Apply per-tenant retention policies (archive, then delete) to a provenance store.
+
+Policies are read from a JSON file such as::
+
+    {"default": {"hot_days": 30, "delete_after_days": 365},
+     "tenants": {"acme": {"hot_days": 7, "delete_after_days": null}}}
+
+Each run is bounded by ``--max-manifests`` and ``--max-mb-per-second`` so it can run next
+to the control plane; ``--interval`` repeats runs until interrupted.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Tuple
+
+from sentinel_provenance.retention import RetentionEngine, RetentionPolicy
+from sentinel_provenance.signer import ProvenanceSigner
+from sentinel_provenance.storage import ManifestStorage
+
+
+def load_policies(path: Path) -> Tuple[RetentionPolicy, Dict[str, RetentionPolicy]]:
+    config = json.loads(path.read_text(encoding="utf-8"))
+    default = RetentionPolicy(**config.get("default", {}))
+    tenants = {
+        tenant: RetentionPolicy(**policy) for tenant, policy in config.get("tenants", {}).items()
+    }
+    return default, tenants
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--path", type=Path, default=Path(".data/provenance"))
+    parser.add_argument("--policies", type=Path, required=True, help="JSON policy file")
+    parser.add_argument("--signing-key", default=os.environ.get("SIGNING_KEY", "dev-signing-key"))
+    parser.add_argument("--max-manifests", type=int, default=5_000, help="Hot manifests read per run")
+    parser.add_argument("--max-mb-per-second", type=float, default=None, help="Read budget")
+    parser.add_argument("--segment-mb", type=float, default=4.0, help="Target archive segment size")
+    parser.add_argument("--interval", type=float, default=None, help="Seconds between runs (loop)")
+    args = parser.parse_args()
+
+    default, tenants = load_policies(args.policies)
+    storage = ManifestStorage(args.path)
+    engine = RetentionEngine(
+        storage,
+        ProvenanceSigner(storage, args.signing_key),
+        tenants,
+        default_policy=default,
+        max_manifests=args.max_manifests,
+        max_bytes_per_second=int(args.max_mb_per_second * 1e6) if args.max_mb_per_second else None,
+        segment_max_bytes=int(args.segment_mb * 1024 * 1024),
+    )
+    while True:
+        started = time.perf_counter()
+        report = engine.run()
+        report["seconds"] = round(time.perf_counter() - started, 3)
+        print(json.dumps(report), flush=True)
+        if args.interval is None:
+            return
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
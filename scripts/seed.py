@@ -45,24 +45,27 @@ class Seeder:
         )
 
     def register_tools(self, tools: List[Dict[str, Any]]) -> None:
-        for tool in tools:
-            payload = {
-                "tenant_slug": tool["owner"],
-                "name": tool["name"],
-                "url": tool["url"],
-                "owner": tool["owner"],
-                "scopes": tool.get("scopes", []),
-                "metadata": tool.get("metadata", {}),
-            }
-            response = self._post_with_retry("/register", payload, action="register")
-            if response.status_code == 201:
-                print(f"registered {payload['name']} for tenant {payload['tenant_slug']}")
-            elif response.status_code == 409:
-                print(f"{payload['name']} already registered")
-            else:
-                print(
-                    f"failed to register {payload['name']}: {response.status_code} {response.text}"
-                )
+        payload = {
+            "tools": [
+                {
+                    "tenant_slug": tool["owner"],
+                    "name": tool["name"],
+                    "url": tool["url"],
+                    "owner": tool["owner"],
+                    "scopes": tool.get("scopes", []),
+                    "metadata": tool.get("metadata", {}),
+                }
+                for tool in tools
+            ]
+        }
+        response = self._post_with_retry(
+            "/register/bulk", payload, action="bulk register", expected_status=200
+        )
+        if response.status_code != 200:
+            print(f"failed to register tools: {response.status_code} {response.text}")
+            return
+        for result in response.json()["results"]:
+            print(f"{result['status']} {result['name']} for tenant {result['tenant_slug']}")
 
     def run_policy_checks(self, checks: List[Dict[str, Any]]) -> None:
         for check in checks:
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""Bulk-verify provenance manifests through the control plane's batch endpoint."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+import httpx
+
+DEFAULT_BASE_URL = "http://localhost:8000"
+
+
+def parse_timestamp(value: str) -> int:
+    """Accept epoch milliseconds or an ISO-8601 timestamp."""
+    if value.isdigit():
+        return int(value)
+    return int(datetime.fromisoformat(value).timestamp() * 1000)
+
+
+def iter_ids(args: argparse.Namespace) -> Iterator[str]:
+    yield from args.manifest_ids
+    if args.ids_file is None:
+        return
+    handle: TextIO = sys.stdin if str(args.ids_file) == "-" else args.ids_file.open("r", encoding="utf-8")
+    try:
+        for line in handle:
+            manifest_id = line.strip()
+            if manifest_id:
+                yield manifest_id
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+def iter_chunks(ids: Iterator[str], size: int) -> Iterator[List[str]]:
+    while True:
+        chunk = list(islice(ids, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class BatchVerifier:
+    def __init__(self, base_url: str, workers: int, failures_only: bool) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.client = httpx.Client(timeout=httpx.Timeout(10.0, read=None))
+        self.workers = workers
+        self.failures_only = failures_only
+        self.totals: Dict[str, Any] = {"total": 0, "verified": 0, "failed": 0, "errors": {}}
+
+    def run(self, body: Dict[str, Any]) -> None:
+        body = {**body, "workers": self.workers}
+        with self.client.stream("POST", f"{self.base_url}/provenance/verify-batch", json=body) as response:
+            if response.status_code != 200:
+                response.read()
+                raise RuntimeError(f"verify-batch failed: {response.status_code} {response.text}")
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                record = json.loads(line)
+                if "summary" in record:
+                    self._merge(record["summary"])
+                elif not (self.failures_only and record["verified"]):
+                    print(line, flush=True)
+
+    def _merge(self, summary: Dict[str, Any]) -> None:
+        for key in ("total", "verified", "failed"):
+            self.totals[key] += summary[key]
+        for error, count in summary["errors"].items():
+            self.totals["errors"][error] = self.totals["errors"].get(error, 0) + count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("manifest_ids", nargs="*", help="Manifest ids to verify")
+    parser.add_argument("--ids-file", type=Path, help="File with one manifest id per line ('-' for stdin)")
+    parser.add_argument("--tenant", help="Verify every manifest for this tenant")
+    parser.add_argument("--since", type=parse_timestamp, help="Epoch ms or ISO timestamp (inclusive)")
+    parser.add_argument("--until", type=parse_timestamp, help="Epoch ms or ISO timestamp (exclusive)")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Ids sent per request")
+    parser.add_argument("--failures-only", action="store_true", help="Only print failed results")
+    args = parser.parse_args()
+
+    verifier = BatchVerifier(args.base_url, args.workers, args.failures_only)
+    filters: Dict[str, Optional[Any]] = {
+        "tenant_slug": args.tenant,
+        "since": args.since,
+        "until": args.until,
+    }
+    if args.manifest_ids or args.ids_file is not None:
+        for chunk in iter_chunks(iter_ids(args), args.chunk_size):
+            verifier.run({**filters, "manifest_ids": chunk})
+    else:
+        verifier.run(filters)
+
+    print(json.dumps({"summary": verifier.totals}), file=sys.stderr)
+    if verifier.totals["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,15 @@
 from __future__ import annotations
 
+import os
 import sys
+from contextlib import contextmanager
 from pathlib import Path
 
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
 repo_root = Path(__file__).resolve().parents[1]
 paths = [
     repo_root / "packages" / "policy_engine" / "python",
@@ -12,3 +19,59 @@ paths = [
 
 for path in paths:
     sys.path.insert(0, str(path))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def provenance_dir(tmp_path_factory):
+    """Point the app's default manifest store and journal at a scratch directory."""
+    from sentinel_control_plane.config import get_settings
+
+    root = tmp_path_factory.mktemp("provenance") / "provenance"
+    os.environ["PROVENANCE_PATH"] = str(root)
+    get_settings.cache_clear()
+    yield root
+    os.environ.pop("PROVENANCE_PATH", None)
+    get_settings.cache_clear()
+
+
+@pytest.fixture
+def registry_db():
+    """An in-memory SQLite registry wired into the app's session dependencies."""
+    from sentinel_control_plane.dependencies import db_session, session_factory
+    from sentinel_control_plane.main import app
+    from sentinel_control_plane.models import (
+        KillExpiration,
+        RegistryState,
+        Tenant,
+        Tool,
+        ToolHealth,
+    )
+
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    for model in (Tenant, Tool, RegistryState, ToolHealth, KillExpiration):
+        model.__table__.create(engine)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+
+    @contextmanager
+    def get_session():
+        session = factory()
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def db():
+        with get_session() as session:
+            yield session
+
+    app.dependency_overrides[db_session] = db
+    app.dependency_overrides[session_factory] = lambda: get_session
+    yield get_session
+    app.dependency_overrides.pop(db_session, None)
+    app.dependency_overrides.pop(session_factory, None)
@@ -0,0 +1,143 @@
+"""In-process benchmark harness for the control plane's hot endpoints.
+
+The app runs in-process behind an ``httpx`` ASGI client, against a SQLite file (or the
+Postgres at ``SENTINEL_TEST_POSTGRES_URL``, e.g. the compose container) and a fake OPA
+server on a local port, so only the control plane's own cost is measured. Every scenario
+reports throughput and p50/p95/p99 latency; the whole run is written as JSON to
+``SENTINEL_BENCH_OUTPUT`` and each scenario fails when it regresses beyond
+``SENTINEL_BENCH_THRESHOLD`` against the matching scenario in ``SENTINEL_BENCH_BASELINE``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from harness import (
+    BASELINE,
+    CONCURRENCY,
+    POSTGRES_URL,
+    REQUESTS,
+    THRESHOLD,
+    BenchReport,
+    FakeOPA,
+    Send,
+    drive,
+    registry_engine,
+    seed,
+)
+from sentinel_control_plane.config import Settings
+from sentinel_control_plane.dependencies import (
+    db_session,
+    kill_expiry_scheduler,
+    provenance_signer,
+    provenance_storage,
+    provenance_verifier,
+    session_factory,
+    settings_provider,
+)
+from sentinel_control_plane.main import app
+from sentinel_provenance.cache import ManifestCache
+from sentinel_provenance.signer import ProvenanceSigner
+from sentinel_provenance.storage import ManifestStorage
+from sentinel_provenance.verifier import ProvenanceVerifier
+
+
+@pytest.fixture(scope="session")
+def bench_report() -> Iterator[BenchReport]:
+    baseline_path = os.environ.get("SENTINEL_BENCH_BASELINE", str(BASELINE))
+    baseline = None
+    if baseline_path and Path(baseline_path).exists():
+        baseline = json.loads(Path(baseline_path).read_text())
+    report = BenchReport("postgresql" if POSTGRES_URL else "sqlite", baseline)
+    yield report
+    output = Path(os.environ.get("SENTINEL_BENCH_OUTPUT", ".data/bench/results.json"))
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report.as_dict(), indent=2, sort_keys=True) + "\n")
+
+
+@pytest.fixture(scope="session")
+def fake_opa() -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOPA)
+    thread = threading.Thread(target=server.serve_forever, name="fake-opa", daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    thread.join()
+
+
+@pytest.fixture
+def bench_app(tmp_path: Path, fake_opa: str) -> Iterator[ProvenanceSigner]:
+    """Wire the app to a seeded registry, the fake OPA and a scratch manifest store."""
+    with registry_engine(tmp_path) as engine:
+        factory = sessionmaker(bind=engine, expire_on_commit=False)
+        seed(factory)
+
+        @contextmanager
+        def get_session() -> Iterator[Any]:
+            session = factory()
+            try:
+                yield session
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+            finally:
+                session.close()
+
+        def db() -> Iterator[Any]:
+            with get_session() as session:
+                yield session
+
+        settings = Settings(opa_url=fake_opa)
+        storage = ManifestStorage(tmp_path / "provenance")
+        signer = ProvenanceSigner(storage=storage, signing_key="bench-key")
+        verifier = ProvenanceVerifier(
+            storage=storage,
+            signer=signer,
+            cache=ManifestCache(max_bytes=settings.provenance_verify_cache_bytes),
+        )
+        overrides = {
+            db_session: db,
+            session_factory: lambda: get_session,
+            settings_provider: lambda: settings,
+            provenance_signer: lambda: signer,
+            provenance_storage: lambda: storage,
+            provenance_verifier: lambda: verifier,
+            kill_expiry_scheduler: lambda: None,
+        }
+        app.dependency_overrides.update(overrides)
+        try:
+            yield signer
+        finally:
+            for dependency in overrides:
+                app.dependency_overrides.pop(dependency, None)
+
+
+@pytest.fixture
+def bench(bench_app: ProvenanceSigner, bench_report: BenchReport) -> Callable[..., Dict[str, Any]]:
+    """Run ``send(client, index)`` ``REQUESTS`` times and record the scenario as ``name``.
+
+    ``concurrency`` overrides ``SENTINEL_BENCH_CONCURRENCY``; write scenarios run one at a
+    time on SQLite, which only allows a single writer.
+    """
+
+    def run(name: str, send: Send, *, concurrency: Optional[int] = None) -> Dict[str, Any]:
+        clients = concurrency or CONCURRENCY
+        result = asyncio.run(drive(app, send, REQUESTS, clients))
+        result["concurrency"] = clients
+        regressions = bench_report.record(name, result)
+        if regressions:
+            pytest.fail(f"{name} regressed beyond {THRESHOLD:.0%}: " + "; ".join(regressions))
+        return result
+
+    return run
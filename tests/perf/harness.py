@@ -0,0 +1,173 @@
+"""Shared pieces of the benchmark suite: the fake OPA, the registry, the driver, the report."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import platform
+import time
+import uuid
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+
+import httpx
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import sessionmaker
+
+from sentinel_control_plane.models import (
+    KillExpiration,
+    RegistryState,
+    Tenant,
+    Tool,
+    ToolHealth,
+)
+
+BASELINE = Path(__file__).with_name("baseline.json")
+POSTGRES_URL = os.environ.get("SENTINEL_TEST_POSTGRES_URL")
+REQUESTS = int(os.environ.get("SENTINEL_BENCH_REQUESTS", "400"))
+CONCURRENCY = int(os.environ.get("SENTINEL_BENCH_CONCURRENCY", "16"))
+THRESHOLD = float(os.environ.get("SENTINEL_BENCH_THRESHOLD", "0.25"))
+TENANT = "bench"
+TOOLS = 200
+
+Send = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+class FakeOPA(BaseHTTPRequestHandler):
+    """Answers every decision with an allow, as fast as a local sidecar can."""
+
+    def do_POST(self) -> None:  # noqa: N802 - BaseHTTPRequestHandler naming
+        self.rfile.read(int(self.headers.get("content-length", 0)))
+        body = json.dumps({"result": {"allow": True, "quota_remaining": 100}}).encode()
+        self.send_response(200)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args: Any) -> None:
+        return None
+
+
+class BenchReport:
+    def __init__(self, database: str, baseline: Optional[Dict[str, Any]]) -> None:
+        self.database = database
+        self.scenarios: Dict[str, Dict[str, Any]] = {}
+        self._baseline = baseline if baseline and baseline.get("database") == database else None
+
+    def record(self, name: str, result: Dict[str, Any]) -> List[str]:
+        """Store ``result`` and return how it regressed against the baseline, if it did."""
+        self.scenarios[name] = result
+        previous = (self._baseline or {}).get("scenarios", {}).get(name)
+        if previous is None:
+            return []
+        regressions = []
+        if result["throughput_rps"] < previous["throughput_rps"] * (1 - THRESHOLD):
+            regressions.append(
+                f"throughput {result['throughput_rps']} rps < baseline "
+                f"{previous['throughput_rps']} rps"
+            )
+        if result["latency_ms"]["p95"] > previous["latency_ms"]["p95"] * (1 + THRESHOLD):
+            regressions.append(
+                f"p95 {result['latency_ms']['p95']} ms > baseline {previous['latency_ms']['p95']} ms"
+            )
+        return regressions
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "database": self.database,
+            "python": platform.python_version(),
+            "requests": REQUESTS,
+            "concurrency": CONCURRENCY,
+            "threshold": THRESHOLD,
+            "scenarios": self.scenarios,
+        }
+
+
+async def drive(app: Any, send: Send, requests: int, concurrency: int) -> Dict[str, Any]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for index in range(concurrency):  # warm caches and pools before timing anything
+            _check(await send(client, index))
+        latencies: List[float] = []
+        counter = iter(range(requests))
+
+        async def worker() -> None:
+            for index in counter:
+                started = time.perf_counter()
+                response = await send(client, index)
+                latencies.append(time.perf_counter() - started)
+                _check(response)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "latency_ms": {
+            label: round(_percentile(latencies, fraction) * 1000, 2)
+            for label, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+        },
+    }
+
+
+def _check(response: httpx.Response) -> None:
+    if response.status_code >= 400:
+        raise AssertionError(f"{response.request.url} -> {response.status_code}: {response.text}")
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+@contextmanager
+def registry_engine(tmp_path: Path) -> Iterator[Any]:
+    if POSTGRES_URL is None:
+        engine = create_engine(f"sqlite:///{tmp_path / 'registry.db'}", pool_size=CONCURRENCY)
+        create_tables(engine)
+        yield engine
+        engine.dispose()
+        return
+    schema = f"bench_{uuid.uuid4().hex[:8]}"
+    engine = create_engine(
+        POSTGRES_URL, pool_size=CONCURRENCY, connect_args={"options": f"-csearch_path={schema}"}
+    )
+    with engine.begin() as connection:
+        connection.execute(text(f'CREATE SCHEMA "{schema}"'))
+    try:
+        create_tables(engine)
+        yield engine
+    finally:
+        with engine.begin() as connection:
+            connection.execute(text(f'DROP SCHEMA "{schema}" CASCADE'))
+        engine.dispose()
+
+
+def create_tables(engine: Any) -> None:
+    for model in (Tenant, Tool, RegistryState, ToolHealth, KillExpiration):
+        model.__table__.create(engine)
+
+
+def seed(factory: sessionmaker[Any]) -> None:
+    tenant_id = uuid.uuid4()
+    with factory.begin() as session:
+        session.execute(insert(Tenant), [{"id": tenant_id, "slug": TENANT, "display_name": "B"}])
+        session.execute(
+            insert(Tool),
+            [
+                {
+                    "tenant_id": tenant_id,
+                    "name": f"tool-{index:03d}",
+                    "url": f"https://tool-{index:03d}.example.com",
+                    "owner": "bench",
+                    "scopes": [f"scope:{index % 10}"],
+                    "extra_metadata": {"tier": index % 3},
+                }
+                for index in range(TOOLS)
+            ],
+        )
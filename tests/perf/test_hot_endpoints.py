@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from harness import POSTGRES_URL, TENANT, TOOLS
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("SENTINEL_BENCH"), reason="SENTINEL_BENCH not set (run `make bench`)"
+)
+
+
+def _tool(index: int) -> str:
+    return f"tool-{index % TOOLS:03d}"
+
+
+def test_policy_check(bench):
+    def send(client, index):
+        return client.post(
+            "/policy/check",
+            json={"tenant_slug": TENANT, "tool_name": _tool(index), "action": "invoke"},
+        )
+
+    bench("policy_check", send)
+
+
+def test_sign_action(bench):
+    def send(client, index):
+        return client.post(
+            "/provenance/sign",
+            json={
+                "tenant_slug": TENANT,
+                "tool_name": _tool(index),
+                "action": "invoke",
+                "payload": {"request": index, "query": "quarterly revenue by region"},
+            },
+        )
+
+    bench("sign_action", send)
+
+
+def test_verify_manifest(bench, bench_app):
+    manifest_ids = [
+        bench_app.sign_action(
+            {"tenant": TENANT, "tool": _tool(index), "action": "invoke", "payload": {"n": index}}
+        )["signature"]
+        for index in range(TOOLS)
+    ]
+
+    def send(client, index):
+        return client.get(f"/provenance/verify/{manifest_ids[index % len(manifest_ids)]}")
+
+    bench("verify_manifest", send)
+
+
+def test_list_tools(bench):
+    def send(client, index):
+        return client.get("/register", params={"tenant_slug": TENANT, "limit": 50})
+
+    bench("list_tools", send)
+
+
+def test_kill_switch(bench):
+    def send(client, index):
+        body = {"tenant_slug": TENANT, "tool_name": _tool(index // 2)}
+        if index % 2:
+            return client.post("/kill/restore", json=body)
+        return client.post("/kill", json={**body, "reason": "benchmark"})
+
+    bench("kill_switch", send, concurrency=None if POSTGRES_URL else 1)
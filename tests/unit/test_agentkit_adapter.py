@@ -45,3 +45,20 @@ def test_agentkit_adapter_blocks_call(monkeypatch: pytest.MonkeyPatch):
     wrapped = adapter.wrap("demo-tool", run_tool)
     with pytest.raises(PermissionError):
         wrapped()
+
+
+def test_agentkit_adapter_reports_server_timing(monkeypatch: pytest.MonkeyPatch):
+    timings = []
+    adapter = AgentKitAdapter(
+        "http://localhost", "demo", on_timing=lambda *call: timings.append(call)
+    )
+
+    def post(url: str, json: Any | None = None, **kwargs: Any):
+        headers = {"Server-Timing": "db;dur=1.5, opa;dur=12.25, total;dur=15"}
+        return httpx.Response(200, json={"allow": True}, headers=headers)
+
+    monkeypatch.setattr(adapter._client, "post", post)
+    adapter.wrap("demo-tool", lambda: "ok")()
+
+    assert timings[0] == ("/policy/check", {"db": 1.5, "opa": 12.25, "total": 15.0})
+    assert [endpoint for endpoint, _ in timings] == ["/policy/check", "/provenance/sign"]
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from sentinel_control_plane.config import get_settings
+from sentinel_control_plane.database import async_database_url
+from sentinel_control_plane.dependencies import async_db_session, db_session
+from sentinel_control_plane.main import create_app
+from sentinel_control_plane.models import KillExpiration, RegistryState, Tenant, Tool
+
+
+@pytest.fixture
+def async_app(tmp_path, monkeypatch):
+    """An app built with ``DATABASE_ASYNC=true`` on a file-backed SQLite registry."""
+    url = f"sqlite:///{tmp_path / 'registry.db'}"
+    engine = create_engine(url)
+    for model in (Tenant, Tool, RegistryState, KillExpiration):
+        model.__table__.create(engine)
+    async_engine = create_async_engine(async_database_url(url))
+    factory = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def get_async_session():
+        session = factory()
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    async def db():
+        async with get_async_session() as session:
+            yield session
+
+    def sync_db():
+        raise AssertionError("async mode must not use the sync session")
+
+    monkeypatch.setenv("DATABASE_ASYNC", "true")
+    get_settings.cache_clear()
+    app = create_app()
+    monkeypatch.delenv("DATABASE_ASYNC")
+    get_settings.cache_clear()
+    app.dependency_overrides[async_db_session] = db
+    app.dependency_overrides[db_session] = sync_db
+    yield TestClient(app), sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def _operation(app, path: str, method: str) -> str:
+    return app.openapi()["paths"][path][method]["operationId"]
+
+
+def test_database_async_swaps_in_async_handlers(async_app):
+    client, _ = async_app
+    assert _operation(client.app, "/register", "get").startswith("list_tools_async")
+    assert _operation(client.app, "/kill", "post").startswith("trigger_kill_switch_async")
+    assert _operation(client.app, "/kill/bulk", "post").startswith("bulk_kill_switch_")
+    assert _operation(create_app(), "/register", "get").startswith("list_tools_register")
+
+
+def test_async_handlers_commit_and_roll_back_like_sync_ones(async_app):
+    client, sessions = async_app
+    tool = {"tenant_slug": "demo", "name": "crm", "url": "u", "owner": "ops", "scopes": ["a"]}
+    assert client.post("/register", json=tool).status_code == 201
+    assert client.post("/register", json=tool).status_code == 409  # rolled back
+    kill = {"tenant_slug": "demo", "tool_name": "crm", "reason": "drill", "duration_seconds": 60}
+    assert client.post("/kill", json=kill).json()["expires_at"] is not None
+
+    listed = client.get("/register")
+    assert [tool["is_active"] for tool in listed.json()] == [False]
+    assert listed.headers["etag"] == '"registry-2"'
+    assert [tool["name"] for tool in client.get("/register/search?scope=a").json()] == ["crm"]
+    assert client.get("/register/changes", params={"since": 1}).json()["version"] == 2
+    assert [tenant["slug"] for tenant in client.get("/register/tenants").json()] == ["demo"]
+
+    restore = {"tenant_slug": "demo", "tool_name": "crm"}
+    assert client.post("/kill/restore", json=restore).json()["status"] == "enabled"
+    with sessions() as session:
+        assert session.execute(select(Tool.is_active)).scalar_one() is True
+        assert session.execute(select(KillExpiration)).first() is None
+        assert session.execute(select(RegistryState.version)).scalar_one() == 3
+
+
+def test_async_database_url_picks_async_drivers():
+    assert async_database_url("sqlite:///x.db") == "sqlite+aiosqlite:///x.db"
+    assert (
+        async_database_url("postgresql://u:p@db/sentinel")
+        == "postgresql+psycopg://u:p@db/sentinel"
+    )
+    assert async_database_url("postgresql+psycopg://db/s") == "postgresql+psycopg://db/s"
+    with pytest.raises(ValueError):
+        async_database_url("mysql://db/sentinel")
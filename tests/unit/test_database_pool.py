@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from sentinel_control_plane.config import Settings
+from sentinel_control_plane.db_pool import instrument, pool_options
+from sentinel_control_plane.main import app
+
+
+def _engine(tmp_path, **overrides):
+    settings = Settings(**overrides)
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", **pool_options(settings))
+    return engine, instrument(engine, "test", settings)
+
+
+def test_pool_metrics_track_overflow_and_timeouts(tmp_path):
+    engine, metrics = _engine(
+        tmp_path, database_pool_size=1, database_max_overflow=1, database_pool_timeout=0.05
+    )
+    first, second = engine.connect(), engine.connect()
+    stats = metrics.stats(engine.pool)
+    assert (stats["checked_out"], stats["overflow_in_use"], stats["size"]) == (2, 1, 1)
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+    first.close()
+    second.close()
+
+    engine.dispose()  # the recreated pool keeps reporting into the same metrics
+    engine.connect().close()
+    stats = metrics.stats(engine.pool)
+    assert (stats["checkouts"], stats["timeouts"], stats["checked_out_peak"]) == (4, 1, 2)
+    assert stats["checked_out"] == 0 and stats["wait_ms_max"] >= 50
+
+
+@pytest.mark.parametrize(("strategy", "idle_seconds", "pinged"), [
+    ("idle", 0.0, True),
+    ("idle", 60.0, False),
+    ("never", 0.0, False),
+])
+def test_pre_ping_strategies(tmp_path, strategy, idle_seconds, pinged):
+    engine, _ = _engine(
+        tmp_path, database_pre_ping=strategy, database_pre_ping_idle_seconds=idle_seconds
+    )
+    statements: list[str] = []
+    with engine.connect() as connection:
+        connection.connection.dbapi_connection.set_trace_callback(statements.append)
+    engine.connect().close()
+    assert ("SELECT 1" in statements) is pinged
+
+
+def test_unknown_pre_ping_strategy_is_rejected():
+    with pytest.raises(ValueError):
+        pool_options(Settings(database_pre_ping="sometimes"))
+
+
+def test_pool_endpoint_reports_the_primary_engine():
+    pools = TestClient(app).get("/healthz/pool").json()
+    assert pools[0]["name"] == "primary" and pools[0]["size"] == 20
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import queue
+import threading
+from typing import Iterator, Optional
+
+from fastapi.testclient import TestClient
+
+from sentinel_control_plane.dependencies import db_session, invalidation_bus
+from sentinel_control_plane.invalidation import (
+    InvalidationBus,
+    InvalidationEvent,
+    MemoryHub,
+    MemoryTransport,
+)
+from sentinel_control_plane.main import create_app
+from sentinel_control_plane.registry_version import current_registry_version
+
+
+def _replicas(count: int, get_session, hub: MemoryHub):
+    """Independent app instances sharing one database and one in-memory bus."""
+
+    def version() -> int:
+        with get_session() as session:
+            return current_registry_version(session)
+
+    def db():
+        with get_session() as session:
+            yield session
+
+    replicas = []
+    for index in range(count):
+        bus = InvalidationBus(MemoryTransport(hub), current_version=version, replica_id=f"r{index}")
+        received: "queue.Queue[InvalidationEvent]" = queue.Queue()
+        bus.subscribe(received.put)
+        app = create_app()
+        app.dependency_overrides[db_session] = db
+        app.dependency_overrides[invalidation_bus] = _provide(bus)
+        bus.start()
+        assert bus.wait_connected(timeout=5)
+        assert received.get(timeout=5).kind == "resync"
+        replicas.append((TestClient(app), bus, received))
+    return replicas
+
+
+def _provide(bus: InvalidationBus):
+    return lambda: bus
+
+
+def _next(received: "queue.Queue[InvalidationEvent]") -> InvalidationEvent:
+    return received.get(timeout=5)
+
+
+def test_writes_on_one_replica_reach_every_replica(registry_db):
+    replicas = _replicas(3, registry_db, MemoryHub())
+    try:
+        first, second = replicas[0][0], replicas[1][0]
+        tool = {"tenant_slug": "demo", "name": "search", "url": "u", "owner": "ops"}
+        assert first.post("/register", json=tool).status_code == 201
+        for _, _, received in replicas:
+            tenant, registered = _next(received), _next(received)
+            assert (tenant.kind, tenant.tenant_slug, tenant.origin) == ("tenant", "demo", "r0")
+            assert (registered.kind, registered.tool_names) == ("tool", ("search",))
+
+        assert first.post("/register", json=tool).status_code == 409  # rolled back: no event
+        second.post("/kill", json={"tenant_slug": "demo", "reason": "drill"})
+        for _, _, received in replicas:
+            killed = _next(received)
+            assert (killed.kind, killed.tool_names, killed.origin) == ("kill", (), "r1")
+            assert killed.version == registered.version + 1
+            assert received.empty()
+    finally:
+        for _, bus, _ in replicas:
+            bus.close()
+
+
+def test_version_gap_triggers_resync():
+    hub = MemoryHub()
+    bus = InvalidationBus(MemoryTransport(hub), current_version=lambda: 12)
+    received: "queue.Queue[InvalidationEvent]" = queue.Queue()
+    bus.subscribe(received.put)
+    bus.start()
+    try:
+        assert _next(received) == InvalidationEvent("resync", 12, origin=bus.replica_id)
+        for version in (13, 13, 11, 16, 15, 17):
+            hub.broadcast(InvalidationEvent("tool", version, "demo", ("search",)).encode())
+        delivered = [_next(received) for _ in range(4)]
+    finally:
+        bus.close()
+
+    assert [(event.kind, event.version) for event in delivered] == [
+        ("tool", 13),
+        ("tool", 13),
+        ("resync", 16),
+        ("tool", 17),
+    ]
+    assert received.empty() and bus.resyncs == 2
+
+
+def test_listener_reconnects_and_resyncs_after_a_dropped_connection():
+    hub = MemoryHub()
+
+    class FlakyTransport(MemoryTransport):
+        attempts = 0
+
+        def listen(self, stop: threading.Event) -> Iterator[Optional[str]]:
+            FlakyTransport.attempts += 1
+            if FlakyTransport.attempts == 1:
+                yield None
+                raise ConnectionError("connection reset")
+            yield from super().listen(stop)
+
+    bus = InvalidationBus(
+        FlakyTransport(hub), current_version=lambda: 3, reconnect_initial_seconds=0.01
+    )
+    received: "queue.Queue[InvalidationEvent]" = queue.Queue()
+    bus.subscribe(received.put)
+    bus.start()
+    try:
+        assert [_next(received).kind for _ in range(2)] == ["resync", "resync"]
+        assert bus.wait_connected(timeout=5)
+        hub.broadcast(InvalidationEvent("kill", 4, "demo").encode())
+        assert _next(received).kind == "kill"
+    finally:
+        bus.close()
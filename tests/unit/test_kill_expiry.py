@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from sentinel_control_plane.dependencies import kill_expiry_scheduler
+from sentinel_control_plane.kill_expiry import KillExpiryScheduler
+from sentinel_control_plane.main import app
+from sentinel_control_plane.models import KillExpiration, Tool
+from sentinel_control_plane.registry_version import current_registry_version
+
+client = TestClient(app)
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = datetime.utcnow()
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def expiry(registry_db, clock):
+    scheduler = KillExpiryScheduler(registry_db, clock=clock)
+    app.dependency_overrides[kill_expiry_scheduler] = lambda: scheduler
+    for name in ("crm", "wiki"):
+        tool = {"tenant_slug": "demo", "name": name, "url": "u", "owner": "ops"}
+        assert client.post("/register", json=tool).status_code == 201
+    yield scheduler
+    app.dependency_overrides.pop(kill_expiry_scheduler, None)
+    scheduler.close()
+
+
+def _active(get_session) -> dict[str, bool]:
+    with get_session() as session:
+        return {name: active for name, active in session.execute(select(Tool.name, Tool.is_active))}
+
+
+def test_timed_kill_restores_exactly_once(registry_db, expiry, clock):
+    body = {"tenant_slug": "demo", "tool_name": "crm", "reason": "drill", "duration_seconds": 60}
+    response = client.post("/kill", json=body)
+    assert response.status_code == 200 and response.json()["expires_at"] is not None
+    assert len(expiry) == 1 and _active(registry_db) == {"crm": False, "wiki": True}
+
+    assert expiry.restore_due() == 0  # not due yet
+    clock.now += timedelta(seconds=61)
+    with registry_db() as session:
+        version = current_registry_version(session)
+    other_replica = KillExpiryScheduler(registry_db, clock=clock)
+    assert expiry.restore_due() == 1
+    assert other_replica.restore_due() == 0
+    assert _active(registry_db) == {"crm": True, "wiki": True}
+    with registry_db() as session:
+        assert current_registry_version(session) == version + 1
+        assert session.execute(select(KillExpiration)).first() is None
+
+
+def test_manual_restore_and_indefinite_kill_cancel_the_expiry(registry_db, expiry, clock):
+    timed = {"tenant_slug": "demo", "reason": "drill", "duration_seconds": 60}
+    assert client.post("/kill", json=timed).status_code == 200
+    client.post("/kill/restore", json={"tenant_slug": "demo", "tool_name": "crm"})
+    client.post("/kill", json={"tenant_slug": "demo", "tool_name": "wiki", "reason": "breach"})
+    with registry_db() as session:
+        assert session.execute(select(KillExpiration)).first() is None
+
+    clock.now += timedelta(seconds=61)
+    assert expiry.restore_due() == 0
+    assert _active(registry_db) == {"crm": True, "wiki": False}
+
+
+def test_timed_kill_never_puts_a_deadline_on_an_indefinite_kill(registry_db, expiry, clock):
+    client.post("/kill", json={"tenant_slug": "demo", "tool_name": "crm", "reason": "breach"})
+    timed = {"tenant_slug": "demo", "tool_name": "crm", "reason": "drill", "duration_seconds": 60}
+    assert client.post("/kill", json=timed).json()["expires_at"] is None
+    bulk = {"selector": {"owners": ["ops"]}, "reason": "drill", "duration_seconds": 60}
+    assert client.post("/kill/bulk", json=bulk).json()["affected_count"] == 1  # wiki only
+
+    clock.now += timedelta(seconds=61)
+    assert expiry.restore_due() == 1
+    assert _active(registry_db) == {"crm": False, "wiki": True}
+
+
+def test_bulk_timed_kill_and_restart_restores_overdue_kills(registry_db, expiry, clock):
+    body = {"selector": {"owners": ["ops"]}, "reason": "drill", "duration_seconds": 30}
+    response = client.post("/kill/bulk", json=body)
+    assert response.status_code == 200 and response.json()["expires_at"] is not None
+    bad = {**body, "action": "restore"}
+    assert client.post("/kill/bulk", json=bad).status_code == 400
+
+    clock.now += timedelta(minutes=5)  # the replica was down when the kill expired
+    restarted = KillExpiryScheduler(registry_db, clock=clock)
+    assert restarted.reload() == 1
+    assert restarted.restore_due() == 2
+    assert _active(registry_db) == {"crm": True, "wiki": True}
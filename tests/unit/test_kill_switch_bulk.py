@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from sentinel_control_plane.main import app
+from sentinel_control_plane.models import KillExpiration
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def registry(registry_db):
+    tools = [
+        {"tenant_slug": tenant, "name": name, "url": "u", "owner": owner, "scopes": scopes}
+        for tenant in ("alpha", "beta", "gamma")
+        for name, owner, scopes in (
+            ("crm", "sales", ["pii:read"]),
+            ("wiki", "docs", ["docs:read"]),
+            ("ledger", "finance", ["pii:write", "ledger:read"]),
+        )
+    ]
+    client.post("/register/bulk", json={"tools": tools})
+
+
+def _active() -> set[tuple[str, str]]:
+    tenants = {tenant["id"]: tenant["slug"] for tenant in client.get("/register/tenants").json()}
+    return {
+        (tenants[tool["tenant_id"]], tool["name"])
+        for tool in client.get("/register").json()
+        if tool["is_active"]
+    }
+
+
+def test_bulk_kill_disables_matching_tools_across_tenants(registry):
+    response = client.post(
+        "/kill/bulk",
+        json={
+            "selector": {"tenant_slugs": ["alpha", "beta"], "scopes": ["pii:read", "pii:write"]},
+            "reason": "incident",
+        },
+    )
+
+    body = response.json()
+    assert response.status_code == 200 and body["status"] == "disabled"
+    assert [(tool["tenant_slug"], tool["name"]) for tool in body["affected_tools"]] == [
+        ("alpha", "crm"),
+        ("alpha", "ledger"),
+        ("beta", "crm"),
+        ("beta", "ledger"),
+    ]
+    assert body["affected_count"] == 4 and body["committed_ms"] >= 0
+    assert ("alpha", "wiki") in _active() and ("gamma", "crm") in _active()
+    assert ("alpha", "crm") not in _active()
+
+
+def test_bulk_restore_only_reports_tools_that_change_state(registry):
+    client.post("/kill/bulk", json={"selector": {"owners": ["finance"]}, "reason": "drill"})
+    restored = client.post(
+        "/kill/bulk",
+        json={"selector": {"tool_names": ["ledger", "crm"]}, "action": "restore", "reason": "ok"},
+    ).json()
+
+    assert restored["status"] == "enabled" and restored["affected_count"] == 3
+    assert restored["unchanged_count"] == 3
+    assert {tool["name"] for tool in restored["affected_tools"]} == {"ledger"}
+    assert len(_active()) == 9
+
+
+def test_bulk_kill_rejects_empty_selectors_and_rolls_back_misses(registry):
+    version = client.get("/register/changes", params={"since": 0}).json()["version"]
+    assert client.post("/kill/bulk", json={"selector": {}, "reason": "x"}).status_code == 400
+    missing = client.post("/kill/bulk", json={"selector": {"owners": ["nobody"]}, "reason": "x"})
+    assert missing.status_code == 404
+    assert client.get("/register/changes", params={"since": 0}).json()["version"] == version
+
+
+def test_bulk_kill_of_already_disabled_tools_reports_them_unchanged(registry):
+    selector = {"selector": {"owners": ["finance"]}, "reason": "drill"}
+    assert client.post("/kill/bulk", json=selector).json()["affected_count"] == 3
+    version = client.get("/register/changes", params={"since": 0}).json()["version"]
+
+    again = client.post("/kill/bulk", json=selector)
+
+    assert again.status_code == 200
+    body = again.json()
+    assert body["affected_count"] == 0 and body["affected_tools"] == []
+    assert body["unchanged_count"] == 3
+    assert client.get("/register/changes", params={"since": 0}).json()["version"] == version
+
+
+def test_indefinite_bulk_kill_of_already_disabled_tools_cancels_their_expiry(registry, registry_db):
+    timed = {"selector": {"owners": ["finance"]}, "reason": "drill", "duration_seconds": 60}
+    assert client.post("/kill/bulk", json=timed).json()["affected_count"] == 3
+    with registry_db() as session:
+        assert len(session.execute(select(KillExpiration)).all()) == 3
+
+    indefinite = client.post(
+        "/kill/bulk", json={"selector": {"owners": ["finance"]}, "reason": "breach"}
+    )
+
+    assert indefinite.json()["affected_count"] == 0
+    assert indefinite.json()["unchanged_count"] == 3
+    with registry_db() as session:
+        assert session.execute(select(KillExpiration)).first() is None
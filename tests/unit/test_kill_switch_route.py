@@ -33,7 +33,7 @@ class _SessionStub:
         self._queue = list(queue)
         self.updated = []
 
-    def execute(self, statement):
+    def execute(self, statement, params=None):
         if self._queue:
             return self._queue.pop(0)
         self.updated.append(statement)
@@ -64,8 +64,10 @@ def _tenant_and_tool():
 def test_kill_switch_disable():
     tenant, tool = _tenant_and_tool()
     session, override = _override_session([
-        _ScalarOneResult(tenant),
-        _ScalarListResult([tool])
+        _ScalarOneResult(tenant.id),
+        _ScalarListResult([tool.id]),
+        _ScalarOneResult(7),
+        _ScalarListResult([tool.id]),  # UPDATE ... RETURNING the tools it disabled
     ])
     app.dependency_overrides[db_session] = override
     try:
@@ -88,8 +90,9 @@ def test_kill_switch_disable():
 def test_kill_switch_restore():
     tenant, tool = _tenant_and_tool()
     session, override = _override_session([
-        _ScalarOneResult(tenant),
-        _ScalarListResult([tool])
+        _ScalarOneResult(tenant.id),
+        _ScalarListResult([tool.id]),
+        _ScalarOneResult(7),
     ])
     app.dependency_overrides[db_session] = override
     try:
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from sentinel_control_plane.lookups import find_tool_ids, require_tenant_id, require_tool
+from sentinel_control_plane.main import app
+from sentinel_control_plane.models import Tool
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def registered(registry_db):
+    for tenant, name in (("acme", "crm"), ("acme", "wiki"), ("globex", "crm")):
+        tool = {"tenant_slug": tenant, "name": name, "url": "u", "owner": "ops"}
+        assert client.post("/register", json=tool).status_code == 201
+    return registry_db
+
+
+def test_require_tool_binds_each_call_to_its_own_tenant(registered):
+    with registered() as session:
+        acme = require_tool(session, "acme", "crm")
+        globex = require_tool(session, "globex", "crm")
+        assert acme.tenant_id == require_tenant_id(session, "acme")
+        assert globex.tenant_id == require_tenant_id(session, "globex")
+        assert acme.tool_id != globex.tool_id
+        assert session.get(Tool, acme.tool_id).tenant_id == acme.tenant_id
+
+
+def test_require_tool_names_what_is_missing(registered):
+    with registered() as session:
+        with pytest.raises(HTTPException) as missing_tenant:
+            require_tool(session, "initech", "crm")
+        with pytest.raises(HTTPException) as missing_tool:
+            require_tool(session, "globex", "wiki")
+    assert missing_tenant.value.status_code == missing_tool.value.status_code == 404
+    assert missing_tenant.value.detail == "Tenant 'initech' not found"
+    assert missing_tool.value.detail == "Tool 'wiki' not registered for tenant 'globex'"
+
+
+def test_find_tool_ids_with_and_without_a_name(registered):
+    with registered() as session:
+        acme = require_tenant_id(session, "acme")
+        assert len(find_tool_ids(session, acme)) == 2
+        assert find_tool_ids(session, acme, "wiki") == [require_tool(session, "acme", "wiki").tool_id]
+        assert find_tool_ids(session, acme, "missing") == []
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import json
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from sentinel_control_plane.dependencies import db_session, session_factory
+from sentinel_control_plane.main import app
+from sentinel_control_plane.manifest_index import ManifestIndexer
+from sentinel_control_plane.models import ProvenanceManifest
+from sentinel_provenance.signer import ProvenanceSigner
+from sentinel_provenance.storage import ManifestStorage, StoredManifest
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def sessions():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    ProvenanceManifest.__table__.create(engine)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+
+    @contextmanager
+    def get_session():
+        session = factory()
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    return get_session
+
+
+@pytest.fixture
+def indexed_store(tmp_path: Path, sessions):
+    indexer = ManifestIndexer(session_factory=sessions, batch_size=1000, flush_interval=60)
+    signer = ProvenanceSigner(
+        storage=ManifestStorage(tmp_path), signing_key="dev-key", on_write=indexer.record
+    )
+    for index in range(7):
+        signer.sign_action(
+            {"tenant": "demo", "tool": f"tool-{index % 2}", "action": "invoke", "payload": {"i": index}}
+        )
+    signer.sign_action({"tenant": "other", "tool": "tool-0", "action": "invoke"})
+    indexer.close()
+    return sessions
+
+
+def _override(sessions):
+    def _session_override():
+        with sessions() as session:
+            yield session
+
+    app.dependency_overrides[db_session] = _session_override
+    app.dependency_overrides[session_factory] = lambda: sessions
+
+
+def test_indexer_flushes_in_bulk(indexed_store):
+    with indexed_store() as session:
+        rows = session.execute(select(ProvenanceManifest)).scalars().all()
+    assert len(rows) == 8
+    assert all(row.size_bytes > 0 and row.storage_location.endswith(".json") for row in rows)
+
+
+def test_indexer_ignores_duplicate_rows(tmp_path: Path, sessions):
+    indexer = ManifestIndexer(session_factory=sessions, flush_interval=60)
+    storage = ManifestStorage(tmp_path)
+    signer = ProvenanceSigner(storage=storage, signing_key="dev-key", on_write=indexer.record)
+    manifest = signer.sign_action({"tenant": "demo", "tool": "tool", "action": "invoke"})
+    indexer.flush()
+    indexer.record(manifest["signature"], manifest, StoredManifest(f"{manifest['signature']}.json", 1))
+    indexer.close()
+
+    with sessions() as session:
+        assert session.execute(select(func.count()).select_from(ProvenanceManifest)).scalar_one() == 1
+
+
+def test_indexer_drops_only_the_rows_the_database_rejects(sessions):
+    with sessions() as session:  # Postgres rejects values longer than the column
+        session.execute(
+            text(
+                "CREATE TRIGGER action_length BEFORE INSERT ON provenance_manifests "
+                "WHEN length(NEW.action) > 128 BEGIN SELECT RAISE(ABORT, 'value too long'); END"
+            )
+        )
+    indexer = ManifestIndexer(session_factory=sessions, flush_interval=60)
+    for index, action in enumerate(["invoke", "a" * 129, "invoke"]):
+        manifest = {"action": {"tenant": "demo", "action": action}, "timestamp": index}
+        indexer.record(f"m-{index}", manifest, StoredManifest(f"m-{index}.json", 1))
+
+    assert indexer.flush() == 2
+    later = {"action": {"action": "invoke"}, "timestamp": 3}
+    indexer.record("m-3", later, StoredManifest("m-3.json", 1))
+    assert indexer.flush() == 1  # the rejected row is not retried with later batches
+    indexer.close()
+
+    with sessions() as session:
+        ids = session.execute(select(ProvenanceManifest.id)).scalars().all()
+    assert sorted(ids) == ["m-0", "m-2", "m-3"]
+
+
+def test_list_manifests_keyset_pagination(indexed_store):
+    _override(indexed_store)
+    try:
+        seen = []
+        cursor = None
+        while True:
+            params = {"tenant_slug": "demo", "limit": 3}
+            if cursor:
+                params["cursor"] = cursor
+            body = client.get("/provenance/manifests", params=params).json()
+            seen.extend(item["id"] for item in body["items"])
+            cursor = body["next_cursor"]
+            if cursor is None:
+                break
+        assert len(seen) == 7
+        assert len(set(seen)) == 7
+
+        tool_page = client.get(
+            "/provenance/manifests", params={"tenant_slug": "demo", "tool_name": "tool-1"}
+        ).json()
+        assert len(tool_page["items"]) == 3
+        assert client.get("/provenance/manifests", params={"cursor": "!!"}).status_code == 400
+    finally:
+        app.dependency_overrides.pop(db_session, None)
+        app.dependency_overrides.pop(session_factory, None)
+
+
+def test_export_manifests_streams_ndjson(indexed_store):
+    _override(indexed_store)
+    try:
+        response = client.get("/provenance/manifests/export", params={"tool_name": "tool-0"})
+        assert response.status_code == 200
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert len(rows) == 5
+        assert [row["timestamp"] for row in rows] == sorted(row["timestamp"] for row in rows)
+    finally:
+        app.dependency_overrides.pop(db_session, None)
+        app.dependency_overrides.pop(session_factory, None)
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import threading
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from sentinel_control_plane.dependencies import policy_client
+from sentinel_control_plane.main import app
+from sentinel_control_plane.metrics import MetricsFlusher, MetricsRegistry, time_queries
+
+client = TestClient(app)
+
+
+class _AllowAll:
+    def evaluate(self, package, input_data):
+        return {"allow": True}
+
+
+def test_threads_record_into_their_own_shards_and_sum_at_scrape():
+    registry = MetricsRegistry()
+    calls = registry.counter("calls_total", "Calls.", ("kind",))
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+
+    def work():
+        for _ in range(1000):
+            calls.inc("a")
+            latency.observe(0.5)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    samples = registry.snapshot()
+    assert samples["calls_total"][("a",)] == [4000.0]
+    assert samples["latency_seconds"][()] == [0.0, 4000.0, 0.0, 2000.0]
+    rendered = registry.render(samples)
+    assert 'latency_seconds_bucket{le="0.1"} 0' in rendered
+    assert 'latency_seconds_bucket{le="1"} 4000' in rendered
+    assert 'latency_seconds_bucket{le="+Inf"} 4000' in rendered
+    assert "latency_seconds_count 4000" in rendered
+    assert 'calls_total{kind="a"} 4000' in rendered
+
+
+def test_shards_of_exited_threads_are_retired_into_the_totals():
+    registry = MetricsRegistry()
+    calls = registry.counter("calls_total", "Calls.")
+    for _ in range(20):
+        thread = threading.Thread(target=lambda: calls.inc(amount=5))
+        thread.start()
+        thread.join()
+
+    assert len(registry._shards) == 0  # pylint: disable=protected-access
+    calls.inc()
+    assert registry.snapshot()["calls_total"][()] == [101.0]
+
+
+def test_flushers_aggregate_every_worker(tmp_path):
+    workers = [MetricsRegistry() for _ in range(2)]
+    for amount, registry in enumerate(workers, start=1):
+        registry.counter("calls_total", "Calls.").inc(amount=amount)
+    first, second = (MetricsFlusher(registry, tmp_path) for registry in workers)
+    first.flush()
+    second.flush()
+
+    workers[1].metrics["calls_total"].inc(amount=10)  # not flushed yet, but live on its worker
+    assert first.collect()["calls_total"][()] == [3.0]
+    assert second.collect()["calls_total"][()] == [13.0]
+
+
+def test_files_of_exited_workers_are_absorbed_by_a_live_one(tmp_path):
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    dead_file = tmp_path / f"{process.pid}-deadbeef.json"
+    dead_file.write_text(json.dumps({"calls_total": [[[7.0]]]}))
+    os.utime(dead_file, (0, 0))
+    live = MetricsRegistry()
+    live.counter("calls_total", "Calls.").inc(amount=1)
+    flusher = MetricsFlusher(live, tmp_path, flush_seconds=1)
+    other = MetricsFlusher(MetricsRegistry(), tmp_path)
+    assert flusher.collect()["calls_total"][()] == [8.0]
+
+    flusher.flush()
+
+    assert not dead_file.exists()
+    assert sorted(tmp_path.glob("*.json")) == [flusher.path]
+    assert flusher.collect()["calls_total"][()] == [8.0]
+    assert other.collect()["calls_total"][()] == [8.0]
+    flusher.flush()  # absorbed once, not again
+    assert other.collect()["calls_total"][()] == [8.0]
+
+
+def test_query_timing_labels_engine_and_statement_type():
+    series = 'sentinel_db_query_duration_seconds_count{engine="metrics-test",operation="SELECT"}'
+    assert series not in _scrape()
+    engine = create_engine("sqlite://")
+    time_queries(engine, "metrics-test")
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    assert f"{series} 1" in _scrape()
+
+
+def test_metrics_endpoint_reports_route_templates_and_decisions(registry_db):
+    tool = {"tenant_slug": "metrics", "name": "search", "url": "https://x", "owner": "ops"}
+    assert client.post("/register", json=tool).status_code == 201
+    app.dependency_overrides[policy_client] = lambda: _AllowAll()
+    try:
+        for _ in range(3):
+            response = client.post(
+                "/policy/check",
+                json={"tenant_slug": "metrics", "tool_name": "search", "action": "invoke"},
+            )
+            assert response.status_code == 200
+    finally:
+        app.dependency_overrides.pop(policy_client, None)
+
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert (
+        'sentinel_http_request_duration_seconds_count{method="POST",route="/policy/check",'
+        'status="200"}'
+    ) in body
+    assert 'sentinel_policy_decisions_total{tenant="metrics",decision="allow",reason=""} 3' in body
+    assert 'sentinel_opa_request_duration_seconds_count{outcome="ok"}' in body
+    client.get("/register/nowhere/at/all")
+    assert 'route="unmatched"' in _scrape()
+
+
+def _scrape() -> str:
+    return client.get("/metrics").text
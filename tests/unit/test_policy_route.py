@@ -14,7 +14,7 @@ class _FakeResult:
     def __init__(self, value):
         self._value = value
 
-    def scalar_one_or_none(self):
+    def first(self):
         return self._value
 
 
@@ -22,7 +22,7 @@ class _SessionQueue:
     def __init__(self, results):
         self._results = list(results)
 
-    def execute(self, _statement):
+    def execute(self, _statement, _params=None):
         if not self._results:
             raise AssertionError("Unexpected execute call")
         return self._results.pop(0)
@@ -48,7 +48,7 @@ client = TestClient(app)
 
 
 def _override_session(tenant, tool):
-    session = _SessionQueue([_FakeResult(tenant), _FakeResult(tool)])
+    session = _SessionQueue([_FakeResult((tenant.id, tool.id))])
 
     def _session_override():
         yield session
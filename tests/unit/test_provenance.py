@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import hashlib
+import threading
 from pathlib import Path
 
+import pytest
+
+from sentinel_provenance.cache import ManifestCache
 from sentinel_provenance.signer import ProvenanceSigner
 from sentinel_provenance.storage import ManifestStorage
 from sentinel_provenance.verifier import ProvenanceVerifier
@@ -17,3 +22,265 @@ def test_sign_and_verify(tmp_path: Path):
 
     verified = verifier.verify(manifest["signature"])
     assert verified["verified"] is True
+
+
+def test_verify_many_reports_missing_and_tampered(tmp_path: Path):
+    storage = ManifestStorage(tmp_path)
+    signer = ProvenanceSigner(storage=storage, signing_key="dev-key")
+    verifier = ProvenanceVerifier(storage=storage, signer=signer)
+
+    good = signer.sign_action({"tenant": "demo", "tool": "demo-tool", "action": "call"})
+    bad = signer.sign_action({"tenant": "demo", "tool": "demo-tool", "action": "other"})
+    tampered = storage.read(bad["signature"])
+    tampered["action"]["action"] = "forged"
+    storage.write(bad["signature"], tampered)
+
+    results = {
+        result["manifest_id"]: result
+        for result in verifier.verify_many(
+            [good["signature"], bad["signature"], "missing"], workers=2, batch_size=1
+        )
+    }
+
+    assert results[good["signature"]]["verified"] is True
+    assert results[bad["signature"]]["error"] == "signature_mismatch"
+    assert results["missing"]["error"] == "missing"
+
+
+def test_verify_many_reports_unreadable_manifests_even_when_skipping_missing(tmp_path: Path):
+    storage = ManifestStorage(tmp_path)
+    signer = ProvenanceSigner(storage=storage, signing_key="dev-key")
+    verifier = ProvenanceVerifier(storage=storage, signer=signer)
+    corrupt = signer.sign_action({"tenant": "demo", "tool": "demo-tool", "action": "call"})
+    (tmp_path / f"{corrupt['signature']}.json").write_bytes(b"{not json")
+
+    results = list(verifier.verify_many([corrupt["signature"], "missing"], skip_missing=True))
+
+    assert results == [{"manifest_id": corrupt["signature"], "verified": False, "error": "unreadable"}]
+
+
+def test_verify_many_scans_store_with_selector(tmp_path: Path):
+    storage = ManifestStorage(tmp_path)
+    signer = ProvenanceSigner(storage=storage, signing_key="dev-key")
+    verifier = ProvenanceVerifier(storage=storage, signer=signer)
+
+    for index in range(10):
+        signer.sign_action({"tenant": f"tenant-{index % 2}", "tool": "demo-tool", "action": str(index)})
+
+    results = list(
+        verifier.verify_many(selector=lambda manifest: manifest["action"]["tenant"] == "tenant-0")
+    )
+    assert len(results) == 5
+    assert all(result["verified"] for result in results)
+
+
+def test_compressed_storage_round_trips_with_dictionary(tmp_path: Path):
+    storage = ManifestStorage(tmp_path, compression="zlib", dictionary_scope="tool")
+    signer = ProvenanceSigner(storage=storage, signing_key="dev-key")
+    verifier = ProvenanceVerifier(storage=storage, signer=signer)
+    action = {"tenant": "demo", "tool": "demo-tool", "action": "call", "payload": {"query": "docs"}}
+
+    before = signer.sign_action(action)
+    dict_id = storage.train_dictionary(
+        storage.dictionary_scope_key(before), [storage.read(before["signature"])] * 3
+    )
+    after = signer.sign_action(action)
+
+    assert dict_id is not None
+    assert (tmp_path / f"{after['signature']}.json.z").read_bytes().startswith(b"SMZ1")
+    assert verifier.verify(before["signature"])["verified"] is True
+    assert verifier.verify(after["signature"])["verified"] is True
+
+
+def test_recompress_converts_plain_manifests(tmp_path: Path):
+    plain = ManifestStorage(tmp_path)
+    signer = ProvenanceSigner(storage=plain, signing_key="dev-key")
+    manifest = signer.sign_action({"tenant": "demo", "tool": "demo-tool", "action": "call"})
+
+    compressed = ManifestStorage(tmp_path, compression="zlib")
+    before, after = compressed.recompress(manifest["signature"])
+
+    assert after < before
+    assert not (tmp_path / f"{manifest['signature']}.json").exists()
+    assert plain.read(manifest["signature"]) == manifest
+
+
+def test_verify_cache_serves_hot_manifests_without_storage(tmp_path: Path):
+    storage = ManifestStorage(tmp_path)
+    signer = ProvenanceSigner(storage=storage, signing_key="dev-key")
+    cache = ManifestCache(max_bytes=1024 * 1024)
+    verifier = ProvenanceVerifier(storage=storage, signer=signer, cache=cache)
+    manifest = signer.sign_action({"tenant": "demo", "tool": "demo-tool", "action": "call"})
+
+    assert verifier.verify(manifest["signature"])["verified"] is True
+    (tmp_path / f"{manifest['signature']}.json").unlink()
+    assert verifier.verify(manifest["signature"])["verified"] is True
+    assert cache.stats()["hits"] == 1 and cache.stats()["hit_rate"] == 0.5
+
+    rotated = ProvenanceVerifier(
+        storage=storage, signer=ProvenanceSigner(storage=storage, signing_key="new-key"), cache=cache
+    )
+    with pytest.raises(FileNotFoundError):
+        rotated.verify(manifest["signature"])
+
+
+def test_verify_cache_evicts_least_recently_used_by_bytes(tmp_path: Path):
+    storage = ManifestStorage(tmp_path)
+    signer = ProvenanceSigner(storage=storage, signing_key="dev-key")
+    manifests = [
+        signer.sign_action({"tenant": "demo", "tool": "demo-tool", "action": str(index)})
+        for index in range(3)
+    ]
+    largest = max(_cached_bytes(storage, signer, manifest["signature"]) for manifest in manifests)
+    cache = ManifestCache(max_bytes=largest * 2)
+    verifier = ProvenanceVerifier(storage=storage, signer=signer, cache=cache)
+
+    for manifest in manifests:
+        verifier.verify(manifest["signature"])
+
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["evictions"] == 1
+    assert stats["bytes"] <= stats["max_bytes"]
+    assert cache.get(manifests[0]["signature"], signer.key_id) is None
+
+
+def test_verify_cache_counts_parsed_manifests_not_stored_bytes(tmp_path: Path):
+    storage = ManifestStorage(tmp_path, compression="zlib")
+    signer = ProvenanceSigner(storage=storage, signing_key="dev-key")
+    manifest = signer.sign_action(
+        {"tenant": "demo", "tool": "demo-tool", "action": "call", "payload": {"rows": ["x"] * 500}}
+    )
+
+    # 500 list slots and their references compress to a few dozen bytes on disk.
+    assert _cached_bytes(storage, signer, manifest["signature"]) > 10 * storage.stored_size(
+        manifest["signature"]
+    )
+
+
+def test_verify_cache_drops_deleted_and_aged_manifests(tmp_path: Path):
+    now = [0.0]
+    storage = ManifestStorage(tmp_path)
+    signer = ProvenanceSigner(storage=storage, signing_key="dev-key")
+    cache = ManifestCache(max_age_seconds=60, clock=lambda: now[0])
+    storage.add_delete_listener(cache.invalidate_many)
+    verifier = ProvenanceVerifier(storage=storage, signer=signer, cache=cache)
+    deleted, aged = (
+        signer.sign_action({"tenant": "demo", "tool": "demo-tool", "action": str(index)})
+        for index in range(2)
+    )
+    verifier.verify(deleted["signature"])
+    verifier.verify(aged["signature"])
+
+    storage.delete(deleted["signature"])
+    with pytest.raises(FileNotFoundError):
+        verifier.verify(deleted["signature"])
+
+    (tmp_path / f"{aged['signature']}.json").unlink()  # deleted by another process
+    assert verifier.verify(aged["signature"])["verified"] is True
+    now[0] = 61.0
+    with pytest.raises(FileNotFoundError):
+        verifier.verify(aged["signature"])
+    assert cache.stats()["entries"] == 0 and cache.stats()["bytes"] == 0
+
+
+def _cached_bytes(storage: ManifestStorage, signer: ProvenanceSigner, manifest_id: str) -> int:
+    cache = ManifestCache()
+    ProvenanceVerifier(storage=storage, signer=signer, cache=cache).verify(manifest_id)
+    return cache.stats()["bytes"]
+
+
+def test_dedup_payloads_store_each_payload_once(tmp_path: Path):
+    storage = ManifestStorage(tmp_path, compression="zlib", dedup_payloads=True, dedup_min_bytes=64)
+    signer = ProvenanceSigner(storage=storage, signing_key="dev-key")
+    verifier = ProvenanceVerifier(storage=storage, signer=signer)
+    document = {"title": "Quarterly report", "body": "revenue " * 200, "z": 1, "a": [1, 2]}
+
+    manifests = [
+        signer.sign_action(
+            {"tenant": "demo", "tool": "search", "action": str(index), "payload": document, "extra": 1}
+        )
+        for index in range(5)
+    ]
+    small = signer.sign_action({"tenant": "demo", "tool": "search", "action": "x", "payload": {"q": 1}})
+
+    assert len(list((tmp_path / "_payloads").iterdir())) == 1
+    assert all(verifier.verify(m["signature"])["verified"] for m in [*manifests, small])
+    restored = storage.read(manifests[0]["signature"])
+    assert restored["action"] == manifests[0]["action"]
+    assert list(restored["action"]) == ["tenant", "tool", "action", "payload", "extra"]
+    assert "payload_ref" not in restored
+
+    stats = storage.payload_stats()
+    assert stats["blobs"] == 1 and stats["references"] == 5
+    assert stats["dedup_ratio"] > 5
+
+
+def test_deleting_manifests_releases_payload_blobs(tmp_path: Path):
+    storage = ManifestStorage(tmp_path, dedup_payloads=True, dedup_min_bytes=16)
+    signer = ProvenanceSigner(storage=storage, signing_key="dev-key")
+    first, second = (
+        signer.sign_action({"tenant": "demo", "tool": "t", "action": str(i), "payload": {"doc": "x" * 64}})
+        for i in range(2)
+    )
+
+    storage.delete(first["signature"])
+    assert storage.payload_stats()["references"] == 1
+    assert storage.read(second["signature"])["action"]["payload"] == {"doc": "x" * 64}
+
+    storage.delete(second["signature"])
+    assert storage.payload_stats()["references"] == 0
+    assert storage.collect_payloads(grace_ms=1000, now_ms=0) == 0  # first pass only marks
+    assert storage.collect_payloads(grace_ms=1000, now_ms=500) == 0
+    assert storage.collect_payloads(grace_ms=1000, now_ms=1000) == 1
+    assert storage.payload_stats()["blobs"] == 0
+    assert not list((tmp_path / "_payloads").iterdir())
+
+
+def test_payload_counts_of_writers_sharing_a_backend_add_up(tmp_path: Path):
+    replicas = [
+        ManifestStorage(tmp_path, dedup_payloads=True, dedup_min_bytes=16) for _ in range(4)
+    ]
+    action = {"tenant": "demo", "tool": "t", "action": "a", "payload": {"doc": "x" * 64}}
+
+    def write(storage: ManifestStorage, replica: int) -> None:
+        for index in range(25):
+            storage.write(f"m-{replica}-{index}", {"action": action, "signature": "s"})
+
+    threads = [
+        threading.Thread(target=write, args=(storage, replica))
+        for replica, storage in enumerate(replicas)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert replicas[0].payload_stats()["references"] == 100
+
+    for index in range(25):  # one replica's retention job releases another's references
+        replicas[1].delete(f"m-0-{index}")
+    assert replicas[2].payload_stats()["references"] == 75
+    assert replicas[3].collect_payloads(grace_ms=0, now_ms=0) == 0
+    assert replicas[3].read("m-3-0")["action"]["payload"] == {"doc": "x" * 64}
+
+
+def test_attachments_are_moved_into_the_store_and_collected(tmp_path: Path):
+    storage = ManifestStorage(tmp_path / "store")
+    signer = ProvenanceSigner(storage=storage, signing_key="dev-key")
+    body = b"raw-bytes" * 100
+    digest = hashlib.sha256(body).hexdigest()
+    manifests = []
+    for index in range(2):
+        spool = tmp_path / f"upload-{index}.part"
+        spool.write_bytes(body)
+        assert storage.add_attachment(digest, spool) == len(body)
+        action = {"tenant": "demo", "tool": "t", "action": "upload", "payload": {"sha256": digest}}
+        manifests.append(signer.sign_action(action, attachment_ref=digest))
+
+    assert storage.read_attachment(digest) == body
+    assert storage.read(manifests[0]["signature"])["attachment_ref"] == digest
+    for manifest in manifests:
+        storage.delete(manifest["signature"])
+    assert storage.collect_payloads(grace_ms=0, now_ms=0) == 0  # first pass only marks
+    assert storage.collect_payloads(grace_ms=0, now_ms=0) == 1
+    with pytest.raises(FileNotFoundError):
+        storage.read_attachment(digest)
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import re
+import socket
+from pathlib import Path
+from typing import Dict
+from urllib.parse import unquote
+from xml.sax.saxutils import escape
+
+import httpx
+import pytest
+
+from sentinel_control_plane.config import Settings
+from sentinel_control_plane.dependencies import _chain_id, _journal_path
+from sentinel_provenance.backends import S3Backend
+from sentinel_provenance.signer import ProvenanceSigner
+from sentinel_provenance.storage import ManifestStorage
+from sentinel_provenance.verifier import ProvenanceVerifier
+from sentinel_provenance.writer import GroupCommitWriter
+
+S3_XMLNS = "http://s3.amazonaws.com/doc/2006-03-01/"
+
+
+class FakeS3:
+    """In-process stand-in for the subset of the S3 API the backend uses."""
+
+    def __init__(self) -> None:
+        self.objects: Dict[str, bytes] = {}
+        self.uploads: Dict[str, Dict[int, bytes]] = {}
+        self.requests: list[tuple[str, str]] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        assert re.match(
+            r"AWS4-HMAC-SHA256 Credential=test-key/\d{8}/us-east-1/s3/aws4_request, ",
+            request.headers["authorization"],
+        )
+        bucket, _, key = unquote(request.url.path).lstrip("/").partition("/")
+        assert bucket == "manifests"
+        params = request.url.params
+        self.requests.append((request.method, key))
+        if request.method == "GET" and not key:
+            return self._list(
+                params.get("prefix", ""),
+                int(params.get("max-keys", "2")),
+                params.get("continuation-token"),
+            )
+        if request.method == "POST" and "uploads" in params:
+            upload_id = f"upload-{len(self.uploads)}"
+            self.uploads[upload_id] = {}
+            return httpx.Response(
+                200,
+                text=f'<InitiateMultipartUploadResult xmlns="{S3_XMLNS}"><UploadId>{upload_id}</UploadId></InitiateMultipartUploadResult>',
+            )
+        if request.method == "PUT" and "partNumber" in params:
+            self.uploads[params["uploadId"]][int(params["partNumber"])] = request.content
+            return httpx.Response(200, headers={"ETag": f'"etag-{params["partNumber"]}"'})
+        if request.method == "POST" and "uploadId" in params:
+            parts = self.uploads.pop(params["uploadId"])
+            self.objects[key] = b"".join(parts[number] for number in sorted(parts))
+            return httpx.Response(200)
+        if request.method == "PUT":
+            self.objects[key] = request.content
+            return httpx.Response(200)
+        if request.method == "GET":
+            if key not in self.objects:
+                return httpx.Response(404)
+            return httpx.Response(200, content=self.objects[key])
+        if request.method == "DELETE":
+            self.objects.pop(key, None)
+            return httpx.Response(204)
+        return httpx.Response(405)
+
+    def _list(self, prefix: str, page_size: int, token: str | None) -> httpx.Response:
+        keys = sorted(
+            key for key in self.objects if key.startswith(prefix) and "/" not in key[len(prefix) :]
+        )
+        start = int(token) if token else 0
+        page = keys[start : start + page_size]
+        truncated = start + page_size < len(keys)
+        body = "".join(f"<Contents><Key>{escape(key)}</Key></Contents>" for key in page)
+        if truncated:
+            body += f"<NextContinuationToken>{start + page_size}</NextContinuationToken>"
+        return httpx.Response(
+            200,
+            text=f'<ListBucketResult xmlns="{S3_XMLNS}"><IsTruncated>{str(truncated).lower()}</IsTruncated>{body}</ListBucketResult>',
+        )
+
+
+@pytest.fixture()
+def fake_s3() -> FakeS3:
+    return FakeS3()
+
+
+def _backend(fake_s3: FakeS3, **kwargs) -> S3Backend:
+    return S3Backend(
+        bucket="manifests",
+        endpoint_url="http://s3.local",
+        access_key="test-key",
+        secret_key="test-secret",
+        prefix="sentinel",
+        transport=httpx.MockTransport(fake_s3),
+        **kwargs,
+    )
+
+
+def test_s3_backend_round_trips_signed_chain(fake_s3: FakeS3, tmp_path: Path):
+    storage = ManifestStorage(backend=_backend(fake_s3), compression="zlib")
+    writer = GroupCommitWriter(storage, journal_path=tmp_path / "journal")
+    writer.start()
+    signer = ProvenanceSigner(storage, "dev-key", checkpoint_interval=2, writer=writer)
+    manifests = [
+        signer.sign_action({"tenant": "demo", "tool": "tool", "action": f"a{i}"}) for i in range(5)
+    ]
+    writer.close()
+
+    assert all(key.startswith("sentinel/") for key in fake_s3.objects)
+    verifier = ProvenanceVerifier(storage, ProvenanceSigner(storage, "dev-key"))
+    assert sorted(storage.iter_ids()) == sorted(m["signature"] for m in manifests)
+    assert verifier.verify_chain("demo")["verified"] is True
+    assert all(result["verified"] for result in verifier.verify_many())
+
+
+def test_s3_backend_uploads_large_objects_in_parts(fake_s3: FakeS3):
+    backend = _backend(fake_s3, multipart_threshold=1024, part_size=1000)
+    payload = bytes(range(256)) * 10
+
+    location = backend.put("big.bin", payload)
+
+    assert location == "s3://manifests/sentinel/big.bin"
+    assert fake_s3.objects["sentinel/big.bin"] == payload
+    assert ("PUT", "sentinel/big.bin") in fake_s3.requests
+    assert sum(1 for method, _ in fake_s3.requests if method == "PUT") == 3
+    assert not fake_s3.uploads
+
+
+def test_s3_backend_uploads_files_in_parts(fake_s3: FakeS3, tmp_path: Path):
+    backend = _backend(fake_s3, multipart_threshold=1024, part_size=1000)
+    payload = bytes(range(256)) * 10
+    source = tmp_path / "upload.part"
+    source.write_bytes(payload)
+
+    backend.put_file("_attachments/big", source)
+
+    assert fake_s3.objects["sentinel/_attachments/big"] == payload
+    assert sum(1 for method, _ in fake_s3.requests if method == "PUT") == 3
+
+
+def test_s3_backend_serves_immutable_reads_from_cache(fake_s3: FakeS3, tmp_path: Path):
+    backend = _backend(fake_s3, cache_dir=tmp_path / "cache", cache_max_bytes=100)
+    fake_s3.objects["sentinel/a.json"] = b"a" * 60
+    fake_s3.objects["sentinel/b.json"] = b"b" * 60
+    fake_s3.objects["sentinel/_meta/chains/demo.json"] = b"{}"
+
+    for key in ("a.json", "a.json", "_meta/chains/demo.json", "_meta/chains/demo.json"):
+        backend.get(key)
+    backend.get("b.json")  # evicts a.json: the cache is bounded to 100 bytes
+    backend.get("a.json")
+
+    gets = [key for method, key in fake_s3.requests if method == "GET"]
+    assert gets.count("sentinel/a.json") == 2
+    assert gets.count("sentinel/_meta/chains/demo.json") == 2
+    with pytest.raises(FileNotFoundError):
+        backend.get("missing.json")
+
+
+def test_signers_with_chain_ids_keep_separate_chains(tmp_path: Path):
+    storage = ManifestStorage(tmp_path)
+    first = ProvenanceSigner(storage, "dev-key", chain_id="replica-a")
+    second = ProvenanceSigner(storage, "dev-key", chain_id="replica-b")
+    for _ in range(3):
+        first.sign_action({"tenant": "demo", "tool": "tool", "action": "invoke"})
+        second.sign_action({"tenant": "demo", "tool": "tool", "action": "invoke"})
+
+    verifier = ProvenanceVerifier(storage, ProvenanceSigner(storage, "dev-key"))
+    reports = list(verifier.verify_chains())
+    assert [report["tenant"] for report in reports] == ["demo@replica-a", "demo@replica-b"]
+    assert all(report["verified"] and report["head_seq"] == 3 for report in reports)
+
+
+def test_each_chain_id_gets_its_own_journal_and_shared_stores_a_chain_per_host():
+    local = Settings(provenance_path="/srv/provenance")
+    assert _chain_id(local) is None
+    assert _journal_path(local) == Path("/srv/provenance.journal")
+    worker = Settings(provenance_path="/srv/provenance", provenance_chain_id="worker-2")
+    assert _chain_id(worker) == "worker-2"
+    assert _journal_path(worker) == Path("/srv/provenance.worker-2.journal")
+    assert _chain_id(Settings(provenance_backend="s3")) == socket.gethostname()
+
+
+def test_startup_settings_redact_s3_credentials():
+    settings = Settings(provenance_s3_access_key="AKIAEXAMPLE", provenance_s3_secret_key="secret")
+    logged = settings.as_dict()
+    assert logged["provenance_s3_access_key"] == "***redacted***"
+    assert logged["provenance_s3_secret_key"] == "***redacted***"
+    assert "AKIAEXAMPLE" not in str(logged)
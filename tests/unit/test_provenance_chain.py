@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from sentinel_provenance import compression as codec
+from sentinel_provenance.signer import ProvenanceSigner
+from sentinel_provenance.storage import ManifestStorage
+from sentinel_provenance.verifier import ProvenanceVerifier
+
+
+def _build(tmp_path: Path, interval: int = 5):
+    storage = ManifestStorage(tmp_path)
+    signer = ProvenanceSigner(storage=storage, signing_key="dev-key", checkpoint_interval=interval)
+    return storage, signer, ProvenanceVerifier(storage=storage, signer=signer)
+
+
+def _sign(signer: ProvenanceSigner, count: int, tenant: str = "demo"):
+    return [
+        signer.sign_action({"tenant": tenant, "tool": "demo-tool", "action": f"call-{index}"})
+        for index in range(count)
+    ]
+
+
+def test_manifests_link_to_previous_per_tenant(tmp_path: Path):
+    _, signer, _ = _build(tmp_path)
+    first, second = _sign(signer, 2)
+    other = _sign(signer, 1, tenant="other")[0]
+
+    assert first["chain"] == {"tenant": "demo", "seq": 1, "prev": None}
+    assert second["chain"]["prev"] == first["signature"]
+    assert other["chain"]["seq"] == 1
+
+
+def test_full_chain_verification_passes(tmp_path: Path):
+    _, signer, verifier = _build(tmp_path)
+    _sign(signer, 12)
+
+    report = verifier.verify_chain("demo", full=True)
+    assert report["verified"] is True
+    assert report["checked"] == 12
+
+
+def test_incremental_verification_resumes_from_checkpoint(tmp_path: Path):
+    _, signer, verifier = _build(tmp_path, interval=5)
+    _sign(signer, 12)
+    assert verifier.verify_chain("demo")["checked"] == 12
+
+    _sign(signer, 4)
+    report = verifier.verify_chain("demo")
+    assert report["verified"] is True
+    assert report["resumed_from_seq"] == 10
+    assert report["checked"] == 6
+
+
+def test_deleted_manifest_is_detected(tmp_path: Path):
+    storage, signer, verifier = _build(tmp_path)
+    manifests = _sign(signer, 6)
+    (tmp_path / f"{manifests[2]['signature']}.json").unlink()
+
+    report = verifier.verify_chain("demo", full=True)
+    assert report["verified"] is False
+    assert "seq 3" in report["errors"][0]
+
+
+def test_corrupt_manifests_are_reported_as_broken_links(tmp_path: Path):
+    storage = ManifestStorage(tmp_path, compression="zlib")
+    signer = ProvenanceSigner(storage=storage, signing_key="dev-key")
+    verifier = ProvenanceVerifier(storage=storage, signer=signer)
+    manifests = _sign(signer, 4)
+    damaged = tmp_path / f"{manifests[2]['signature']}.json.z"
+    damaged.write_bytes(codec.MAGIC + b"\x00" + b"not a zlib stream")
+
+    report = verifier.verify_chain("demo", full=True)
+    assert report["verified"] is False
+    assert report["errors"] == [f"seq 3: manifest {manifests[2]['signature']} is unreadable"]
+
+    (tmp_path / f"{manifests[3]['signature']}.json.z").write_bytes(b"{not json")
+    assert "seq 4" in verifier.verify_chain("demo", full=True)["errors"][0]
+
+
+def test_truncated_chain_is_detected(tmp_path: Path):
+    storage, signer, verifier = _build(tmp_path, interval=5)
+    manifests = _sign(signer, 7)
+    storage.write_record(
+        "chains",
+        "demo",
+        {"seq": 3, "manifest_id": manifests[2]["signature"], "timestamp": manifests[2]["timestamp"]},
+    )
+
+    report = verifier.verify_chain("demo", full=True)
+    assert report["verified"] is False
+    assert any("behind signed checkpoint 5" in error for error in report["errors"])
+
+
+def test_signer_resumes_chain_from_stored_head(tmp_path: Path):
+    storage, signer, verifier = _build(tmp_path)
+    _sign(signer, 3)
+    restarted = ProvenanceSigner(storage=storage, signing_key="dev-key")
+    manifest = _sign(restarted, 1)[0]
+
+    assert manifest["chain"]["seq"] == 4
+    assert verifier.verify_chain("demo", full=True)["verified"] is True
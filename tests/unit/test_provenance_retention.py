@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+from sentinel_provenance.cache import ManifestCache
+from sentinel_provenance.retention import DAY_MS, RetentionEngine, RetentionPolicy
+from sentinel_provenance.signer import RETENTION_FLOOR_NAMESPACE, ProvenanceSigner
+from sentinel_provenance.storage import ManifestStorage
+from sentinel_provenance.verifier import ProvenanceVerifier
+
+
+def _store(tmp_path: Path, count: int = 10, **storage_kwargs):
+    storage = ManifestStorage(tmp_path, **storage_kwargs)
+    signer = ProvenanceSigner(storage, "dev-key", checkpoint_interval=4)
+    manifests = [
+        signer.sign_action(
+            {"tenant": "demo", "tool": "tool", "action": str(index), "payload": {"doc": "x" * 64}}
+        )
+        for index in range(count)
+    ]
+    return storage, signer, manifests
+
+
+def _days_later(days: float):
+    return lambda: time.time() + days * DAY_MS / 1000
+
+
+def test_aged_manifests_are_archived_and_stay_verifiable(tmp_path: Path):
+    storage, signer, manifests = _store(tmp_path)
+    engine = RetentionEngine(
+        storage, signer, {"demo": RetentionPolicy(hot_days=30)}, clock=_days_later(31)
+    )
+
+    report = engine.run()
+
+    assert report["archived"] == 10 and report["segments_written"] == 1
+    assert list(storage.iter_ids()) == []
+    assert len(list((tmp_path / "_archive" / "demo").iterdir())) == 1
+    verifier = ProvenanceVerifier(storage, signer)
+    assert verifier.verify(manifests[3]["signature"])["verified"] is True
+    assert storage.read(manifests[3]["signature"])["action"] == manifests[3]["action"]
+    assert verifier.verify_chain("demo", full=True)["verified"] is True
+    assert sum(result["verified"] for result in verifier.verify_many()) == 10
+
+
+def test_runs_are_bounded_and_resume_from_cursor(tmp_path: Path):
+    storage, signer, _ = _store(tmp_path)
+    engine = RetentionEngine(
+        storage,
+        signer,
+        {},
+        default_policy=RetentionPolicy(hot_days=30),
+        max_manifests=4,
+        clock=_days_later(31),
+    )
+
+    reports = [engine.run() for _ in range(3)]
+
+    assert [report["scanned"] for report in reports] == [4, 4, 2]
+    assert [report["pass_complete"] for report in reports] == [False, False, True]
+    assert len(list(storage.iter_archived_ids())) == 10
+    assert engine.run()["scanned"] == 0
+
+
+def test_policies_are_per_tenant(tmp_path: Path):
+    storage, signer, _ = _store(tmp_path, count=2)
+    signer.sign_action({"tenant": "other", "tool": "tool", "action": "keep"})
+    engine = RetentionEngine(
+        storage, signer, {"demo": RetentionPolicy(hot_days=30)}, clock=_days_later(31)
+    )
+
+    engine.run()
+
+    hot = [storage.read(manifest_id)["action"]["tenant"] for manifest_id in storage.iter_ids()]
+    assert hot == ["other"]
+
+
+def test_expired_manifests_are_deleted_behind_a_signed_floor(tmp_path: Path):
+    storage, signer, manifests = _store(tmp_path, dedup_payloads=True, dedup_min_bytes=16)
+    cache = ManifestCache()
+    storage.add_delete_listener(cache.invalidate_many)
+    cached = ProvenanceVerifier(storage, signer, cache=cache)
+    policies = {"demo": RetentionPolicy(hot_days=30, delete_after_days=90)}
+    RetentionEngine(storage, signer, policies, clock=_days_later(31)).run()
+    assert cached.verify(manifests[0]["signature"])["verified"] is True  # from the archive
+    fresh = signer.sign_action({"tenant": "demo", "tool": "tool", "action": "fresh"})
+
+    report = RetentionEngine(
+        storage, signer, policies, payload_grace_seconds=0, clock=_days_later(91)
+    ).run()
+
+    # The clock runs 91 days ahead, so the newly signed manifest has expired as well.
+    assert report["segments_deleted"] == 1 and report["deleted"] == 11
+    assert list(storage.iter_archived_ids()) == []
+    floor = storage.read_record(RETENTION_FLOOR_NAMESPACE, "demo")
+    assert floor["seq"] == 11 and floor["manifest_id"] == fresh["signature"]
+    assert cache.stats()["entries"] == 0
+    with pytest.raises(FileNotFoundError):
+        cached.verify(manifests[0]["signature"])
+
+    signer.sign_action({"tenant": "demo", "tool": "tool", "action": "after"})
+    verifier = ProvenanceVerifier(storage, signer)
+    report = verifier.verify_chain("demo", full=True)
+    assert report["verified"] is True and report["resumed_from_seq"] == 11
+
+    storage.write_record(RETENTION_FLOOR_NAMESPACE, "demo", {**floor, "seq": 12})
+    assert verifier.verify_chain("demo", full=True)["verified"] is False
+
+
+def test_payload_blobs_are_collected_after_grace(tmp_path: Path):
+    storage, signer, _ = _store(tmp_path, count=3, dedup_payloads=True, dedup_min_bytes=16)
+    engine = RetentionEngine(
+        storage,
+        signer,
+        {"demo": RetentionPolicy(delete_after_days=1)},
+        payload_grace_seconds=0,
+        clock=_days_later(2),
+    )
+
+    first, second = engine.run(), engine.run()
+
+    assert first["deleted"] == 3 and first["payloads_collected"] == 0
+    assert second["payloads_collected"] == 1
+    assert not list((tmp_path / "_payloads").iterdir())
+
+
+def test_reads_are_throttled_to_the_byte_budget(tmp_path: Path):
+    storage, signer, _ = _store(tmp_path, count=4)
+    sleeps = []
+    now = [1_000.0]
+    engine = RetentionEngine(
+        storage,
+        signer,
+        {},
+        max_bytes_per_second=100,
+        clock=lambda: now[0],
+        sleep=sleeps.append,
+    )
+
+    report = engine.run()
+
+    assert report["scanned"] == 4
+    assert sleeps[-1] == report["bytes_read"] / 100
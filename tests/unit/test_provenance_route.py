@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from sentinel_control_plane.config import Settings
+from sentinel_control_plane.dependencies import (
+    db_session,
+    provenance_signer,
+    provenance_storage,
+    provenance_verifier,
+    session_factory,
+    settings_provider,
+)
+from sentinel_control_plane.main import app
+from sentinel_control_plane.manifest_index import ManifestIndexer
+from sentinel_control_plane.models import ProvenanceManifest
+from sentinel_provenance.signer import ProvenanceSigner
+from sentinel_provenance.storage import ManifestStorage
+from sentinel_provenance.verifier import ProvenanceVerifier
+
+client = TestClient(app)
+
+
+class _RowResult:
+    def __init__(self, row):
+        self._row = row
+
+    def first(self):
+        return self._row
+
+
+class _SessionStub:
+    def __init__(self, results):
+        self._results = list(results)
+
+    def execute(self, statement, params=None):
+        return self._results.pop(0)
+
+
+def _override_stream(tmp_path: Path, max_bytes: int = 1024):
+    storage = ManifestStorage(tmp_path / "store")
+    signer = ProvenanceSigner(storage=storage, signing_key="dev-key")
+    tenant = SimpleNamespace(id=uuid.uuid4(), slug="demo")
+    tool = SimpleNamespace(id=uuid.uuid4(), tenant_id=tenant.id, name="demo-tool")
+
+    def session():
+        yield _SessionStub([_RowResult((tenant.id, tool.id))])
+
+    settings = Settings(
+        provenance_stream_max_bytes=max_bytes, provenance_spool_dir=str(tmp_path / "spool")
+    )
+    app.dependency_overrides.update(
+        {
+            db_session: session,
+            provenance_signer: lambda: signer,
+            provenance_storage: lambda: storage,
+            settings_provider: lambda: settings,
+        }
+    )
+    return storage, signer
+
+
+def _verifier(tmp_path: Path):
+    storage = ManifestStorage(tmp_path)
+    signer = ProvenanceSigner(storage=storage, signing_key="dev-key")
+    return signer, ProvenanceVerifier(storage=storage, signer=signer)
+
+
+def test_verify_batch_streams_results_and_summary(tmp_path: Path):
+    signer, verifier = _verifier(tmp_path)
+    manifest_ids = [
+        signer.sign_action({"tenant": "demo", "tool": "demo-tool", "action": str(index)})["signature"]
+        for index in range(3)
+    ]
+    app.dependency_overrides[provenance_verifier] = lambda: verifier
+    try:
+        response = client.post(
+            "/provenance/verify-batch",
+            json={"manifest_ids": manifest_ids + ["missing"]},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        results, summary = lines[:-1], lines[-1]["summary"]
+        assert {result["manifest_id"] for result in results} == set(manifest_ids) | {"missing"}
+        assert summary["total"] == 4
+        assert summary["failed"] == 1
+        assert summary["errors"] == {"missing": 1}
+    finally:
+        app.dependency_overrides.pop(provenance_verifier, None)
+
+
+def _indexed_sessions():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    ProvenanceManifest.__table__.create(engine)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+
+    @contextmanager
+    def get_session():
+        session = factory()
+        try:
+            yield session
+            session.commit()
+        finally:
+            session.close()
+
+    return get_session
+
+
+def _verify_filtered(verifier, sessions, settings, body):
+    app.dependency_overrides.update(
+        {
+            provenance_verifier: lambda: verifier,
+            session_factory: lambda: sessions,
+            settings_provider: lambda: settings,
+        }
+    )
+    try:
+        response = client.post("/provenance/verify-batch", json=body)
+    finally:
+        for dependency in (provenance_verifier, session_factory, settings_provider):
+            app.dependency_overrides.pop(dependency, None)
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_verify_batch_filters_by_tenant_and_time(tmp_path: Path):
+    sessions = _indexed_sessions()
+    indexer = ManifestIndexer(session_factory=sessions, flush_interval=60)
+    storage = ManifestStorage(tmp_path)
+    signer = ProvenanceSigner(storage=storage, signing_key="dev-key", on_write=indexer.record)
+    verifier = ProvenanceVerifier(storage=storage, signer=signer)
+    kept = signer.sign_action({"tenant": "demo", "tool": "demo-tool", "action": "call"})
+    deleted = signer.sign_action({"tenant": "demo", "tool": "demo-tool", "action": "call"})
+    signer.sign_action({"tenant": "other", "tool": "demo-tool", "action": "call"})
+    indexer.close()
+    storage.delete(deleted["signature"])  # e.g. by retention; its index row stays
+    reads = []
+    read_many = storage.read_many
+    storage.read_many = lambda ids: reads.extend(ids) or read_many(ids)
+
+    lines = _verify_filtered(
+        verifier, sessions, Settings(), {"tenant_slug": "demo", "since": 0}
+    )
+
+    assert [line["manifest_id"] for line in lines[:-1]] == [kept["signature"]]
+    assert lines[-1]["summary"]["total"] == 1
+    assert lines[-1]["summary"]["verified"] == 1
+    assert sorted(reads) == sorted([kept["signature"], deleted["signature"]])
+
+
+def test_verify_batch_scans_the_store_without_the_index(tmp_path: Path):
+    signer, verifier = _verifier(tmp_path)
+    signer.sign_action({"tenant": "demo", "tool": "demo-tool", "action": "call"})
+    signer.sign_action({"tenant": "other", "tool": "demo-tool", "action": "call"})
+
+    lines = _verify_filtered(
+        verifier,
+        None,
+        Settings(provenance_index_enabled=False),
+        {"tenant_slug": "demo", "since": 0},
+    )
+
+    assert lines[-1]["summary"]["total"] == 1
+    assert lines[-1]["summary"]["verified"] == 1
+
+
+def test_verify_batch_caps_the_id_list():
+    response = client.post(
+        "/provenance/verify-batch", json={"manifest_ids": ["id"] * 10_001}
+    )
+    assert response.status_code == 422
+
+
+def test_sign_rejects_actions_too_long_to_index():
+    action = {"tenant_slug": "demo", "tool_name": "tool", "action": "a" * 129, "payload": {}}
+    assert client.post("/provenance/sign", json=action).status_code == 422
+    response = client.post(
+        "/provenance/sign/stream",
+        params={"tenant_slug": "demo", "tool_name": "tool", "action": "a" * 129},
+        content=b"{}",
+    )
+    assert response.status_code == 422
+
+
+def test_sign_stream_hashes_and_stores_the_raw_body(tmp_path: Path):
+    storage, signer = _override_stream(tmp_path)
+    body = b'{"document": "' + b"x" * 600 + b'"}'
+
+    def chunks():
+        yield body[:100]
+        yield body[100:]
+
+    try:
+        response = client.post(
+            "/provenance/sign/stream",
+            params={"tenant_slug": "demo", "tool_name": "demo-tool", "action": "upload"},
+            content=chunks(),
+            headers={"content-type": "application/json"},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 201
+    result = response.json()
+    digest = hashlib.sha256(body).hexdigest()
+    assert result["payload_sha256"] == digest and result["payload_bytes"] == len(body)
+    assert storage.read_attachment(digest) == body
+    manifest = ProvenanceVerifier(storage=storage, signer=signer).verify(result["manifest_id"])
+    assert manifest["verified"] is True
+    assert manifest["action"]["payload"] == {
+        "sha256": digest,
+        "size": len(body),
+        "content_type": "application/json",
+    }
+    assert list((tmp_path / "spool").iterdir()) == []
+
+
+def test_sign_stream_rejects_oversized_bodies(tmp_path: Path):
+    storage, _ = _override_stream(tmp_path, max_bytes=16)
+    params = {"tenant_slug": "demo", "tool_name": "demo-tool", "action": "upload"}
+    try:
+        declared = client.post("/provenance/sign/stream", params=params, content=b"x" * 17)
+        streamed = client.post(
+            "/provenance/sign/stream", params=params, content=iter([b"x" * 10, b"x" * 10])
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert declared.status_code == 413
+    assert streamed.status_code == 413
+    assert list(storage.iter_ids()) == []
+    assert list((tmp_path / "spool").iterdir()) == []
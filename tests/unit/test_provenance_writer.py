@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from sentinel_provenance.signer import ProvenanceSigner
+from sentinel_provenance.storage import ManifestStorage
+from sentinel_provenance.verifier import ProvenanceVerifier
+from sentinel_provenance.writer import GroupCommitWriter
+
+
+def _writer(tmp_path: Path, mode: str = "durable", **kwargs) -> GroupCommitWriter:
+    storage = ManifestStorage(tmp_path / "store")
+    journal = tmp_path / "provenance.journal" if mode == "durable" else None
+    writer = GroupCommitWriter(storage, journal_path=journal, mode=mode, **kwargs)
+    writer.start()
+    return writer
+
+
+def test_concurrent_signing_is_group_committed(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    fsyncs = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(os, "fsync", lambda fd: (fsyncs.append(fd), real_fsync(fd)))
+    writer = _writer(tmp_path, max_delay=0.05)
+    storage = writer._storage  # pylint: disable=protected-access
+    written = []
+    signer = ProvenanceSigner(
+        storage, "dev-key", on_write=lambda manifest_id, *_: written.append(manifest_id), writer=writer
+    )
+
+    def sign(index: int) -> None:
+        signer.sign_action({"tenant": "demo", "tool": "demo-tool", "action": f"call-{index}"})
+
+    threads = [threading.Thread(target=sign, args=(index,)) for index in range(40)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    writer.close()
+
+    assert len(written) == 40
+    assert len(fsyncs) == writer.batches_committed < 40
+    report = ProvenanceVerifier(storage, signer).verify_chain("demo", full=True)
+    assert report["verified"] is True
+    assert report["checked"] == 40
+
+
+def test_durable_ack_means_manifest_is_readable(tmp_path: Path):
+    writer = _writer(tmp_path)
+    storage = writer._storage  # pylint: disable=protected-access
+    signer = ProvenanceSigner(storage, "dev-key", writer=writer)
+
+    manifest = signer.sign_action({"tenant": "demo", "tool": "demo-tool", "action": "call"})
+    assert storage.read(manifest["signature"])["signature"] == manifest["signature"]
+    writer.close()
+
+
+def test_journal_is_replayed_on_start(tmp_path: Path):
+    storage = ManifestStorage(tmp_path / "store")
+    signer = ProvenanceSigner(storage, "dev-key")
+    manifest = signer.sign_action({"tenant": "demo", "tool": "demo-tool", "action": "call"})
+    (tmp_path / "store" / f"{manifest['signature']}.json").unlink()
+    journal = tmp_path / "provenance.journal"
+    entry = {"id": manifest["signature"], "manifest": manifest, "records": []}
+    journal.write_bytes(json.dumps(entry).encode("utf-8") + b"\n" + b'{"id": "torn')
+
+    writer = GroupCommitWriter(storage, journal_path=journal)
+    writer.start()
+    writer.close()
+
+    assert storage.read(manifest["signature"]) == manifest
+    assert journal.read_bytes() == b""
+
+
+def test_a_journal_has_a_single_writer(tmp_path: Path):
+    writer = _writer(tmp_path)
+    storage = writer._storage  # pylint: disable=protected-access
+    second = GroupCommitWriter(storage, journal_path=tmp_path / "provenance.journal")
+    with pytest.raises(RuntimeError, match="in use by another writer"):
+        second.start()
+
+    writer.close()
+    second.start()  # the lock goes with the first writer
+    second.close()
+
+
+def test_fast_mode_returns_before_write(tmp_path: Path):
+    writer = _writer(tmp_path, mode="fast")
+    storage = writer._storage  # pylint: disable=protected-access
+    signer = ProvenanceSigner(storage, "dev-key", writer=writer)
+    manifest = signer.sign_action({"tenant": "demo", "tool": "demo-tool", "action": "call"})
+    writer.close()
+
+    assert storage.read(manifest["signature"])["signature"] == manifest["signature"]
+    assert not (tmp_path / "provenance.journal").exists()
+
+
+def test_failed_batch_rolls_back_the_chain_and_the_journal(tmp_path: Path):
+    writer = _writer(tmp_path)
+    storage = writer._storage  # pylint: disable=protected-access
+    signer = ProvenanceSigner(storage, "dev-key", writer=writer)
+    signer.sign_action({"tenant": "demo", "tool": "demo-tool", "action": "first"})
+
+    write_many = storage.write_many
+
+    def failing_write_many(entries):
+        raise OSError("disk full")
+
+    storage.write_many = failing_write_many
+    with pytest.raises(OSError):
+        signer.sign_action({"tenant": "demo", "tool": "demo-tool", "action": "lost"})
+    storage.write_many = write_many
+    last = signer.sign_action({"tenant": "demo", "tool": "demo-tool", "action": "second"})
+    writer.close()
+
+    assert last["chain"]["seq"] == 2
+    report = ProvenanceVerifier(storage, signer).verify_chain("demo", full=True)
+    assert report["verified"] is True and report["checked"] == 2
+
+    replayed = GroupCommitWriter(storage, journal_path=tmp_path / "provenance.journal")
+    replayed.start()  # a restart must not resurrect the failed manifest
+    replayed.close()
+    actions = [storage.read(manifest_id)["action"]["action"] for manifest_id in storage.iter_ids()]
+    assert sorted(actions) == ["first", "second"]
+
+
+def test_manifests_queued_on_a_failed_one_fail_with_it(tmp_path: Path):
+    writer = _writer(tmp_path, mode="fast")
+    storage = writer._storage  # pylint: disable=protected-access
+    entered, gate = threading.Event(), threading.Event()
+    write_many = storage.write_many
+
+    def blocked_then_failing(entries):
+        entered.set()
+        gate.wait()
+        raise OSError("disk full")
+
+    storage.write_many = blocked_then_failing
+    signer = ProvenanceSigner(storage, "dev-key", writer=writer)
+    doomed = signer.sign_action({"tenant": "demo", "tool": "demo-tool", "action": "doomed"})
+    entered.wait()  # the orphan goes into the next batch, not the failing one
+    queued = signer.sign_action({"tenant": "demo", "tool": "demo-tool", "action": "orphan"})
+    assert queued["chain"]["prev"] == doomed["signature"]
+    gate.set()
+    writer.close()
+    storage.write_many = write_many
+
+    writer = _writer(tmp_path, mode="fast")
+    signer._writer = writer  # pylint: disable=protected-access
+    fresh = signer.sign_action({"tenant": "demo", "tool": "demo-tool", "action": "fresh"})
+    writer.close()
+
+    assert fresh["chain"] == {"tenant": "demo", "seq": 1, "prev": None}
+    assert list(storage.iter_ids()) == [fresh["signature"]]
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import shutil
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, delete, insert, select
+
+from sentinel_control_plane.dependencies import replica_router
+from sentinel_control_plane.main import app
+from sentinel_control_plane.models import RegistryState, Tenant, Tool
+from sentinel_control_plane.replicas import ReplicaRouter
+
+client = TestClient(app)
+MODELS = (Tenant, Tool, RegistryState)
+
+
+class Clock:
+    now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def replicas(registry_db, tmp_path):
+    engines = []
+    for index in range(2):
+        (tmp_path / f"r{index}").mkdir()
+        engine = create_engine(f"sqlite:///{tmp_path / f'r{index}' / 'replica.db'}")
+        for model in MODELS:
+            model.__table__.create(engine)
+        engines.append(engine)
+    clock = Clock()
+    router = ReplicaRouter(
+        registry_db, [(f"replica-{i}", e) for i, e in enumerate(engines)], clock=clock
+    )
+    app.dependency_overrides[replica_router] = _provide(router)
+    yield router, engines, clock
+    app.dependency_overrides.pop(replica_router, None)
+    router.close()
+
+
+def _provide(router: ReplicaRouter):
+    return lambda: router
+
+
+def _replicate(get_session, engine) -> None:
+    """Copy the primary's registry into a replica, standing in for streaming replication."""
+    with get_session() as session, engine.begin() as replica:
+        for model in reversed(MODELS):
+            replica.execute(delete(model))
+        for model in MODELS:
+            rows = [dict(row._mapping) for row in session.execute(select(model.__table__))]
+            if rows:
+                replica.execute(insert(model.__table__), rows)
+
+
+def _register(name: str) -> str:
+    tool = {"tenant_slug": "demo", "name": name, "url": "u", "owner": "ops"}
+    response = client.post("/register", json=tool)
+    assert response.status_code == 201
+    return response.headers["x-registry-version"]
+
+
+def _names(**headers) -> list[str]:
+    return [tool["name"] for tool in client.get("/register", headers=headers).json()]
+
+
+def test_reads_round_robin_and_read_your_writes_go_to_the_primary(registry_db, replicas):
+    router, engines, _ = replicas
+    assert _register("crm") == "1"
+    for engine in engines:
+        _replicate(registry_db, engine)
+    router.check()
+    assert _register("wiki") == "2"  # not replicated yet
+
+    assert [_names() for _ in range(4)] == [["crm"]] * 4
+    assert _names(**{"X-Min-Registry-Version": "2"}) == ["crm", "wiki"]
+    assert _names(**{"X-Min-Registry-Version": "1"}) == ["crm"]
+    assert [replica["reads"] for replica in router.stats()] == [3, 2]
+    assert router.primary_reads == 1
+
+
+def test_lagging_replicas_are_ejected_until_they_catch_up(registry_db, replicas):
+    router, engines, clock = replicas
+    _register("crm")
+    for engine in engines:
+        _replicate(registry_db, engine)
+    router.check()
+    _register("wiki")
+    clock.now = 1.0
+    router.check()  # the primary is at version 2 from t=1 on
+    clock.now = 7.0
+    router.check()
+    assert [replica["healthy"] for replica in router.stats()] == [False, False]
+    assert _names() == ["crm", "wiki"] and router.primary_reads == 1
+
+    _replicate(registry_db, engines[0])
+    router.check()
+    assert [(r["healthy"], r["lag_seconds"]) for r in router.stats()] == [(True, 0), (False, 6)]
+    assert _names() == ["crm", "wiki"] and router.stats()[0]["reads"] == 1
+
+
+def test_unreachable_replica_is_ejected_and_the_read_falls_back(registry_db, replicas, tmp_path):
+    router, engines, _ = replicas
+    _register("crm")
+    for engine in engines:
+        _replicate(registry_db, engine)
+    router.check()
+    engines[0].dispose()
+    shutil.rmtree(tmp_path / "r0")
+
+    assert _names() == ["crm"]  # replica-0 fails to connect; the primary serves the read
+    assert _names() == ["crm"]  # replica-1
+    stats = router.stats()
+    assert not stats[0]["healthy"] and stats[0]["error"] and stats[1]["reads"] == 1
+    assert router.primary_reads == 1
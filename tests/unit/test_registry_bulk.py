@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from sentinel_control_plane.main import app
+from sentinel_control_plane.models import Tenant, Tool
+from sentinel_control_plane.routes import registry as registry_routes
+
+client = TestClient(app)
+
+
+def _tool(tenant: str, name: str, url: str = "https://example.com") -> dict:
+    return {"tenant_slug": tenant, "name": name, "url": url, "owner": "ops", "scopes": ["read"]}
+
+
+def test_bulk_register_creates_tenants_and_tools(registry_db):
+    tools = [_tool(f"tenant-{index % 3}", f"tool-{index}") for index in range(2500)]
+
+    response = client.post("/register/bulk", json={"tools": tools})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["created"] == 2500 and body["updated"] == 0
+    assert [result["name"] for result in body["results"]] == [tool["name"] for tool in tools]
+    with registry_db() as session:
+        slugs = session.execute(select(Tenant.slug).order_by(Tenant.slug)).scalars().all()
+        assert slugs == ["tenant-0", "tenant-1", "tenant-2"]
+        assert len(session.execute(select(Tool.id)).all()) == 2500
+
+
+def test_bulk_register_updates_existing_tools_in_place(registry_db):
+    first = client.post("/register/bulk", json={"tools": [_tool("demo", "search")]}).json()
+    with registry_db() as session:
+        session.execute(Tool.__table__.update().values(is_active=False))
+
+    response = client.post(
+        "/register/bulk",
+        json={
+            "tools": [
+                _tool("demo", "search", url="https://old.example.com"),
+                _tool("demo", "fetch"),
+                _tool("demo", "search", url="https://new.example.com"),
+            ]
+        },
+    )
+
+    body = response.json()
+    assert [result["status"] for result in body["results"]] == ["duplicate", "created", "updated"]
+    assert body["created"] == 1 and body["updated"] == 1
+    assert body["results"][2]["id"] == first["results"][0]["id"]
+    with registry_db() as session:
+        search = session.execute(select(Tool).where(Tool.name == "search")).scalar_one()
+        assert search.url == "https://new.example.com"
+        assert search.is_active is False
+
+
+def test_bulk_register_reports_updates_made_within_the_same_timestamp(registry_db, monkeypatch):
+    class SameInstant(datetime):
+        @classmethod
+        def utcnow(cls):
+            return cls(2024, 1, 1)
+
+    monkeypatch.setattr(registry_routes, "datetime", SameInstant)
+    client.post("/register/bulk", json={"tools": [_tool("demo", "search")]})
+
+    body = client.post("/register/bulk", json={"tools": [_tool("demo", "search")]}).json()
+
+    assert body["created"] == 0 and body["updated"] == 1
+    assert body["results"][0]["status"] == "updated"
+
+
+def test_bulk_register_rejects_empty_requests(registry_db):
+    assert client.post("/register/bulk", json={"tools": []}).status_code == 422
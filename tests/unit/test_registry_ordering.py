@@ -14,7 +14,7 @@ class _SessionStub:
     def __init__(self, results):
         self._results = list(results)
 
-    def execute(self, statement):  # pylint: disable=unused-argument
+    def execute(self, statement, params=None):  # pylint: disable=unused-argument
         if not self._results:
             raise AssertionError("Unexpected execute call")
         return self._results.pop(0)
@@ -91,7 +91,10 @@ def _override_session(results):
 
 
 def test_list_tenants_sorted(tenants):
-    app.dependency_overrides[db_session] = _override_session([_ScalarResult(sorted(tenants, key=lambda t: t.slug))])
+    app.dependency_overrides[db_session] = _override_session([
+        _ScalarResult([3]),
+        _ScalarResult(sorted(tenants, key=lambda t: t.slug)),
+    ])
     try:
         response = client.get("/register/tenants")
         assert response.status_code == 200
@@ -104,6 +107,7 @@ def test_list_tenants_sorted(tenants):
 def test_list_tools_preserves_order(tenants, tools):
     tenant = tenants[0]
     app.dependency_overrides[db_session] = _override_session([
+        _ScalarResult([3]),
         _ScalarResult([tenant]),
         _ScalarResult(tools),
     ])
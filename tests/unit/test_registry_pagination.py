@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from sentinel_control_plane.main import app
+from sentinel_control_plane.models import Tenant, Tool
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def registry(registry_db):
+    with registry_db() as session:
+        for slug in ("alpha", "beta"):
+            tenant = Tenant(slug=slug, display_name=slug.title())
+            session.add(tenant)
+            session.flush()
+            for index in range(5):
+                session.add(
+                    Tool(
+                        tenant_id=tenant.id,
+                        name=f"tool-{index}",
+                        url=f"https://{slug}.example.com/{index}",
+                        owner="ops",
+                        scopes=["read"],
+                        extra_metadata={},
+                    )
+                )
+
+
+def test_list_tools_pages_with_keyset_cursor(registry):
+    full = client.get("/register").json()
+    pages, cursor = [], None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/register", params=params)
+        assert response.status_code == 200
+        pages.append(response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+
+    assert [len(page) for page in pages] == [3, 3, 3, 1]
+    assert [tool["id"] for page in pages for tool in page] == [tool["id"] for tool in full]
+    assert [(tool["tenant_id"], tool["name"]) for tool in full] == sorted(
+        (tool["tenant_id"], tool["name"]) for tool in full
+    )
+
+
+def test_list_tools_rejects_invalid_cursor(registry):
+    response = client.get("/register", params={"limit": 3, "cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_export_tools_streams_ndjson(registry):
+    response = client.get("/register/export", params={"tenant_slug": "beta"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    tools = [json.loads(line) for line in response.text.splitlines()]
+    assert [tool["name"] for tool in tools] == [f"tool-{index}" for index in range(5)]
+    assert client.get("/register/export", params={"tenant_slug": "missing"}).status_code == 404
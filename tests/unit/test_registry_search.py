@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import os
+import uuid
+from contextlib import contextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, insert, text
+from sqlalchemy.orm import sessionmaker
+
+from sentinel_control_plane.dependencies import db_session
+from sentinel_control_plane.main import app
+from sentinel_control_plane.models import RegistryState, Tenant, Tool
+
+client = TestClient(app)
+POSTGRES_URL = os.environ.get("SENTINEL_TEST_POSTGRES_URL")
+
+TOOLS = [
+    ("alpha", "crm", "sales", ["pii:read", "crm:write"], {"tier": 1, "region": "eu"}),
+    ("alpha", "wiki", "docs", ["docs:read"], {"tier": 2}),
+    ("beta", "ledger", "finance", ["pii:read"], {"tier": 1, "region": "us"}),
+    ("beta", "search", "sales", ["web:read"], {"region": "eu"}),
+]
+
+
+def _search(**params) -> list[str]:
+    response = client.get("/register/search", params=params)
+    assert response.status_code == 200, response.text
+    return sorted(tool["name"] for tool in response.json())
+
+
+@pytest.fixture
+def registry(registry_db):
+    for tenant, name, owner, scopes, metadata in TOOLS:
+        client.post(
+            "/register",
+            json={
+                "tenant_slug": tenant,
+                "name": name,
+                "url": f"https://{name}.example.com",
+                "owner": owner,
+                "scopes": scopes,
+                "metadata": metadata,
+            },
+        )
+    client.post("/kill", json={"tenant_slug": "beta", "tool_name": "ledger", "reason": "audit"})
+
+
+def test_search_filters_across_tenants(registry):
+    assert _search(scope="pii:read") == ["crm", "ledger"]
+    assert _search(scope=["pii:read", "crm:write"]) == ["crm"]
+    assert _search(metadata_key="region") == ["crm", "ledger", "search"]
+    assert _search(metadata=["tier=1", "region=eu"]) == ["crm"]
+    assert _search(owner="sales", metadata_key="tier") == ["crm"]
+    assert _search(scope="pii:read", active=True) == ["crm"]
+    assert _search(scope="pii:read", active=False, tenant_slug="beta") == ["ledger"]
+
+
+def test_search_pages_and_rejects_bad_filters(registry):
+    first = client.get("/register/search", params={"metadata_key": "region", "limit": 2})
+    second = client.get(
+        "/register/search",
+        params={"metadata_key": "region", "limit": 2, "cursor": first.headers["x-next-cursor"]},
+    )
+    names = [tool["name"] for tool in first.json() + second.json()]
+    assert sorted(names) == ["crm", "ledger", "search"] and "x-next-cursor" not in second.headers
+    assert client.get("/register/search", params={"metadata": "tier"}).status_code == 400
+
+
+@pytest.mark.skipif(not POSTGRES_URL, reason="SENTINEL_TEST_POSTGRES_URL not set")
+def test_search_uses_gin_indexes_on_postgres():
+    schema = f"search_{uuid.uuid4().hex[:8]}"
+    engine = create_engine(POSTGRES_URL, connect_args={"options": f"-csearch_path={schema}"})
+    with engine.begin() as connection:
+        connection.execute(text(f'CREATE SCHEMA "{schema}"'))
+    try:
+        for model in (Tenant, Tool, RegistryState):
+            model.__table__.create(engine)
+        tenant_id = uuid.uuid4()
+        with engine.begin() as connection:
+            tenant = {"id": tenant_id, "slug": "bulk", "display_name": "Bulk"}
+            connection.execute(insert(Tenant), [tenant])
+            connection.execute(
+                insert(Tool),
+                [
+                    {
+                        "id": uuid.uuid4(),
+                        "tenant_id": tenant_id,
+                        "name": f"tool-{index}",
+                        "url": "u",
+                        "owner": f"owner-{index % 20}",
+                        "scopes": [f"scope:{index % 50}"],
+                        "extra_metadata": {"team": f"team-{index % 40}"},
+                        "version": 0,
+                    }
+                    for index in range(5000)
+                ],
+            )
+            connection.execute(text("ANALYZE tools"))
+        factory = sessionmaker(bind=engine, expire_on_commit=False)
+        statements: list[tuple[str, object]] = []
+
+        def capture(_conn, _cursor, statement, parameters, _context, _many):
+            if "FROM tools" in statement:
+                statements.append((statement, parameters))
+
+        @contextmanager
+        def session_scope():
+            session = factory()
+            try:
+                yield session
+                session.commit()
+            finally:
+                session.close()
+
+        def db():
+            with session_scope() as session:
+                yield session
+
+        event.listen(engine, "before_cursor_execute", capture)
+        app.dependency_overrides[db_session] = db
+        try:
+            assert _search(scope="scope:7", metadata="team=team-7") != []
+            assert _search(metadata_key="team", owner="owner-3") != []
+        finally:
+            app.dependency_overrides.pop(db_session, None)
+            event.remove(engine, "before_cursor_execute", capture)
+
+        plans = []
+        with engine.connect() as connection:
+            connection.exec_driver_sql("SET enable_seqscan = off")
+            for statement, parameters in statements:
+                rows = connection.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+                plans.append("\n".join(row[0] for row in rows))
+        assert "ix_tools_scopes_gin" in plans[0] or "ix_tools_metadata_gin" in plans[0]
+        assert "ix_tools_owner" in plans[1] or "ix_tools_metadata_gin" in plans[1]
+    finally:
+        with engine.begin() as connection:
+            connection.execute(text(f'DROP SCHEMA "{schema}" CASCADE'))
+        engine.dispose()
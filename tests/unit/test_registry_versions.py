@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from sentinel_control_plane.main import app
+
+client = TestClient(app)
+
+
+def _register(*names: str, tenant: str = "demo", url: str = "https://example.com") -> None:
+    tools = [
+        {"tenant_slug": tenant, "name": name, "url": url, "owner": "ops"} for name in names
+    ]
+    assert client.post("/register/bulk", json={"tools": tools}).status_code == 200
+
+
+def test_conditional_get_returns_304_until_the_registry_changes(registry_db):
+    _register("search", "fetch")
+    first = client.get("/register")
+    etag = first.headers["etag"]
+
+    cached = client.get("/register", headers={"If-None-Match": etag})
+    tenants = client.get("/register/tenants", headers={"If-None-Match": etag})
+
+    assert cached.status_code == 304 and cached.content == b""
+    assert tenants.status_code == 304
+    client.post("/kill", json={"tenant_slug": "demo", "tool_name": "search", "reason": "drill"})
+    changed = client.get("/register", headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
+
+
+def test_changes_return_only_tools_written_after_since(registry_db):
+    _register("search", "fetch")
+    baseline = client.get("/register/changes", params={"since": 0}).json()
+    assert {tool["name"] for tool in baseline["tools"]} == {"search", "fetch"}
+    assert [tenant["slug"] for tenant in baseline["tenants"]] == ["demo"]
+
+    _register("search", url="https://new.example.com")
+    client.post("/register", json={"tenant_slug": "other", "name": "x", "url": "u", "owner": "o"})
+    delta = client.get("/register/changes", params={"since": baseline["version"]}).json()
+
+    assert delta["version"] == baseline["version"] + 2
+    assert [(tool["name"], tool["url"]) for tool in delta["tools"]] == [
+        ("search", "https://new.example.com"),
+        ("x", "u"),
+    ]
+    assert [tenant["slug"] for tenant in delta["tenants"]] == ["other"]
+    unchanged = client.get("/register/changes", params={"since": delta["version"]}).json()
+    assert unchanged["tools"] == [] and unchanged["tenants"] == []
+
+
+def test_changes_ahead_of_the_server_ask_for_a_resync(registry_db):
+    _register("search")
+    assert client.get("/register/changes", params={"since": 99}).status_code == 410
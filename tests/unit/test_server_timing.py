@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+from structlog.testing import capture_logs
+
+from sentinel_control_plane.dependencies import (
+    get_manifest_writer,
+    policy_client,
+    provenance_signer,
+    provenance_storage,
+)
+from sentinel_control_plane.main import app
+from sentinel_control_plane.metrics import time_queries
+from sentinel_control_plane.server_timing import ServerTimingMiddleware, record_stage
+from sentinel_provenance.signer import ProvenanceSigner
+
+client = TestClient(app)
+timed_client = TestClient(ServerTimingMiddleware(app))
+
+
+class _AllowAll:
+    def evaluate(self, package, input_data):
+        return {"allow": True}
+
+
+def _register_and_check(http: TestClient):
+    tool = {"tenant_slug": "timing", "name": "search", "url": "https://x", "owner": "ops"}
+    assert http.post("/register", json=tool).status_code == 201
+    app.dependency_overrides[policy_client] = lambda: _AllowAll()
+    try:
+        return http.post(
+            "/policy/check",
+            json={"tenant_slug": "timing", "tool_name": "search", "action": "invoke"},
+        )
+    finally:
+        app.dependency_overrides.pop(policy_client, None)
+
+
+def test_policy_check_reports_its_stages(registry_db):
+    with registry_db() as session:
+        time_queries(session.get_bind(), "timing-test")
+    with capture_logs() as logs:
+        response = _register_and_check(timed_client)
+
+    assert response.status_code == 200
+    stages = [metric.split(";")[0] for metric in response.headers["server-timing"].split(", ")]
+    assert stages == ["db", "opa", "serialize", "total"]
+    logged = [log for log in logs if log["event"] == "request.timings"][-1]
+    assert logged["path"] == "/policy/check" and logged["status"] == 200
+    assert list(logged["timings"]) == stages
+    assert all(duration >= 0 for duration in logged["timings"].values())
+
+
+def test_sign_reports_the_storage_write_made_on_the_writer_thread(registry_db):
+    tool = {"tenant_slug": "timing", "name": "search", "url": "https://x", "owner": "ops"}
+    assert timed_client.post("/register", json=tool).status_code == 201
+
+    # The app's writer and store, without the manifest index (it needs Postgres).
+    signer = ProvenanceSigner(
+        storage=provenance_storage(), signing_key="timing-key", writer=get_manifest_writer()
+    )
+    app.dependency_overrides[provenance_signer] = lambda: signer
+    sign = {"tenant_slug": "timing", "tool_name": "search", "action": "invoke", "payload": {}}
+    try:
+        # The first sign reads the chain head on the request thread; later ones only write.
+        assert timed_client.post("/provenance/sign", json=sign).status_code == 201
+        response = timed_client.post("/provenance/sign", json=sign)
+    finally:
+        app.dependency_overrides.pop(provenance_signer, None)
+
+    assert response.status_code == 201
+    timings = dict(
+        metric.split(";dur=") for metric in response.headers["server-timing"].split(", ")
+    )
+    assert {"sign", "storage", "serialize", "total"} <= set(timings)
+    assert float(timings["storage"]) <= float(timings["sign"])
+
+
+def test_timings_are_off_unless_enabled(registry_db):
+    record_stage("db", 1.0)  # outside a request: ignored
+    response = _register_and_check(client)
+    assert response.status_code == 200
+    assert "server-timing" not in response.headers
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import uuid
+from collections import Counter
+from datetime import datetime
+
+import httpx
+from fastapi.testclient import TestClient
+
+from sentinel_control_plane.config import Settings
+from sentinel_control_plane.dependencies import policy_client, settings_provider
+from sentinel_control_plane.health import (
+    HealthResult,
+    HealthScheduler,
+    ProbeTarget,
+    TimingWheel,
+    load_probe_targets,
+    persist_health_results,
+)
+from sentinel_control_plane.main import app
+
+client = TestClient(app)
+
+
+def _targets(count: int, hosts: tuple[str, ...]) -> list[ProbeTarget]:
+    return [
+        ProbeTarget(
+            tool_id=uuid.uuid4(),
+            url=f"https://{hosts[index % len(hosts)]}/health",
+            method="GET",
+            body=None,
+            interval_seconds=10,
+        )
+        for index in range(count)
+    ]
+
+
+def _run_probes(scheduler: HealthScheduler, ticks: int = 12) -> int:
+    async def run() -> int:
+        await scheduler.refresh()
+        started = 0
+        for _ in range(ticks):
+            started += await scheduler.tick()
+            await asyncio.sleep(0)
+        await scheduler.drain()
+        return started
+
+    return asyncio.run(run())
+
+
+def test_timing_wheel_releases_items_after_their_delay():
+    wheel: TimingWheel[str] = TimingWheel(slots=4, tick_seconds=1.0)
+    wheel.schedule("soon", 1)
+    wheel.schedule("later", 3)
+    wheel.schedule("next-round", 6)
+
+    due = {tick: wheel.advance() for tick in range(1, 9)}
+
+    assert due[1] == ["soon"] and due[3] == ["later"] and due[6] == ["next-round"]
+    assert sum(len(items) for items in due.values()) == 3 and len(wheel) == 0
+
+
+def test_scheduler_bounds_concurrency_and_records_failures():
+    active: Counter[str] = Counter()
+    peaks = {"total": 0, "host": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        active[request.url.host] += 1
+        peaks["total"] = max(peaks["total"], sum(active.values()))
+        peaks["host"] = max(peaks["host"], max(active.values()))
+        await asyncio.sleep(0.01)
+        active[request.url.host] -= 1
+        return httpx.Response(503 if request.url.host == "down.example.com" else 200)
+
+    targets = _targets(40, ("up.example.com", "down.example.com"))
+    scheduler = HealthScheduler(
+        lambda: targets,
+        lambda results: None,
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        max_concurrency=5,
+        per_host_concurrency=3,
+        rng=random.Random(7),
+    )
+
+    assert _run_probes(scheduler) == 40
+    assert peaks["total"] <= 5 and peaks["host"] <= 3
+    results = {result.tool_id: result for result in scheduler.results()}
+    down = [results[target.tool_id] for target in targets if "down" in target.url]
+    assert all(not result.healthy and result.error == "HTTP 503" for result in down)
+    assert sum(result.healthy for result in results.values()) == 20
+
+
+def test_scheduler_flushes_batches_and_drops_removed_targets():
+    targets = _targets(6, ("tools.example.com",))
+    batches: list[list[HealthResult]] = []
+    scheduler = HealthScheduler(
+        lambda: list(targets),
+        batches.append,
+        client=httpx.AsyncClient(transport=httpx.MockTransport(lambda _: httpx.Response(204))),
+        rng=random.Random(1),
+    )
+    _run_probes(scheduler)
+
+    assert asyncio.run(scheduler.flush()) == 6 and asyncio.run(scheduler.flush()) == 0
+    assert [len(batch) for batch in batches] == [6]
+
+    removed = targets.pop()
+    _run_probes(scheduler)
+    assert scheduler.result(removed.tool_id) is None
+    assert len(scheduler.results()) == 5
+
+
+def test_health_results_persist_and_gate_policy(registry_db):
+    client.post(
+        "/register",
+        json={
+            "tenant_slug": "demo",
+            "name": "search",
+            "url": "https://search.example.com/api/",
+            "owner": "ops",
+            "healthcheck": {"path": "healthz", "interval_seconds": 30},
+        },
+    )
+    client.post("/register", json={"tenant_slug": "demo", "name": "fetch", "url": "u", "owner": "o"})
+
+    [target] = load_probe_targets(registry_db)()
+    assert target.url == "https://search.example.com/api/healthz"
+    assert (target.method, target.interval_seconds) == ("GET", 30.0)
+
+    persist = persist_health_results(registry_db)
+    for failures in (1, 2):  # the second batch updates the stored row in place
+        checked_at = datetime.utcnow()
+        persist([HealthResult(target.tool_id, False, 503, 12.5, "HTTP 503", failures, checked_at)])
+    report = client.get("/register/health").json()
+    assert report["source"] == "database"
+    assert [(tool["healthy"], tool["consecutive_failures"]) for tool in report["tools"]] == [
+        (False, 2)
+    ]
+
+    class UnreachablePolicy:
+        def evaluate(self, package, input_data):
+            raise AssertionError("OPA should not be consulted for an unhealthy tool")
+
+    app.dependency_overrides[settings_provider] = lambda: Settings(health_gate_policy=True)
+    app.dependency_overrides[policy_client] = UnreachablePolicy
+    try:
+        decision = client.post(
+            "/policy/check", json={"tenant_slug": "demo", "tool_name": "search", "action": "call"}
+        ).json()
+    finally:
+        app.dependency_overrides.pop(settings_provider, None)
+        app.dependency_overrides.pop(policy_client, None)
+    assert decision == {"allow": False, "reason": "tool_unhealthy", "quota_remaining": None}